@@ -10,10 +10,9 @@ bl_info = {
 
 import bpy
 import os
+import shutil
 import tempfile
-import json
-import urllib.request
-import urllib.error
+import time
 from bpy.props import (
     StringProperty,
     FloatProperty,
@@ -22,7 +21,9 @@ from bpy.props import (
     FloatVectorProperty,
     CollectionProperty,
     IntProperty,
+    PointerProperty,
 )
+from bpy.app.handlers import persistent
 from bpy.types import (
     Panel,
     Operator,
@@ -30,6 +31,26 @@ from bpy.types import (
     UIList,
 )
 
+from . import builder
+from . import bundle
+from . import catalog
+from . import coverage
+from . import downloads
+from . import font_store
+from . import geonodes
+from . import glyphs
+from . import http_client
+from . import jobs
+from . import lod
+from . import materials
+from . import populate
+from . import preview
+from . import profiling
+from . import registry
+from . import search
+from . import subset
+from . import thumbnails
+
 
 # ============================================================================
 # Helper Functions
@@ -43,6 +64,408 @@ def check_online_access(operator):
     return True
 
 
+def get_data_dir():
+    """Directory holding the fonts and cache directories, QUICKSIGNS_DATA_DIR or the add-on's own"""
+    return os.environ.get("QUICKSIGNS_DATA_DIR") or os.path.dirname(__file__)
+
+
+def get_fonts_dir():
+    """Directory where downloaded fonts are stored"""
+    return os.path.join(get_data_dir(), "fonts")
+
+
+def get_cache_dir():
+    """Directory for cached data that lives next to the fonts directory"""
+    return os.path.join(get_data_dir(), "cache")
+
+
+# Shared catalog cache, so repeat searches only filter locally
+catalog_cache = catalog.CatalogCache(get_cache_dir())
+
+# Content-addressed store of downloaded font files
+local_fonts = font_store.FontStore(get_fonts_dir())
+
+# Search index over the cached catalog, rebuilt when the catalog changes
+_search_index = None
+
+# Codepoint coverage of the catalog fonts, rebuilt with the search index,
+# and the cmap coverage of downloaded fonts by file hash
+_coverage_index = None
+font_coverage = coverage.CoverageCache(get_cache_dir())
+
+# Ranked font ids, category counts and shown page of the last search, per scene.
+# Only the shown page is copied into the scene's font list, so the .blend
+# file and undo steps don't grow with the catalog.
+search_results = {}
+search_facets = {}
+search_pages = {}
+
+# Number of results shown in the font list at a time
+RESULT_PAGE_SIZE = 50
+
+# Spec fields of a sign that applying the panel settings leaves alone
+KEPT_FIELDS = ('text', 'location', 'rotation', 'scale')
+
+# Fonts cut down to the glyphs of a sign or batch
+font_subsets = subset.SubsetCache(os.path.join(get_fonts_dir(), "subsets"))
+
+# Font list icons rendered in a worker process
+font_thumbnails = thumbnails.ThumbnailManager(os.path.join(get_cache_dir(), "thumbnails"))
+
+# Shared background download queue
+download_manager = downloads.DownloadManager()
+
+
+def get_search_index():
+    """Search index over the cached catalog, or None before the first download"""
+    global _search_index
+    fonts = catalog_cache.cached_fonts()
+    if fonts is None:
+        return None
+    if _search_index is None or _search_index.source is not fonts:
+        _search_index = search.SearchIndex(fonts)
+    return _search_index
+
+
+def get_coverage_index(index):
+    """Coverage of the search index's fonts, refined with the cmaps of downloaded regular variants
+
+    The store is only scanned when the index is rebuilt; later downloads
+    refine it through refine_coverage as they are stored.
+    """
+    global _coverage_index
+    if _coverage_index is None or _coverage_index.records is not index.records:
+        _coverage_index = coverage.CoverageIndex(index.records)
+        refine_coverage(stored_fonts())
+    return _coverage_index
+
+
+def stored_fonts():
+    """(family, sha256) of every regular variant in the font store"""
+    return [(entry['family'], entry['hash']) for entry in local_fonts.entries().values() if entry['variant'] == 'regular']
+
+
+def refine_coverage(fonts):
+    """Replace the subset estimates of stored (family, sha256) fonts with the coverage of their files
+
+    Does nothing before the coverage index is built. New cmap coverage is
+    written to disk by the download and import paths, not per search.
+    """
+    index = _search_index
+    if _coverage_index is None or index is None or _coverage_index.records is not index.records:
+        return
+    for family, sha256 in fonts:
+        font_id = index.font_id(family)
+        if font_id is None:
+            continue
+        mask = font_coverage.mask(sha256, local_fonts.blob_path(sha256))
+        if mask is not None:
+            _coverage_index.refine(font_id, mask)
+
+
+def covering_fonts(index, text):
+    """Ids of the fonts that have a glyph for every character of text"""
+    required = coverage.text_mask(text)
+    if not required:
+        return None
+    with profiling.profiler.stage('search.coverage'):
+        return get_coverage_index(index).covering(required)
+
+
+def run_search(scene):
+    """Search the cached catalog with the panel filters and show the first page of results"""
+    index = get_search_index()
+    if index is None:
+        return None
+
+    props = scene.signs_props
+    include = covering_fonts(index, props.sign_text) if props.font_cover_sign_text else None
+    ids = index.search(
+        props.font_search_query,
+        category=props.font_category_filter,
+        subset=props.font_subset_filter,
+        min_variants=props.font_min_variants,
+        max_rank=props.font_max_rank,
+        include=include,
+    )
+    search_results[scene.name] = ids
+    search_facets[scene.name] = index.facet_counts(ids)[0]
+
+    show_page(scene, 0)
+    return ids
+
+
+def page_count(scene):
+    """Number of font list pages for the last search"""
+    ids = search_results.get(scene.name, [])
+    return max(1, -(-len(ids) // RESULT_PAGE_SIZE))
+
+
+def show_page(scene, page):
+    """Replace the font list with one page of the last search results"""
+    index = get_search_index()
+    ids = search_results.get(scene.name, [])
+    page = min(max(page, 0), page_count(scene) - 1)
+    search_pages[scene.name] = page
+
+    props = scene.signs_props
+    props.font_list.clear()
+    if index is None:
+        return
+
+    start = page * RESULT_PAGE_SIZE
+    for font_id in ids[start:start + RESULT_PAGE_SIZE]:
+        record = index.records[font_id]
+        item = props.font_list.add()
+        item.name = record.family
+        item.family = record.family
+        item.category = record.category
+        item.version = record.version
+        item.url = record.url
+    props.font_list_index = min(props.font_list_index, len(props.font_list) - 1)
+
+
+def result_records(scene):
+    """Catalog records of every font in the last search results, not just the shown page"""
+    index = get_search_index()
+    if index is None:
+        return []
+    return [index.records[font_id] for font_id in search_results.get(scene.name, [])]
+
+
+def find_font(family, version='', variant='regular'):
+    """Path of a downloaded font file, or None if it isn't in the store"""
+    return local_fonts.lookup(family, variant, version)
+
+
+def resolve_font(value):
+    """Map a font file path or downloaded family name to a font file path"""
+    path = bpy.path.abspath(value)
+    if os.path.isfile(path):
+        return path
+    return local_fonts.find_family(value)
+
+
+def style_font_path(font_path, spec, weight=700, fetch=True):
+    """Path of the bold/italic variant of a stored font that a spec uses, or None
+
+    Only that one variant is fetched, never the whole family. If it isn't
+    stored yet and fetch is set, it is downloaded in the background and
+    filled into the matching slot of every text that still falls back to
+    the regular font.
+    """
+    slot = builder.style_slot(spec)
+    entry = local_fonts.find_entry(font_path) if slot != 'font' else None
+    index = get_search_index()
+    if entry is None or index is None:
+        return None
+    record = index.record(entry['family'])
+    if record is None:
+        return None
+
+    variant = record.closest_variant(weight if spec['bold'] else 400, spec['italic'])
+    if variant is None:
+        return None
+
+    path = find_font(record.family, record.version, variant)
+    if path is None and fetch and bpy.context.preferences.system.use_online_access:
+        def on_done(style_path):
+            fill_style_slot(font_path, slot, style_path)
+
+        queue_font_download(record.files[variant], record.family, record.version, on_done, variant=variant)
+    return path
+
+
+def fill_style_slot(font_path, slot, style_path):
+    """Put a downloaded variant into slot of texts that use font_path there as a fallback
+
+    Texts using a subset of font_path get a subset of the variant for their body.
+    """
+    font_path = os.path.normpath(font_path)
+    source = local_fonts.find_hash(font_path)
+    for curve in bpy.data.curves:
+        if not isinstance(curve, bpy.types.TextCurve) or curve.font is None or getattr(curve, slot) != curve.font:
+            continue
+
+        path = os.path.normpath(bpy.path.abspath(curve.font.filepath))
+        if path == font_path:
+            style_font = builder.load_font(style_path)
+        elif source is not None and subset.source_hash(path) == source:
+            style_font = builder.load_font(font_subsets.get(style_path, curve.body))
+        else:
+            continue
+        if style_font is not None:
+            setattr(curve, slot, style_font)
+
+
+def loaded_font_hashes():
+    """Hashes of stored fonts that are loaded in bpy.data.fonts"""
+    hashes = set()
+    for font in bpy.data.fonts:
+        sha256 = local_fonts.find_hash(bpy.path.abspath(font.filepath))
+        if sha256:
+            hashes.add(sha256)
+    return hashes
+
+
+def store_download(job, family, version='', variant='regular'):
+    """Move a finished download into the font store and return its path"""
+    if job.state != 'DONE':
+        # Cancelled jobs never wrote their file
+        if job.error:
+            print(f"QuickSigns: Error downloading font {family}: {job.error}")
+        return None
+
+    with profiling.profiler.stage('download.store', job.bytes_done):
+        path = local_fonts.lookup(family, variant, version)
+        if path is None:
+            # Never evict fonts the open file is using
+            path = local_fonts.add_file(
+                job.dest, family, variant, version,
+                sha256=job.sha256, protect=loaded_font_hashes()
+            )
+    if variant == 'regular':
+        refine_coverage([(family, local_fonts.find_hash(path))])
+    return path
+
+
+def redraw_sidebars():
+    """Redraw the 3D views so progress shown in the sidebar stays current"""
+    wm = bpy.context.window_manager
+    if wm:
+        for window in wm.windows:
+            for area in window.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+
+
+def process_downloads():
+    """Timer callback that hands finished downloads back to the main thread"""
+    download_manager.drain()
+    local_fonts.flush()
+    font_coverage.flush()
+    redraw_sidebars()
+
+    if download_manager.is_busy():
+        return 0.1
+    return None
+
+
+def queue_font_download(url, family, version='', on_done=None, variant='regular'):
+    """Download a font in the background and call on_done(font_path) on the main thread
+
+    Returns the job and the callback this call added to it, which
+    download_manager.release takes to withdraw just this request.
+    """
+    def add_to_store(job):
+        path = store_download(job, family, version, variant)
+        if path and on_done:
+            on_done(path)
+
+    dest = local_fonts.staging_path(family, variant, version)
+    job = download_manager.submit(url, dest, label=family, on_done=add_to_store)
+    if not bpy.app.timers.is_registered(process_downloads):
+        bpy.app.timers.register(process_downloads, first_interval=0.1)
+    return job, add_to_store
+
+
+# ============================================================================
+# Sharded Batch Jobs
+# ============================================================================
+
+class BatchJob:
+    """Sharded batch started from the panel and where its signs are merged"""
+
+    def __init__(self, runner, scene_name, collection, link, work_dir, temporary):
+        self.runner = runner
+        self.scene_name = scene_name
+        self.collection = collection
+        self.link = link
+        self.work_dir = work_dir
+        self.temporary = temporary
+
+
+# Running batch job, and the outcome of the last one for the panel
+batch_job = None
+batch_job_status = ""
+
+
+def shard_options(instance=False, node_signs=False, glyph_signs=False, subset_fonts=False, bold_weight=700):
+    """cli.py batch flags that give workers the same sign mode as this file"""
+    options = ["--bold-weight", str(bold_weight)]
+    for flag, enabled in (("--instance", instance), ("--geonodes", node_signs),
+                          ("--glyphs", glyph_signs), ("--subset", subset_fonts)):
+        if enabled:
+            options.append(flag)
+    return options
+
+
+def new_batch_job(specs, work_dir, workers, shards, collection, options=(), retries=jobs.RETRIES):
+    """Write the shards of a batch to work_dir and return a ShardRunner for them
+
+    Fonts are resolved here, since workers start without this file and
+    can't resolve paths relative to it.
+    """
+    for spec in specs:
+        if spec['font']:
+            spec['font'] = resolve_font(spec['font']) or spec['font']
+    shard_list = jobs.prepare_shards(specs, work_dir, shards, collection)
+    binary = bpy.app.binary_path
+    return jobs.ShardRunner(shard_list, lambda shard: jobs.worker_command(binary, shard, options), workers, retries)
+
+
+def finish_batch_job(job):
+    """Merge the finished shards of a job into its scene and describe the outcome"""
+    runner = job.runner
+    done = runner.done()
+    failed = runner.failed()
+    for shard in failed:
+        print(f"QuickSigns: shard {shard.index + 1} failed after {shard.attempts} attempts: {shard.error}")
+
+    scene = bpy.data.scenes.get(job.scene_name) or bpy.context.scene
+    collection = builder.get_batch_collection(scene, job.collection)
+    merged = builder.merge_shards([(shard.output_path, shard.collection) for shard in done], collection, link=job.link)
+    if job.temporary:
+        shutil.rmtree(job.work_dir, ignore_errors=True)
+
+    signs, total, _running, _finished = runner.progress()
+    status = f"Batch: {signs}/{total} signs in {len(merged)} shards, {runner.elapsed:.1f}s"
+    if failed:
+        status += f", {len(failed)} shards failed (see console)"
+    return status
+
+
+def process_batch_job():
+    """Timer callback that runs the panel's batch job and merges it once every shard is done"""
+    global batch_job, batch_job_status
+    job = batch_job
+    if job is None:
+        return None
+
+    busy = job.runner.poll()
+    if not busy:
+        batch_job = None
+        batch_job_status = finish_batch_job(job)
+        print(f"QuickSigns: {batch_job_status}")
+    redraw_sidebars()
+    return 0.5 if busy else None
+
+
+def cancel_batch_job():
+    """Stop the panel's batch job without merging anything"""
+    global batch_job, batch_job_status
+    job = batch_job
+    if job is None:
+        return
+    batch_job = None
+    job.runner.cancel()
+    if bpy.app.timers.is_registered(process_batch_job):
+        bpy.app.timers.unregister(process_batch_job)
+    if job.temporary:
+        shutil.rmtree(job.work_dir, ignore_errors=True)
+    batch_job_status = "Batch cancelled"
+
+
 # ============================================================================
 # Google Fonts API Integration
 # ============================================================================
@@ -51,60 +474,73 @@ class SIGNS_OT_SearchFonts(Operator):
     """Search Google Fonts"""
     bl_idname = "signs.search_fonts"
     bl_label = "Search Fonts"
-    bl_options = {'REGISTER', 'UNDO'}
+    # No undo step: results live outside the scene and are cheap to recompute
+    bl_options = {'REGISTER'}
 
-    def execute(self, context):
-        # Check online access permission
-        if not check_online_access(self):
-            return {'CANCELLED'}
+    force_refresh: BoolProperty(
+        name="Force Refresh",
+        description="Download the catalog even if the cached copy is still fresh",
+        default=False
+    )
 
+    def execute(self, context):
         props = context.scene.signs_props
         api_key = props.google_fonts_api_key
 
-        if not api_key:
-            self.report({'ERROR'}, "Please enter your Google Fonts API key")
-            return {'CANCELLED'}
-
-        try:
-            url = f"https://www.googleapis.com/webfonts/v1/webfonts?key={api_key}&sort=popularity"
+        # Only need the network when the cached catalog is stale
+        offline = False
+        if self.force_refresh or not catalog_cache.is_fresh():
+            # Offline, a catalog already on disk is searched as it is
+            offline = not bpy.context.preferences.system.use_online_access and catalog_cache.cached_fonts() is not None
+            if not offline and not check_online_access(self):
+                return {'CANCELLED'}
 
-            with urllib.request.urlopen(url, timeout=10) as response:
-                data = json.loads(response.read().decode('utf-8'))
-                fonts = data.get('items', [])
+            if not offline and not api_key:
+                self.report({'ERROR'}, "Please enter your Google Fonts API key")
+                return {'CANCELLED'}
 
-                # Clear existing font list
-                props.font_list.clear()
+        if not offline:
+            try:
+                with profiling.profiler.stage('search.catalog'):
+                    catalog_cache.get_fonts(api_key, force_refresh=self.force_refresh)
+            except Exception as e:
+                self.report({'ERROR'}, f"Error: {str(e)}")
+                return {'CANCELLED'}
 
-                # Get filter values
-                search_query = props.font_search_query.lower()
-                category_filter = props.font_category_filter
+        with profiling.profiler.stage('search.query'):
+            ids = run_search(context.scene)
 
-                for font in fonts:
-                    # Filter by search query
-                    if search_query and search_query not in font['family'].lower():
-                        continue
+        if offline:
+            self.report({'WARNING'}, f"Found {len(ids)} fonts in the cached catalog; online access is off, so results may be stale")
+            return {'FINISHED'}
 
-                    # Filter by category
-                    font_category = font.get('category', 'sans-serif')
-                    if category_filter != 'ALL' and font_category != category_filter:
-                        continue
+        stats = catalog_cache.stats()
+        self.report({'INFO'}, f"Found {len(ids)} fonts (catalog cache: {stats['hits']} hits, {stats['misses']} misses)")
+        return {'FINISHED'}
 
-                    item = props.font_list.add()
-                    item.name = font['family']
-                    item.family = font['family']
-                    item.category = font_category
 
-                    # Store the regular variant URL
-                    if 'files' in font and 'regular' in font['files']:
-                        item.url = font['files']['regular']
+class SIGNS_OT_ResultPage(Operator):
+    """Show another page of search results"""
+    bl_idname = "signs.result_page"
+    bl_label = "Result Page"
+    bl_options = {'REGISTER'}
 
-                self.report({'INFO'}, f"Found {len(props.font_list)} fonts")
-                return {'FINISHED'}
+    step: IntProperty(
+        name="Step",
+        description="Number of pages to move by",
+        default=1
+    )
 
-        except Exception as e:
-            self.report({'ERROR'}, f"Error: {str(e)}")
+    def execute(self, context):
+        scene = context.scene
+        page = search_pages.get(scene.name, 0) + self.step
+        if scene.name not in search_results or not 0 <= page < page_count(scene):
             return {'CANCELLED'}
 
+        show_page(scene, page)
+        scene.signs_props.font_list_index = 0
+        return {'FINISHED'}
+
 
 class SIGNS_OT_DownloadFont(Operator):
     """Download and install selected font"""
@@ -129,36 +565,115 @@ class SIGNS_OT_DownloadFont(Operator):
             self.report({'ERROR'}, "Font URL not available")
             return {'CANCELLED'}
 
-        try:
-            # Create fonts directory if it doesn't exist
-            fonts_dir = os.path.join(os.path.dirname(__file__), "fonts")
-            os.makedirs(fonts_dir, exist_ok=True)
-
-            # Download font
-            with urllib.request.urlopen(selected_font.url, timeout=30) as response:
-                font_data = response.read()
-
-                # Save font file
-                font_filename = f"{selected_font.family.replace(' ', '_')}.ttf"
-                font_path = os.path.join(fonts_dir, font_filename)
-
-                with open(font_path, 'wb') as f:
-                    f.write(font_data)
-
-                # Load font into Blender
-                if os.path.exists(font_path):
-                    bpy.data.fonts.load(font_path)
-                    props.selected_font_path = font_path
-                    self.report({'INFO'}, f"Downloaded and loaded: {selected_font.family}")
-                    return {'FINISHED'}
-                else:
-                    self.report({'ERROR'}, "Failed to save font file")
-                    return {'CANCELLED'}
+        family = selected_font.family
+        scene_name = context.scene.name
+
+        def on_done(font_path):
+            # Load font into Blender
+            with profiling.profiler.stage('download.load_font'):
+                bpy.data.fonts.load(font_path, check_existing=True)
+            scene = bpy.data.scenes.get(scene_name)
+            if scene:
+                scene.signs_props.selected_font_path = font_path
+            print(f"QuickSigns: Downloaded and loaded: {family}")
+
+        with profiling.profiler.stage('download.queue'):
+            queue_font_download(selected_font.url, family, selected_font.version, on_done)
+        self.report({'INFO'}, f"Downloading: {family}")
+        return {'FINISHED'}
 
-        except Exception as e:
-            self.report({'ERROR'}, f"Error downloading font: {str(e)}")
+
+class SIGNS_OT_DownloadAllListed(Operator):
+    """Download every font in the search results in parallel"""
+    bl_idname = "signs.download_all_listed"
+    bl_label = "Download All Listed"
+    bl_options = {'REGISTER'}
+
+    _timer = None
+    _jobs = []
+    _callbacks = []
+    _skipped = 0
+    _start = 0.0
+
+    def execute(self, context):
+        # Check online access permission
+        if not check_online_access(self):
+            return {'CANCELLED'}
+
+        props = context.scene.signs_props
+
+        # All search results, not only the page shown in the list.
+        # Skip fonts that are already in the store
+        records = result_records(context.scene)
+        pending = {}
+        for record in records:
+            if record.url and not local_fonts.contains(record.family, 'regular', record.version):
+                pending[record.family] = (record.url, record.version)
+        self._skipped = len(records) - len(pending)
+
+        if not pending:
+            self.report({'INFO'}, f"All {len(records)} listed fonts are already downloaded")
+            return {'FINISHED'}
+
+        # The shared queue, so a font also requested by Download Font is fetched once
+        download_manager.set_max_workers(props.download_workers)
+        queued = [queue_font_download(url, family, version) for family, (url, version) in pending.items()]
+        self._jobs = [job for job, _callback in queued]
+        self._callbacks = [callback for _job, callback in queued]
+        self._start = time.perf_counter()
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            # Fonts also requested elsewhere keep downloading for those requests
+            for job, callback in zip(self._jobs, self._callbacks):
+                download_manager.release(job, callback)
+            self.finish(context)
+            self.report({'WARNING'}, "Download cancelled")
             return {'CANCELLED'}
 
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        download_manager.drain()
+        local_fonts.flush()
+        font_coverage.flush()
+        done = sum(1 for job in self._jobs if job.finished)
+        context.workspace.status_text_set(f"QuickSigns: downloaded {done}/{len(self._jobs)} fonts (Esc to cancel)")
+
+        if done < len(self._jobs):
+            return {'PASS_THROUGH'}
+
+        self.finish(context)
+        self.report_summary()
+        return {'FINISHED'}
+
+    def finish(self, context):
+        context.window_manager.event_timer_remove(self._timer)
+        context.workspace.status_text_set(None)
+
+    def report_summary(self):
+        """Print and report the throughput of the batch"""
+        elapsed = max(time.perf_counter() - self._start, 1e-6)
+        downloaded = [job for job in self._jobs if job.state == 'DONE']
+        failed = [job for job in self._jobs if job.state == 'FAILED']
+        megabytes = sum(job.bytes_done for job in downloaded) / (1024 * 1024)
+        retries = sum(job.attempts for job in self._jobs)
+
+        summary = (
+            f"Downloaded {len(downloaded)} fonts ({megabytes:.1f} MB) in {elapsed:.1f}s: "
+            f"{len(downloaded) / elapsed:.1f} fonts/s, {megabytes / elapsed:.2f} MB/s, "
+            f"{self._skipped} skipped, {len(failed)} failed, {retries} retries"
+        )
+        print(f"QuickSigns: {summary}")
+        for job in failed:
+            print(f"QuickSigns:   {job.label}: {job.error}")
+        self.report({'WARNING'} if failed else {'INFO'}, summary)
+
 
 class SIGNS_OT_PreviewFont(Operator):
     """Preview selected font with sample text"""
@@ -175,53 +690,41 @@ class SIGNS_OT_PreviewFont(Operator):
 
         selected_font = props.font_list[props.font_list_index]
 
-        # Download font first if not already downloaded
-        font_filename = f"{selected_font.family.replace(' ', '_')}.ttf"
-        fonts_dir = os.path.join(os.path.dirname(__file__), "fonts")
-        font_path = os.path.join(fonts_dir, font_filename)
+        family = selected_font.family
+        with profiling.profiler.stage('preview.lookup'):
+            font_path = find_font(family, selected_font.version)
 
-        if not os.path.exists(font_path):
-            # Check online access permission before downloading
-            if not check_online_access(self):
-                return {'CANCELLED'}
-
-            # Download the font
+        if font_path:
             try:
-                os.makedirs(fonts_dir, exist_ok=True)
-                with urllib.request.urlopen(selected_font.url, timeout=30) as response:
-                    font_data = response.read()
-                    with open(font_path, 'wb') as f:
-                        f.write(font_data)
+                with profiling.profiler.stage('preview.show'):
+                    preview.show_font_preview(context.scene, font_path, family)
             except Exception as e:
-                self.report({'ERROR'}, f"Error downloading font: {str(e)}")
+                self.report({'ERROR'}, f"Error creating preview: {str(e)}")
                 return {'CANCELLED'}
 
-        # Create preview text object
-        try:
-            # Delete existing preview if it exists
-            if "Font_Preview" in bpy.data.objects:
-                bpy.data.objects.remove(bpy.data.objects["Font_Preview"], do_unlink=True)
+            self.report({'INFO'}, f"Preview: {family}")
+            return {'FINISHED'}
 
-            # Create new preview text
-            bpy.ops.object.text_add(location=(0, 0, 0))
-            preview_obj = context.active_object
-            preview_obj.name = "Font_Preview"
+        # Check online access permission before downloading
+        if not check_online_access(self):
+            return {'CANCELLED'}
 
-            preview_text = preview_obj.data
-            preview_text.body = selected_font.family
-            preview_text.size = 0.5
-            preview_text.align_x = 'CENTER'
+        if not selected_font.url:
+            self.report({'ERROR'}, "Font URL not available")
+            return {'CANCELLED'}
 
-            # Load and apply font
-            font = bpy.data.fonts.load(font_path, check_existing=True)
-            preview_text.font = font
+        scene_name = context.scene.name
 
-            self.report({'INFO'}, f"Preview: {selected_font.family}")
-            return {'FINISHED'}
+        def on_done(path):
+            scene = bpy.data.scenes.get(scene_name)
+            if scene:
+                with profiling.profiler.stage('preview.show'):
+                    preview.show_font_preview(scene, path, family)
 
-        except Exception as e:
-            self.report({'ERROR'}, f"Error creating preview: {str(e)}")
-            return {'CANCELLED'}
+        # Preview is created once the download finishes
+        queue_font_download(selected_font.url, family, selected_font.version, on_done)
+        self.report({'INFO'}, f"Downloading for preview: {family}")
+        return {'FINISHED'}
 
 
 # ============================================================================
@@ -237,26 +740,9 @@ class SIGNS_OT_RandomName(Operator):
     def execute(self, context):
         import random
 
-        # Word lists for store names
-        adjectives = [
-            "Golden", "Silver", "Royal", "Grand", "Elite", "Prime", "Supreme",
-            "Classic", "Modern", "Urban", "Rustic", "Vintage", "Fresh", "Bright",
-            "Happy", "Cozy", "Swift", "Noble", "Lucky", "Magic", "Mystic",
-            "Crystal", "Diamond", "Pearl", "Sunset", "Sunrise", "Midnight",
-            "Blue", "Green", "Red", "Cosmic", "Stellar", "Azure", "Crimson"
-        ]
-
-        nouns = [
-            "Coffee", "Bakery", "Bistro", "Cafe", "Deli", "Kitchen", "Grill",
-            "Market", "Shop", "Store", "Boutique", "Gallery", "Studio", "Bar",
-            "Lounge", "Pizza", "Burger", "Tacos", "Sushi", "Noodles", "Bowl",
-            "Plate", "Fork", "Spoon", "Cup", "Mug", "Bean", "Brew", "Slice",
-            "Corner", "Place", "Spot", "House", "Depot", "Emporium", "Trading"
-        ]
-
         # Generate random name
-        adj = random.choice(adjectives)
-        noun = random.choice(nouns)
+        adj = random.choice(populate.ADJECTIVES)
+        noun = random.choice(populate.NOUNS)
         name = f"{adj} {noun}"
 
         # Set the text
@@ -280,48 +766,422 @@ class SIGNS_OT_CreateSign(Operator):
             self.report({'ERROR'}, "Please enter text for the sign")
             return {'CANCELLED'}
 
-        # Create text object
-        bpy.ops.object.text_add(location=(0, 0, 0))
-        text_obj = context.active_object
-        text_obj.name = f"Sign_{props.sign_text[:10]}"
-
-        # Set text data
-        text_data = text_obj.data
-        text_data.body = props.sign_text
-        text_data.size = props.text_size
-        text_data.extrude = props.text_extrude
-        text_data.bevel_depth = props.text_bevel
-
-        # Apply font if one is selected
-        if props.selected_font_path and os.path.exists(props.selected_font_path):
-            try:
-                font = bpy.data.fonts.load(props.selected_font_path, check_existing=True)
-                text_data.font = font
-            except:
-                pass
+        weight = int(props.bold_weight)
 
-        # Create material
-        self.create_material(text_obj, props)
+        def resolve_style(font_path, spec):
+            style_path = style_font_path(font_path, spec, weight)
+            # Only text curves pick the variant up once it's downloaded
+            if style_path is None and (props.instance_mode or props.glyph_signs or props.node_signs):
+                self.report({'WARNING'}, "Style variant isn't downloaded yet, the sign uses the regular font")
+            return style_path
+
+        # Create text object
+        spec = spec_from_props(props)
+        with profiling.profiler.stage('create.total'):
+            (text_obj,), _elapsed = builder.build_signs(
+                [spec], context.collection,
+                resolve_font=bpy.path.abspath,
+                instance=props.instance_mode, scene=context.scene,
+                node_signs=props.node_signs, glyph_signs=props.glyph_signs, resolve_style=resolve_style,
+                subset_font=font_subsets.get if props.subset_fonts else None
+            )
+
+        for obj in context.selected_objects:
+            obj.select_set(False)
+        text_obj.select_set(True)
+        context.view_layer.objects.active = text_obj
 
         self.report({'INFO'}, f"Created sign: {props.sign_text}")
+        report_ignored_bevels(self, [spec], props.node_signs)
+        return {'FINISHED'}
+
+
+class SIGNS_OT_BatchCreate(Operator):
+    """Create signs from a CSV or JSON file of text, font, size, material and transform rows"""
+    bl_idname = "signs.batch_create"
+    bl_label = "Batch Create Signs"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: StringProperty(subtype='FILE_PATH')
+    filter_glob: StringProperty(default="*.csv;*.json", options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        props = context.scene.signs_props
+
+        try:
+            specs = builder.load_specs(bpy.path.abspath(self.filepath), defaults=spec_from_props(props))
+        except Exception as e:
+            self.report({'ERROR'}, f"Error reading {os.path.basename(self.filepath)}: {str(e)}")
+            return {'CANCELLED'}
+
+        if not specs:
+            self.report({'WARNING'}, "No signs in file")
+            return {'CANCELLED'}
+
+        if props.batch_workers > 1:
+            return self.start_job(context, specs)
+
+        collection = builder.get_batch_collection(context.scene)
+        weight = int(props.bold_weight)
+        objects, elapsed = builder.build_signs(
+            specs, collection, resolve_font=resolve_font,
+            instance=props.instance_mode, scene=context.scene, node_signs=props.node_signs,
+            glyph_signs=props.glyph_signs, resolve_style=lambda font_path, spec: style_font_path(font_path, spec, weight),
+            subset_font=font_subsets.get if props.subset_fonts else None
+        )
+
+        self.report({'INFO'}, f"Created {len(objects)} signs in {elapsed:.2f}s ({len(objects) / max(elapsed, 1e-6):.0f} rows/s)")
+        report_ignored_bevels(self, specs, props.node_signs)
         return {'FINISHED'}
 
-    def create_material(self, obj, props):
-        """Create and assign material"""
-        # Create material
-        mat = bpy.data.materials.new(name="Sign_Material")
-        mat.use_nodes = True
-        bsdf = mat.node_tree.nodes.get('Principled BSDF')
-        if bsdf:
-            bsdf.inputs['Base Color'].default_value = (*props.text_color, 1.0)
-            bsdf.inputs['Metallic'].default_value = props.text_metallic
-            bsdf.inputs['Roughness'].default_value = props.text_roughness
-
-        # Assign material
-        if obj.data.materials:
-            obj.data.materials[0] = mat
+    def start_job(self, context, specs):
+        """Build the specs in background Blender processes, merged by process_batch_job"""
+        global batch_job, batch_job_status
+        props = context.scene.signs_props
+        if batch_job is not None:
+            self.report({'ERROR'}, "A batch is already running")
+            return {'CANCELLED'}
+
+        if props.batch_link:
+            if not bpy.data.filepath:
+                self.report({'ERROR'}, "Save the file first, linked shard files are kept next to it")
+                return {'CANCELLED'}
+            name = bpy.path.display_name_from_filepath(bpy.data.filepath)
+            work_dir = os.path.join(bpy.path.abspath("//"), f"{name}_signs", time.strftime("batch_%Y%m%d_%H%M%S"))
         else:
-            obj.data.materials.append(mat)
+            work_dir = tempfile.mkdtemp(prefix="quicksigns_batch_")
+
+        options = shard_options(
+            instance=props.instance_mode, node_signs=props.node_signs, glyph_signs=props.glyph_signs,
+            subset_fonts=props.subset_fonts, bold_weight=int(props.bold_weight)
+        )
+        runner = new_batch_job(specs, work_dir, props.batch_workers, props.batch_workers, "QuickSigns Batch", options)
+        batch_job = BatchJob(runner, context.scene.name, "QuickSigns Batch", props.batch_link, work_dir,
+                             temporary=not props.batch_link)
+        batch_job_status = ""
+        runner.poll()
+        if not bpy.app.timers.is_registered(process_batch_job):
+            bpy.app.timers.register(process_batch_job, first_interval=0.5)
+
+        self.report({'INFO'}, f"Building {len(specs)} signs in {len(runner.shards)} background Blender processes")
+        report_ignored_bevels(self, specs, props.node_signs)
+        return {'FINISHED'}
+
+
+class SIGNS_OT_CancelBatch(Operator):
+    """Stop the running batch and discard its shards"""
+    bl_idname = "signs.cancel_batch"
+    bl_label = "Cancel Batch"
+
+    @classmethod
+    def poll(cls, context):
+        return batch_job is not None
+
+    def execute(self, context):
+        cancel_batch_job()
+        return {'FINISHED'}
+
+
+class SIGNS_OT_PopulateSigns(Operator):
+    """Place a sign with a random store name on every anchor vertex or object, facing outwards"""
+    bl_idname = "signs.populate_signs"
+    bl_label = "Populate Signs"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        props = context.scene.signs_props
+
+        with profiling.profiler.stage('populate.anchors'):
+            if props.populate_source == 'VERTICES':
+                if props.populate_object is None or props.populate_object.type != 'MESH':
+                    self.report({'ERROR'}, "Choose a mesh object whose vertices are the anchors")
+                    return {'CANCELLED'}
+                if props.populate_object.mode == 'EDIT':
+                    props.populate_object.update_from_editmode()
+                positions, normals = populate.vertex_anchors(props.populate_object, props.populate_selected_only)
+            else:
+                if props.populate_collection is None:
+                    self.report({'ERROR'}, "Choose a collection whose objects are the anchors")
+                    return {'CANCELLED'}
+                positions, normals = populate.collection_anchors(props.populate_collection)
+            positions, normals = populate.pick_anchors(positions, normals, props.populate_count, props.populate_seed)
+
+        if not len(positions):
+            self.report({'WARNING'}, "No anchors to place signs on")
+            return {'CANCELLED'}
+
+        base = spec_from_props(props)
+        specs = [dict(base, text=name) for name in populate.random_names(len(positions), props.populate_seed)]
+
+        collection = populate.new_population_collection(context.collection)
+
+        weight = int(props.bold_weight)
+        objects, elapsed = builder.build_signs(
+            specs, collection, resolve_font=bpy.path.abspath,
+            instance=props.instance_mode, scene=context.scene, node_signs=props.node_signs,
+            glyph_signs=props.glyph_signs, resolve_style=lambda font_path, spec: style_font_path(font_path, spec, weight),
+            subset_font=font_subsets.get if props.subset_fonts else None
+        )
+
+        with profiling.profiler.stage('populate.transforms'):
+            locations, rotations, scales = populate.sign_transforms(
+                positions, normals, props.populate_offset, props.populate_scale_jitter, props.populate_seed
+            )
+            populate.write_transforms(objects, locations, rotations, scales)
+
+        self.report({'INFO'}, f"Placed {len(objects)} signs in {elapsed:.2f}s")
+        report_ignored_bevels(self, specs, props.node_signs)
+        return {'FINISHED'}
+
+
+class SIGNS_OT_RebuildSigns(Operator):
+    """Update signs whose settings or font files changed since they were built, without recreating them"""
+    bl_idname = "signs.rebuild_signs"
+    bl_label = "Rebuild Signs"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope: EnumProperty(
+        name="Signs",
+        items=[
+            ('ALL', "All", "Every sign in the file"),
+            ('SELECTED', "Selected", "Selected signs only"),
+        ],
+        default='ALL',
+        options={'SKIP_SAVE'}
+    )
+
+    apply_panel: BoolProperty(
+        name="Apply Panel Settings",
+        description="Give the signs the panel's font, shape and material settings, keeping their text and transform",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+
+    def execute(self, context):
+        props = context.scene.signs_props
+        signs = registry.sign_objects(context.selected_objects if self.scope == 'SELECTED' else None)
+        if not signs:
+            self.report({'WARNING'}, "No QuickSigns signs to rebuild")
+            return {'CANCELLED'}
+
+        if self.apply_panel:
+            panel = spec_from_props(props)
+            for obj in signs:
+                record = registry.read_record(obj)
+                # Signs without a readable record are left to rebuild_signs to skip
+                if record is None or not isinstance(record.get('spec'), dict):
+                    continue
+                spec = dict(panel, **{key: record['spec'][key] for key in KEPT_FIELDS if key in record['spec']})
+                registry.update_record(obj, spec=spec)
+
+        start = time.perf_counter()
+        weight = int(props.bold_weight)
+        rebuilt, unchanged, skipped = builder.rebuild_signs(
+            signs, resolve_font=resolve_font, scene=context.scene,
+            resolve_style=lambda font_path, spec: style_font_path(font_path, spec, weight),
+            subset_font=font_subsets.get
+        )
+        elapsed = time.perf_counter() - start
+
+        self.report({'INFO'}, f"Rebuilt {rebuilt} signs, {unchanged} unchanged, {skipped} skipped in {elapsed:.2f}s")
+        return {'FINISHED'}
+
+
+class SIGNS_OT_ExportFontBundle(Operator):
+    """Collect every font used by signs in this file into one bundle for offline machines"""
+    bl_idname = "signs.export_font_bundle"
+    bl_label = "Export Font Bundle"
+    bl_options = {'REGISTER'}
+
+    filepath: StringProperty(subtype='FILE_PATH')
+    filter_glob: StringProperty(default="*.zip", options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            stem = os.path.splitext(bpy.data.filepath)[0] if bpy.data.filepath else "signs"
+            self.filepath = f"{stem}_fonts.zip"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        path = bpy.path.ensure_ext(bpy.path.abspath(self.filepath), ".zip")
+        try:
+            manifest = bundle.export_bundle(path, local_fonts)
+        except (bundle.BundleError, OSError) as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Bundled {len(manifest['fonts'])} fonts to {os.path.basename(path)}")
+        return {'FINISHED'}
+
+
+class SIGNS_OT_ImportFontBundle(Operator):
+    """Add the fonts of a bundle to the local store and point this file's fonts at them"""
+    bl_idname = "signs.import_font_bundle"
+    bl_label = "Import Font Bundle"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: StringProperty(subtype='FILE_PATH')
+    filter_glob: StringProperty(default="*.zip", options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        try:
+            added, skipped = bundle.import_bundle(bpy.path.abspath(self.filepath), local_fonts)
+        except (bundle.BundleError, OSError) as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        remapped = bundle.remap_fonts(local_fonts)
+        refine_coverage(stored_fonts())
+        font_coverage.flush()
+        self.report({'INFO'}, f"Imported {added} fonts ({skipped} already present), remapped {remapped}")
+        return {'FINISHED'}
+
+
+class SIGNS_OT_ConsolidateMaterials(Operator):
+    """Merge duplicate sign materials that have the same color, metallic and roughness"""
+    bl_idname = "signs.consolidate_materials"
+    bl_label = "Consolidate Materials"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        removed = materials.consolidate_materials()
+        materials.material_cache.clear()
+        self.report({'INFO'}, f"Removed {removed} duplicate materials")
+        return {'FINISHED'}
+
+
+class SIGNS_OT_BakeLODs(Operator):
+    """Convert selected text signs to meshes with full, medium and low detail levels"""
+    bl_idname = "signs.bake_lods"
+    bl_label = "Bake Sign LODs"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return any(obj.type == 'FONT' for obj in context.selected_objects)
+
+    def execute(self, context):
+        props = context.scene.signs_props
+        distances = (0.0, props.lod_medium_distance, props.lod_low_distance)
+        signs = [obj for obj in context.selected_objects if obj.type == 'FONT']
+
+        totals = [[0, 0.0] for _name in lod.LOD_NAMES]
+        baked_objects = []
+        for obj in signs:
+            name = obj.name
+            try:
+                baked, results = lod.bake_sign(
+                    obj, context.scene, distances,
+                    medium_ratio=props.lod_medium_ratio, low_ratio=props.lod_low_ratio
+                )
+            except Exception as e:
+                self.report({'ERROR'}, f"Error baking {name}: {str(e)}")
+                continue
+
+            print(f"QuickSigns: baked {name}")
+            for level, (mesh, tris, seconds) in enumerate(results):
+                print(f"QuickSigns:   {lod.LOD_NAMES[level]:<6} {tris:>8} tris {seconds * 1000:8.1f} ms")
+                totals[level][0] += tris
+                totals[level][1] += seconds
+            baked_objects.append(baked)
+
+        for obj in baked_objects:
+            obj.select_set(True)
+        lod.apply_viewport_lods(context.scene)
+
+        summary = ", ".join(
+            f"{name} {tris} tris / {seconds * 1000:.0f} ms"
+            for name, (tris, seconds) in zip(lod.LOD_NAMES, totals)
+        )
+        self.report({'INFO'}, f"Baked {len(baked_objects)} signs: {summary}")
+        return {'FINISHED'}
+
+
+class SIGNS_OT_ResetProfile(Operator):
+    """Clear the collected stage timings"""
+    bl_idname = "signs.reset_profile"
+    bl_label = "Reset Timings"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        profiling.profiler.reset()
+        return {'FINISHED'}
+
+
+class SIGNS_OT_ExportProfile(Operator):
+    """Write the collected stage timings to a file for offline analysis"""
+    bl_idname = "signs.export_profile"
+    bl_label = "Export Timings"
+    bl_options = {'REGISTER'}
+
+    filepath: StringProperty(subtype='FILE_PATH')
+    filter_glob: StringProperty(default="*.json", options={'HIDDEN'})
+
+    format: EnumProperty(
+        name="Format",
+        items=[
+            ('JSON', "JSON", "Per-stage aggregates and every recorded span"),
+            ('CHROME', "Chrome Trace", "Spans for chrome://tracing or Perfetto"),
+        ],
+        default='JSON'
+    )
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "quicksigns_trace.json" if self.format == 'CHROME' else "quicksigns_timings.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        path = bpy.path.ensure_ext(bpy.path.abspath(self.filepath), ".json")
+        try:
+            if self.format == 'CHROME':
+                profiling.profiler.export_chrome_trace(path)
+            else:
+                profiling.profiler.export_json(path)
+        except OSError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Wrote timings to {os.path.basename(path)}")
+        return {'FINISHED'}
+
+
+def report_ignored_bevels(operator, specs, node_signs):
+    """Warn when Geometry Nodes signs are built without the bevel they asked for"""
+    ignored = builder.ignored_bevels(specs, node_signs)
+    if ignored:
+        operator.report({'WARNING'}, f"Geometry Nodes signs have no bevel, {ignored} signs were built flat")
+
+
+def spec_from_props(props):
+    """Sign spec built from the panel settings"""
+    return builder.normalize_spec({}, defaults={
+        'text': props.sign_text,
+        'font': props.selected_font_path,
+        'size': props.text_size,
+        'extrude': props.text_extrude,
+        'bevel': props.text_bevel,
+        'bold': props.text_bold,
+        'italic': props.text_italic,
+        'box_width': props.box_width if props.fit_to_box else 0.0,
+        'box_height': props.box_height if props.fit_to_box else 0.0,
+        'wrap': props.text_wrap,
+        'max_lines': props.max_lines,
+        'line_spacing': props.line_spacing,
+        'color': tuple(props.text_color),
+        'metallic': props.text_metallic,
+        'roughness': props.text_roughness,
+    })
 
 
 # ============================================================================
@@ -332,8 +1192,25 @@ def update_auto_preview(self, context):
     """Handle auto-preview toggle"""
     if not self.auto_preview:
         # Delete preview when disabled
-        if "Font_Preview" in bpy.data.objects:
-            bpy.data.objects.remove(bpy.data.objects["Font_Preview"], do_unlink=True)
+        preview.cancel_pending()
+        preview.remove_preview()
+
+
+def update_lod_viewport_level(self, context):
+    """Show the chosen LOD on baked signs in the viewport"""
+    lod.apply_viewport_lods(context.scene)
+
+
+def update_search(self, context):
+    """Filter the cached catalog on every keystroke; no-op before the first search"""
+    if catalog_cache.cached_fonts() is not None:
+        run_search(context.scene)
+
+
+def update_sign_text(self, context):
+    """Refilter the font list when it only shows fonts covering the sign text"""
+    if self.font_cover_sign_text:
+        update_search(self, context)
 
 
 def update_font_preview(self, context):
@@ -341,49 +1218,54 @@ def update_font_preview(self, context):
     if not self.auto_preview:
         return
 
-    if self.font_list_index < 0 or self.font_list_index >= len(self.font_list):
+    # Only the last selection within the debounce window is previewed
+    scene_name = context.scene.name
+    preview.debounce(lambda: refresh_auto_preview(scene_name))
+
+
+def refresh_auto_preview(scene_name):
+    """Preview the currently selected font, downloading it in the background if needed"""
+    scene = bpy.data.scenes.get(scene_name)
+    if scene is None:
         return
+    props = scene.signs_props
 
-    # Check online access permission
-    if not bpy.context.preferences.system.use_online_access:
+    if not props.auto_preview or not 0 <= props.font_list_index < len(props.font_list):
         return
 
-    selected_font = self.font_list[self.font_list_index]
+    selected_font = props.font_list[props.font_list_index]
+    family = selected_font.family
 
-    # Download font if not already downloaded
-    font_filename = f"{selected_font.family.replace(' ', '_')}.ttf"
-    fonts_dir = os.path.join(os.path.dirname(__file__), "fonts")
-    font_path = os.path.join(fonts_dir, font_filename)
+    def apply_preview(path):
+        scene = bpy.data.scenes.get(scene_name)
+        if scene is None:
+            return
+        props = scene.signs_props
 
-    if not os.path.exists(font_path):
-        try:
-            os.makedirs(fonts_dir, exist_ok=True)
-            with urllib.request.urlopen(selected_font.url, timeout=30) as response:
-                font_data = response.read()
-                with open(font_path, 'wb') as f:
-                    f.write(font_data)
-        except:
+        # Skip if the selection moved on while downloading
+        if not props.auto_preview or not 0 <= props.font_list_index < len(props.font_list):
+            return
+        if props.font_list[props.font_list_index].family != family:
             return
 
-    # Create/update preview
-    try:
-        if "Font_Preview" in bpy.data.objects:
-            preview_obj = bpy.data.objects["Font_Preview"]
-        else:
-            bpy.ops.object.text_add(location=(0, 0, 0))
-            preview_obj = context.view_layer.objects.active
-            preview_obj.name = "Font_Preview"
+        try:
+            with profiling.profiler.stage('preview.auto'):
+                preview.show_font_preview(scene, path, props.preview_sample_text if props.preview_sample_text else family)
+        except Exception as e:
+            print(f"QuickSigns: Error creating preview: {e}")
 
-        preview_text = preview_obj.data
-        preview_text.body = self.preview_sample_text if self.preview_sample_text else selected_font.family
-        preview_text.size = 0.5
-        preview_text.align_x = 'CENTER'
+    with profiling.profiler.stage('preview.lookup'):
+        font_path = find_font(family, selected_font.version)
+    if font_path:
+        apply_preview(font_path)
+        return
 
-        # Load and apply font
-        font = bpy.data.fonts.load(font_path, check_existing=True)
-        preview_text.font = font
-    except:
-        pass
+    # Check online access permission
+    if not bpy.context.preferences.system.use_online_access:
+        return
+
+    if selected_font.url:
+        queue_font_download(selected_font.url, family, selected_font.version, apply_preview)
 
 
 class FontListItem(PropertyGroup):
@@ -391,6 +1273,7 @@ class FontListItem(PropertyGroup):
     family: StringProperty(name="Font Family", default="")
     category: StringProperty(name="Category", default="")
     url: StringProperty(name="Download URL", default="")
+    version: StringProperty(name="Version", default="")
 
 
 class SignsProperties(PropertyGroup):
@@ -420,8 +1303,10 @@ class SignsProperties(PropertyGroup):
 
     font_search_query: StringProperty(
         name="Search",
-        description="Search for fonts by name",
-        default=""
+        description="Search for fonts by name; typos are matched too",
+        default="",
+        options={'TEXTEDIT_UPDATE'},
+        update=update_search
     )
 
     font_category_filter: EnumProperty(
@@ -435,7 +1320,69 @@ class SignsProperties(PropertyGroup):
             ('handwriting', "Handwritten", "Handwritten and script fonts"),
             ('monospace', "Monospace", "Fixed-width fonts (typewriter style)"),
         ],
-        default='ALL'
+        default='ALL',
+        update=update_search
+    )
+
+    font_subset_filter: EnumProperty(
+        name="Script",
+        description="Only show fonts that support this character subset",
+        items=[
+            ('ALL', "All Scripts", "Show fonts for any script"),
+            ('latin', "Latin", ""),
+            ('latin-ext', "Latin Extended", ""),
+            ('cyrillic', "Cyrillic", ""),
+            ('greek', "Greek", ""),
+            ('vietnamese', "Vietnamese", ""),
+            ('arabic', "Arabic", ""),
+            ('hebrew', "Hebrew", ""),
+            ('devanagari', "Devanagari", ""),
+            ('thai', "Thai", ""),
+            ('japanese', "Japanese", ""),
+            ('korean', "Korean", ""),
+            ('chinese-simplified', "Chinese (Simplified)", ""),
+        ],
+        default='ALL',
+        update=update_search
+    )
+
+    font_min_variants: IntProperty(
+        name="Min Styles",
+        description="Only show families with at least this many styles (weights and italics)",
+        default=0,
+        min=0,
+        max=20,
+        update=update_search
+    )
+
+    font_max_rank: IntProperty(
+        name="Top",
+        description="Only show the N most popular fonts (0 for all)",
+        default=0,
+        min=0,
+        update=update_search
+    )
+
+    font_cover_sign_text: BoolProperty(
+        name="Covers Sign Text",
+        description="Only show fonts that have every character of the sign text. "
+                    "Judged from the catalog's scripts, and from the font file once downloaded",
+        default=False,
+        update=update_search
+    )
+
+    download_workers: IntProperty(
+        name="Workers",
+        description="Number of fonts downloaded at the same time, set when Download All Listed starts",
+        default=8,
+        min=1,
+        max=32
+    )
+
+    font_list_grid: BoolProperty(
+        name="Grid View",
+        description="Show the font list as a grid of thumbnails",
+        default=False
     )
 
     font_list: CollectionProperty(type=FontListItem)
@@ -452,7 +1399,8 @@ class SignsProperties(PropertyGroup):
     sign_text: StringProperty(
         name="Text",
         description="Text for the sign",
-        default="SIGN"
+        default="SIGN",
+        update=update_sign_text
     )
 
     text_size: FloatProperty(
@@ -479,6 +1427,232 @@ class SignsProperties(PropertyGroup):
         max=1.0
     )
 
+    line_spacing: FloatProperty(
+        name="Line Spacing",
+        description="Distance between lines, relative to the text size",
+        default=1.0,
+        min=0.5,
+        max=3.0
+    )
+
+    fit_to_box: BoolProperty(
+        name="Fit to Box",
+        description="Pick the text size and line breaks so the sign fills a box of the given width and height",
+        default=False
+    )
+
+    box_width: FloatProperty(
+        name="Width",
+        description="Width of the box the text is fitted into",
+        default=4.0,
+        min=0.0,
+        subtype='DISTANCE'
+    )
+
+    box_height: FloatProperty(
+        name="Height",
+        description="Height of the box the text is fitted into",
+        default=1.0,
+        min=0.0,
+        subtype='DISTANCE'
+    )
+
+    text_wrap: EnumProperty(
+        name="Wrap",
+        description="Where lines may be broken when fitting text into the box",
+        items=[
+            ('NONE', "None", "Only break lines where the text has line breaks"),
+            ('WORD', "Words", "Break lines between words"),
+            ('CHAR', "Characters", "Break lines between any characters, for scripts without spaces"),
+        ],
+        default='WORD'
+    )
+
+    max_lines: IntProperty(
+        name="Max Lines",
+        description="Most lines the text may be broken into (0 for no limit)",
+        default=0,
+        min=0,
+        max=20
+    )
+
+    text_bold: BoolProperty(
+        name="Bold",
+        description="Use the family's bold variant, downloaded when a sign first needs it",
+        default=False
+    )
+
+    text_italic: BoolProperty(
+        name="Italic",
+        description="Use the family's italic variant, downloaded when a sign first needs it",
+        default=False
+    )
+
+    bold_weight: EnumProperty(
+        name="Bold Weight",
+        description="Weight used for bold text; the nearest weight the family has is picked",
+        items=[
+            ('500', "Medium", "Weight 500"),
+            ('600', "Semi Bold", "Weight 600"),
+            ('700', "Bold", "Weight 700"),
+            ('800', "Extra Bold", "Weight 800"),
+            ('900', "Black", "Weight 900"),
+        ],
+        default='700'
+    )
+
+    subset_fonts: BoolProperty(
+        name="Subset Fonts",
+        description="Load a copy of the font with only the characters of the sign (or of the whole batch). "
+                    "Keeps packed .blend files small; characters typed in later may be missing",
+        default=False
+    )
+
+    node_signs: BoolProperty(
+        name="Geometry Nodes",
+        description="Draw signs with one shared Geometry Nodes group and one material; "
+                    "text, size and depth stay editable in the modifier, color in the object's custom properties. "
+                    "Bevel isn't supported",
+        default=False
+    )
+
+    glyph_signs: BoolProperty(
+        name="Glyph Instances",
+        description="Build signs from one cached mesh per character, font, depth and bevel, "
+                    "instanced by a shared Geometry Nodes group and placed from the font's advance widths "
+                    "and kerning. Signs are one object each and can't be edited as text",
+        default=False
+    )
+
+    instance_mode: BoolProperty(
+        name="Instance Mode",
+        description="Share one mesh between signs with identical text, font, size, depth and bevel. "
+                    "Instances are meshes and can't be edited as text",
+        default=False
+    )
+
+    # LOD Properties
+    lod_medium_ratio: FloatProperty(
+        name="Medium Ratio",
+        description="Decimation ratio of the medium LOD",
+        default=0.5,
+        min=0.01,
+        max=1.0
+    )
+
+    lod_low_ratio: FloatProperty(
+        name="Low Ratio",
+        description="Decimation ratio of the low LOD",
+        default=0.15,
+        min=0.01,
+        max=1.0
+    )
+
+    lod_medium_distance: FloatProperty(
+        name="Medium Distance",
+        description="Camera distance from which the medium LOD is rendered",
+        default=20.0,
+        min=0.0,
+        subtype='DISTANCE'
+    )
+
+    lod_low_distance: FloatProperty(
+        name="Low Distance",
+        description="Camera distance from which the low LOD is rendered",
+        default=60.0,
+        min=0.0,
+        subtype='DISTANCE'
+    )
+
+    lod_viewport_level: EnumProperty(
+        name="Viewport LOD",
+        description="Detail level of baked signs in the viewport",
+        items=[
+            ('0', "Full", "Always show full detail"),
+            ('1', "Medium", "Always show the medium LOD"),
+            ('2', "Low", "Always show the low LOD"),
+            ('CAMERA', "By Camera", "Pick the LOD from the distance to the scene camera"),
+        ],
+        default='1',
+        update=update_lod_viewport_level
+    )
+
+    batch_workers: IntProperty(
+        name="Workers",
+        description="Background Blender processes that Batch Create Signs splits the rows between "
+                    "(1 builds them in this file)",
+        default=1,
+        min=1,
+        max=64
+    )
+
+    batch_link: BoolProperty(
+        name="Link Shards",
+        description="Keep each worker's signs in a .blend next to this file and link them, "
+                    "instead of appending them into this file",
+        default=False
+    )
+
+    # Population Properties
+    populate_source: EnumProperty(
+        name="Anchors",
+        description="Where Populate Signs places signs",
+        items=[
+            ('VERTICES', "Mesh Vertices", "One sign per vertex of a mesh, facing along the vertex normal"),
+            ('COLLECTION', "Collection Objects", "One sign per object of a collection, facing along its local Z axis"),
+        ],
+        default='VERTICES'
+    )
+
+    populate_object: PointerProperty(
+        name="Mesh",
+        description="Mesh whose vertices are the sign anchors",
+        type=bpy.types.Object,
+        poll=lambda self, obj: obj.type == 'MESH'
+    )
+
+    populate_collection: PointerProperty(
+        name="Collection",
+        description="Collection whose objects are the sign anchors",
+        type=bpy.types.Collection
+    )
+
+    populate_selected_only: BoolProperty(
+        name="Selected Vertices Only",
+        description="Only place signs on the mesh's selected vertices",
+        default=False
+    )
+
+    populate_count: IntProperty(
+        name="Count",
+        description="Number of anchors picked at random (0 for every anchor)",
+        default=0,
+        min=0
+    )
+
+    populate_seed: IntProperty(
+        name="Seed",
+        description="Seed of the store names, anchor picks and scale variation",
+        default=0,
+        min=0
+    )
+
+    populate_offset: FloatProperty(
+        name="Offset",
+        description="Distance of the signs from their anchors along the normal",
+        default=0.05,
+        subtype='DISTANCE'
+    )
+
+    populate_scale_jitter: FloatProperty(
+        name="Scale Variation",
+        description="Random scale change of each sign, as a fraction either way",
+        default=0.0,
+        min=0.0,
+        max=0.9,
+        subtype='FACTOR'
+    )
+
     # Material Properties
     text_color: FloatVectorProperty(
         name="Text Color",
@@ -511,13 +1685,24 @@ class SIGNS_UL_FontList(UIList):
     """UI List for displaying fonts"""
 
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname):
+        # Thumbnails exist only for downloaded fonts
+        sha256 = local_fonts.entry_hash(item.family, 'regular', item.version)
+        icon_value = font_thumbnails.icon_id(sha256, local_fonts.blob_path(sha256)) if sha256 else 0
+
         if self.layout_type in {'DEFAULT', 'COMPACT'}:
             row = layout.row()
-            row.label(text=item.family, icon='FONT_DATA')
+            if icon_value:
+                row.label(text=item.family, icon_value=icon_value)
+            else:
+                row.label(text=item.family, icon='FONT_DATA')
             row.label(text=item.category, icon='SMALL_CAPS')
         elif self.layout_type == 'GRID':
             layout.alignment = 'CENTER'
-            layout.label(text=item.family, icon='FONT_DATA')
+            if icon_value:
+                layout.template_icon(icon_value=icon_value, scale=3.0)
+                layout.label(text=item.family)
+            else:
+                layout.label(text=item.family, icon='FONT_DATA')
 
 
 # ============================================================================
@@ -545,10 +1730,19 @@ class SIGNS_PT_MainPanel(Panel):
         box = layout.box()
         box.label(text="Font Library", icon='FONT_DATA')
         box.prop(props, "font_search_query", icon='VIEWZOOM')
-        box.prop(props, "font_category_filter", text="")
-        box.operator("signs.search_fonts", icon='FILE_REFRESH')
+        row = box.row(align=True)
+        row.prop(props, "font_category_filter", text="")
+        row.prop(props, "font_subset_filter", text="")
+        row = box.row(align=True)
+        row.prop(props, "font_min_variants")
+        row.prop(props, "font_max_rank")
+        box.prop(props, "font_cover_sign_text")
+        row = box.row(align=True)
+        row.operator("signs.search_fonts", icon='VIEWZOOM')
+        row.operator("signs.search_fonts", text="", icon='FILE_REFRESH').force_refresh = True
 
         # Font List
+        box.prop(props, "font_list_grid")
         box.template_list(
             "SIGNS_UL_FontList",
             "",
@@ -556,9 +1750,29 @@ class SIGNS_PT_MainPanel(Panel):
             "font_list",
             props,
             "font_list_index",
-            rows=5
+            rows=5,
+            type='GRID' if props.font_list_grid else 'DEFAULT',
+            columns=4
         )
 
+        # Search result paging
+        ids = search_results.get(context.scene.name)
+        if ids is not None:
+            page = search_pages.get(context.scene.name, 0)
+            pages = page_count(context.scene)
+            categories = search_facets.get(context.scene.name, {})
+            summary = ", ".join(f"{name} {count}" for name, count in sorted(categories.items(), key=lambda c: -c[1]))
+            box.label(text=f"{len(ids)} fonts" + (f" ({summary})" if summary else ""))
+            if pages > 1:
+                row = box.row(align=True)
+                sub = row.row(align=True)
+                sub.enabled = page > 0
+                sub.operator("signs.result_page", text="", icon='TRIA_LEFT').step = -1
+                row.label(text=f"Page {page + 1} of {pages}")
+                sub = row.row(align=True)
+                sub.enabled = page < pages - 1
+                sub.operator("signs.result_page", text="", icon='TRIA_RIGHT').step = 1
+
         # Auto-preview settings
         box.prop(props, "auto_preview", toggle=True)
         if props.auto_preview:
@@ -568,6 +1782,16 @@ class SIGNS_PT_MainPanel(Panel):
         row.operator("signs.preview_font", icon='HIDE_OFF', text="Manual Preview")
         row.operator("signs.download_font", icon='IMPORT')
 
+        row = box.row(align=True)
+        row.operator("signs.download_all_listed", icon='IMPORT')
+        row.prop(props, "download_workers")
+
+        # Per-font download progress
+        for job in download_manager.active_jobs():
+            row = box.row()
+            row.label(text=job.label, icon='SORT_ASC')
+            row.label(text=f"{int(job.progress * 100)}%" if job.bytes_total else "...")
+
         # Current Font Display
         if props.selected_font_path:
             box.label(text=f"Current: {os.path.basename(props.selected_font_path)}", icon='CHECKMARK')
@@ -589,9 +1813,25 @@ class SIGNS_PT_TextPanel(Panel):
         row = box.row(align=True)
         row.prop(props, "sign_text")
         row.operator("signs.random_name", text="", icon='FILE_REFRESH')
-        box.prop(props, "text_size")
+        row = box.row()
+        row.enabled = not props.fit_to_box
+        row.prop(props, "text_size")
         box.prop(props, "text_extrude")
         box.prop(props, "text_bevel")
+        box.prop(props, "line_spacing")
+
+        box.prop(props, "fit_to_box")
+        if props.fit_to_box:
+            col = box.column(align=True)
+            col.prop(props, "box_width")
+            col.prop(props, "box_height")
+            col.prop(props, "text_wrap")
+            col.prop(props, "max_lines")
+        row = box.row(align=True)
+        row.prop(props, "text_bold", toggle=True)
+        row.prop(props, "text_italic", toggle=True)
+        if props.text_bold:
+            row.prop(props, "bold_weight", text="")
 
 
 class SIGNS_PT_MaterialsPanel(Panel):
@@ -610,6 +1850,29 @@ class SIGNS_PT_MaterialsPanel(Panel):
         box.prop(props, "text_color")
         box.prop(props, "text_metallic")
         box.prop(props, "text_roughness")
+        layout.operator("signs.consolidate_materials", icon='MATERIAL')
+
+
+class SIGNS_PT_LODPanel(Panel):
+    """Panel for baking sign LODs"""
+    bl_label = "LOD Baking"
+    bl_idname = "SIGNS_PT_lod_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Signs'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.signs_props
+
+        box = layout.box()
+        box.prop(props, "lod_medium_ratio")
+        box.prop(props, "lod_low_ratio")
+        box.prop(props, "lod_medium_distance")
+        box.prop(props, "lod_low_distance")
+        box.prop(props, "lod_viewport_level")
+        layout.operator("signs.bake_lods", icon='MOD_DECIM')
 
 
 class SIGNS_PT_CreatePanel(Panel):
@@ -622,7 +1885,101 @@ class SIGNS_PT_CreatePanel(Panel):
 
     def draw(self, context):
         layout = self.layout
+        props = context.scene.signs_props
+        layout.prop(props, "node_signs")
+        row = layout.row()
+        row.enabled = not props.node_signs
+        row.prop(props, "glyph_signs")
+        row = layout.row()
+        row.enabled = not (props.node_signs or props.glyph_signs)
+        row.prop(props, "instance_mode")
+        layout.prop(props, "subset_fonts")
         layout.operator("signs.create_sign", icon='ADD', text="Create Sign")
+        layout.operator("signs.batch_create", icon='FILE_TEXT')
+        row = layout.row(align=True)
+        row.prop(props, "batch_workers")
+        row.prop(props, "batch_link", toggle=True)
+        if batch_job is not None:
+            signs, total, running, finished = batch_job.runner.progress()
+            row = layout.row()
+            row.label(text=f"{finished}/{len(batch_job.runner.shards)} shards, {signs}/{total} signs", icon='SORTTIME')
+            row.operator("signs.cancel_batch", text="", icon='X')
+        elif batch_job_status:
+            layout.label(text=batch_job_status, icon='INFO')
+        row = layout.row(align=True)
+        row.operator("signs.rebuild_signs", icon='FILE_REFRESH', text="Rebuild All").scope = 'ALL'
+        op = row.operator("signs.rebuild_signs", icon='RESTRICT_SELECT_OFF', text="Apply to Selected")
+        op.scope = 'SELECTED'
+        op.apply_panel = True
+        row = layout.row(align=True)
+        row.operator("signs.export_font_bundle", icon='EXPORT', text="Export Fonts")
+        row.operator("signs.import_font_bundle", icon='IMPORT', text="Import Fonts")
+
+
+class SIGNS_PT_PopulatePanel(Panel):
+    """Panel for scattering signs over anchor points"""
+    bl_label = "Populate"
+    bl_idname = "SIGNS_PT_populate_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Signs'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.signs_props
+
+        box = layout.box()
+        box.prop(props, "populate_source")
+        if props.populate_source == 'VERTICES':
+            box.prop(props, "populate_object")
+            box.prop(props, "populate_selected_only")
+        else:
+            box.prop(props, "populate_collection")
+        box.prop(props, "populate_count")
+        box.prop(props, "populate_seed")
+        box.prop(props, "populate_offset")
+        box.prop(props, "populate_scale_jitter")
+        layout.operator("signs.populate_signs", icon='PARTICLES')
+
+
+class SIGNS_PT_ProfilingPanel(Panel):
+    """Panel showing stage timings of searches, downloads, previews and sign creation"""
+    bl_label = "Timings"
+    bl_idname = "SIGNS_PT_profiling_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Signs'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        stats = profiling.profiler.stats()
+
+        if not stats:
+            layout.label(text="No timings recorded yet", icon='INFO')
+        else:
+            col = layout.column(align=True)
+            self.draw_row(col, "Stage", "n", "p50", "p95", "total")
+            for stage in stats:
+                self.draw_row(
+                    col, stage['name'], str(stage['count']),
+                    f"{stage['p50'] * 1000:.1f}", f"{stage['p95'] * 1000:.1f}", f"{stage['total'] * 1000:.0f}"
+                )
+            layout.label(text="Times in ms")
+
+        row = layout.row(align=True)
+        row.operator("signs.export_profile", icon='EXPORT', text="JSON").format = 'JSON'
+        row.operator("signs.export_profile", icon='EXPORT', text="Chrome Trace").format = 'CHROME'
+        row.operator("signs.reset_profile", icon='TRASH', text="")
+
+    @staticmethod
+    def draw_row(layout, name, *values):
+        split = layout.split(factor=0.4)
+        split.label(text=name)
+        row = split.row()
+        for value in values:
+            row.label(text=value)
 
 
 # ============================================================================
@@ -633,31 +1990,72 @@ classes = (
     FontListItem,
     SignsProperties,
     SIGNS_OT_SearchFonts,
+    SIGNS_OT_ResultPage,
     SIGNS_OT_DownloadFont,
+    SIGNS_OT_DownloadAllListed,
     SIGNS_OT_PreviewFont,
     SIGNS_OT_RandomName,
     SIGNS_OT_CreateSign,
+    SIGNS_OT_BatchCreate,
+    SIGNS_OT_CancelBatch,
+    SIGNS_OT_PopulateSigns,
+    SIGNS_OT_RebuildSigns,
+    SIGNS_OT_ExportFontBundle,
+    SIGNS_OT_ImportFontBundle,
+    SIGNS_OT_ConsolidateMaterials,
+    SIGNS_OT_BakeLODs,
+    SIGNS_OT_ResetProfile,
+    SIGNS_OT_ExportProfile,
     SIGNS_UL_FontList,
     SIGNS_PT_MainPanel,
     SIGNS_PT_TextPanel,
     SIGNS_PT_MaterialsPanel,
     SIGNS_PT_CreatePanel,
+    SIGNS_PT_PopulatePanel,
+    SIGNS_PT_LODPanel,
+    SIGNS_PT_ProfilingPanel,
 )
 
 
+@persistent
+def on_load_post(dummy):
+    """Forget cached datablock names when another file is loaded and remap bundled fonts"""
+    materials.material_cache.clear()
+    builder.instance_cache.clear()
+    geonodes.node_groups.clear()
+    glyphs.glyph_cache.clear()
+    preview.preview_fonts.clear()
+    search_results.clear()
+    search_facets.clear()
+    search_pages.clear()
+    bundle.remap_fonts(local_fonts)
+
+
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
 
     bpy.types.Scene.signs_props = bpy.props.PointerProperty(type=SignsProperties)
+    bpy.app.handlers.load_post.append(on_load_post)
+    lod.register_handlers()
+    font_thumbnails.register()
 
 
 def unregister():
+    lod.unregister_handlers()
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
+    if bpy.app.timers.is_registered(process_downloads):
+        bpy.app.timers.unregister(process_downloads)
+    cancel_batch_job()
+    preview.cancel_pending()
+    font_thumbnails.unregister()
+    download_manager.shutdown()
+    http_client.pool.close_all()
+    local_fonts.flush()
+    font_coverage.flush()
+
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
 
     del bpy.types.Scene.signs_props
-
-
-if __name__ == "__main__":
-    register()
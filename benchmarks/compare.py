@@ -0,0 +1,55 @@
+"""Compare two benchmark result files written by run.py
+
+    python benchmarks/compare.py before.json after.json --threshold 0.15
+
+Prints p50 and p95 of every benchmark and stage side by side and exits
+with status 1 if any p50 got slower by more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    rows = dict(report.get('benchmarks', {}))
+    rows.update({f"stage:{stage['name']}": stage for stage in report.get('stages', [])})
+    return report, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed p50 slowdown as a fraction")
+    args = parser.parse_args(argv)
+
+    before_report, before = load(args.before)
+    after_report, after = load(args.after)
+    print(f"before: QuickSigns {before_report.get('quicksigns_version')} on Blender {before_report.get('blender')}")
+    print(f"after:  QuickSigns {after_report.get('quicksigns_version')} on Blender {after_report.get('blender')}")
+    if before_report.get('params') != after_report.get('params'):
+        print("warning: the runs used different parameters")
+
+    regressions = []
+    print(f"{'name':<30} {'p50 before':>11} {'p50 after':>11} {'change':>8} {'p95 before':>11} {'p95 after':>11}")
+    for name in sorted(set(before) & set(after)):
+        old, new = before[name], after[name]
+        change = (new['p50'] - old['p50']) / old['p50'] if old['p50'] > 0 else 0.0
+        flag = ""
+        if change > args.threshold and not name.startswith("stage:"):
+            regressions.append(name)
+            flag = "  SLOWER"
+        print(f"{name:<30} {old['p50'] * 1000:9.2f}ms {new['p50'] * 1000:9.2f}ms {change:+7.1%} "
+              f"{old['p95'] * 1000:9.2f}ms {new['p95'] * 1000:9.2f}ms{flag}")
+
+    if regressions:
+        print(f"{len(regressions)} benchmarks slower than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
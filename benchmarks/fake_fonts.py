@@ -0,0 +1,280 @@
+"""Local stand-in for the Google Fonts API serving a synthetic catalog
+
+Families are numbered ``Bench Sans 00000`` and up, each with a regular,
+bold and italic variant. Font files are generated on request: valid
+TrueType fonts whose printable ASCII glyphs are simple polygons shaped by
+the family number, so every file has its own content hash. Every request
+can be delayed to stand in for network latency. The catalog carries an
+ETag and Last-Modified and is answered with 304 when a request's
+validators still match.
+
+Can also be run on its own::
+
+    python benchmarks/fake_fonts.py --fonts 2000 --latency 0.05 --port 8765
+"""
+
+import argparse
+import email.utils
+import gzip
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import subset  # noqa: E402  (the add-on's sfnt writer)
+
+
+CATEGORIES = ('sans-serif', 'serif', 'display', 'handwriting', 'monospace')
+SUBSETS = ('latin', 'latin-ext', 'cyrillic', 'greek', 'vietnamese')
+VARIANTS = ('regular', '700', 'italic')
+
+UNITS_PER_EM = 1000
+ASCENDER = 800
+DESCENDER = -200
+
+# Printable ASCII; glyph 0 is .notdef
+FIRST_CHAR = 0x20
+LAST_CHAR = 0x7E
+
+
+def family_name(index):
+    return f"Bench Sans {index:05d}"
+
+
+def catalog_items(count, base_url):
+    """Google Fonts API items for count synthetic families"""
+    items = []
+    for index in range(count):
+        subsets = ['latin'] + [name for offset, name in enumerate(SUBSETS[1:]) if (index >> offset) & 1]
+        items.append({
+            'family': family_name(index),
+            'category': CATEGORIES[index % len(CATEGORIES)],
+            'version': "v1",
+            'subsets': subsets,
+            'variants': list(VARIANTS),
+            'files': {variant: f"{base_url}/fonts/{index}-{variant}.ttf" for variant in VARIANTS},
+        })
+    return items
+
+
+def _glyph(code, seed, bold, italic):
+    """glyf entry and advance width of a character: a slanted, notched quad"""
+    if code == 0x20:
+        return b'', 250
+    width = 300 + (code * 7 + seed * 13) % 300 + (100 if bold else 0)
+    height = 500 + (code * 11 + seed) % 200
+    slant = height // 5 if italic else 0
+    notch = 20 + (code + seed) % 80
+    # Clockwise, as TrueType expects for outer contours
+    points = [(50, 0), (50 + slant, height), (50 + width // 2 + slant, height - notch), (50 + width + slant, height), (50 + width, 0)]
+
+    x_deltas, y_deltas = [], []
+    last_x = last_y = 0
+    for x, y in points:
+        x_deltas.append(x - last_x)
+        y_deltas.append(y - last_y)
+        last_x, last_y = x, y
+
+    count = len(points)
+    xs = [x for x, _y in points]
+    data = (
+        struct.pack(">hhhhh", 1, min(xs), 0, max(xs), height)
+        + struct.pack(">HH", count - 1, 0)
+        + bytes([0x01] * count)
+        + struct.pack(f">{count}h", *x_deltas)
+        + struct.pack(f">{count}h", *y_deltas)
+    )
+    return data + b'\0' * (-len(data) % 4), width + 100 + slant
+
+
+def _name_table(family, style):
+    records = [(1, family), (2, style), (4, f"{family} {style}"), (6, f"{family}-{style}".replace(" ", ""))]
+    strings = b''
+    entries = b''
+    for name_id, text in records:
+        encoded = text.encode('utf-16-be')
+        entries += struct.pack(">HHHHHH", 3, 1, 0x409, name_id, len(encoded), len(strings))
+        strings += encoded
+    return struct.pack(">HHH", 0, len(records), 6 + 12 * len(records)) + entries + strings
+
+
+@lru_cache(maxsize=256)
+def build_font(index, variant='regular'):
+    """Bytes of the synthetic font file of a family variant"""
+    bold = variant.startswith('700')
+    italic = variant.endswith('italic')
+    style = {(False, False): "Regular", (True, False): "Bold", (False, True): "Italic"}.get((bold, italic), "Bold Italic")
+
+    glyf = bytearray()
+    offsets = [0, 0]  # .notdef is empty
+    hmtx = struct.pack(">Hh", 500, 0)
+    mapping = {}
+    for glyph_id, code in enumerate(range(FIRST_CHAR, LAST_CHAR + 1), start=1):
+        data, advance = _glyph(code, index, bold, italic)
+        glyf += data
+        offsets.append(len(glyf))
+        hmtx += struct.pack(">Hh", advance, 50)
+        mapping[code] = glyph_id
+    num_glyphs = len(offsets) - 1
+
+    head = struct.pack(
+        ">IIIIHHqqhhhhHHhhh", 0x00010000, 0x00010000, 0, 0x5F0F3CF5, 0x000B, UNITS_PER_EM,
+        0, 0, 0, DESCENDER, 1400, ASCENDER, 0, 8, 2, 1, 0,
+    )
+    hhea = struct.pack(
+        ">IhhhHhhhhhhhhhhhH", 0x00010000, ASCENDER, DESCENDER, 0, 1500,
+        0, 0, 1400, 1, 0, 0, 0, 0, 0, 0, 0, num_glyphs,
+    )
+    maxp = struct.pack(">IHHHHHHHHHHHHHH", 0x00010000, num_glyphs, 5, 1, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0)
+    post = struct.pack(">IihhIIIII", 0x00030000, 0, -100, 50, 0, 0, 0, 0, 0)
+
+    tables = {
+        'head': head,
+        'hhea': hhea,
+        'maxp': maxp,
+        'hmtx': hmtx,
+        'cmap': subset.build_cmap(mapping),
+        'loca': struct.pack(f">{len(offsets)}I", *offsets),
+        'glyf': bytes(glyf),
+        'name': _name_table(family_name(index), style),
+        'post': post,
+    }
+    font = bytearray(subset.build_sfnt(0x00010000, tables))
+
+    num_tables = struct.unpack_from(">H", font, 4)[0]
+    for i in range(num_tables):
+        tag, _checksum, offset, _length = struct.unpack_from(">4sIII", font, 12 + i * 16)
+        if tag == b'head':
+            adjustment = (subset.CHECKSUM_MAGIC - subset.checksum(font)) & 0xFFFFFFFF
+            struct.pack_into(">I", font, offset + 8, adjustment)
+    return bytes(font)
+
+
+class FakeFontsServer:
+    """Threaded HTTP server for a synthetic catalog and its font files"""
+
+    def __init__(self, fonts=1000, latency=0.0, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.requests = 0
+        self.bytes_sent = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._catalog = json.dumps({'items': catalog_items(fonts, self.url)}).encode('utf-8')
+        self._catalog_gzip = gzip.compress(self._catalog)
+        self.etag = f'"{hashlib.sha256(self._catalog).hexdigest()[:16]}"'
+        self.last_modified = email.utils.formatdate(time.time(), usegmt=True)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self):
+        return f"{self.url}/webfonts"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve on the calling thread until interrupted"""
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+
+                path = self.path.split('?', 1)[0]
+                if path == "/webfonts":
+                    validators = {'ETag': server.etag, 'Last-Modified': server.last_modified}
+                    if self.not_modified():
+                        with server._lock:
+                            server.not_modified += 1
+                        self.send_body(b'', 'application/json', status=304, headers=validators)
+                    elif 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+                        self.send_body(server._catalog_gzip, 'application/json', encoding='gzip', headers=validators)
+                    else:
+                        self.send_body(server._catalog, 'application/json', headers=validators)
+                    return
+                if path.startswith("/fonts/") and path.endswith(".ttf"):
+                    index, _sep, variant = path[len("/fonts/"):-len(".ttf")].partition('-')
+                    if index.isdigit() and variant in VARIANTS:
+                        self.send_body(build_font(int(index), variant), 'font/ttf')
+                        return
+                self.send_body(b'not found', 'text/plain', status=404)
+
+            def not_modified(self):
+                """Check the request's validators against the catalog, If-None-Match first"""
+                etag = self.headers.get('If-None-Match')
+                if etag is not None:
+                    return etag == server.etag
+                return self.headers.get('If-Modified-Since') == server.last_modified
+
+            def send_body(self, body, content_type, status=200, encoding=None, headers=None):
+                # Count before responding, so a client that has its response sees the counters
+                with server._lock:
+                    server.requests += 1
+                    server.bytes_sent += len(body)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                if encoding:
+                    self.send_header('Content-Encoding', encoding)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a synthetic Google Fonts catalog")
+    parser.add_argument("--fonts", type=int, default=1000, help="Number of families in the catalog")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay before every response (seconds)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    server = FakeFontsServer(args.fonts, args.latency, port=args.port)
+    print(f"Serving {args.fonts} fonts, set QUICKSIGNS_API_URL={server.api_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Headless QuickSigns benchmarks against a local fake Google Fonts server
+
+Run with Blender in background mode; online access has to be allowed for
+the add-on's network checks::
+
+    blender -b --online-mode --python benchmarks/run.py -- --fonts 2000 --signs 500 --output results.json
+
+Fonts and the catalog cache go to a temporary directory, so the add-on's
+own store is never touched. Every benchmark reports count, total, mean,
+p50, p95 and max in seconds, and the add-on's stage timings are included,
+so results of two versions can be put side by side with compare.py.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import bpy
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_fonts import FakeFontsServer  # noqa: E402
+
+
+# Typed one character at a time, like the search field sees them
+QUERIES = ("bench", "sans 01", "00042", "b", "serif", "zzz")
+
+
+def load_addon(data_dir, api_url):
+    """Register the add-on from this checkout, pointed at the fake server and a scratch store"""
+    os.environ["QUICKSIGNS_DATA_DIR"] = data_dir
+    os.environ["QUICKSIGNS_API_URL"] = api_url
+    spec = importlib.util.spec_from_file_location("quicksigns_cli", os.path.join(ADDON_DIR, "cli.py"))
+    cli = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(cli)
+    addon = cli.load_addon()
+    addon.register()
+    return addon
+
+
+def bench_catalog(addon, scene, repeats):
+    """Cold catalog download and index build, 304 revalidations, then searches as typed"""
+    # The fake server accepts any key
+    scene.signs_props.google_fonts_api_key = "benchmark"
+    fetch = addon.profiling.StageStats('catalog_fetch')
+    start = time.perf_counter()
+    result = bpy.ops.signs.search_fonts(force_refresh=True)
+    fetch.add(time.perf_counter() - start)
+    if result != {'FINISHED'}:
+        raise RuntimeError("Catalog search failed, is online access allowed (--online-mode)?")
+
+    # The fake server answers the conditional request with 304
+    revalidate = addon.profiling.StageStats('catalog_revalidate')
+    for _repeat in range(repeats):
+        start = time.perf_counter()
+        bpy.ops.signs.search_fonts(force_refresh=True)
+        revalidate.add(time.perf_counter() - start)
+
+    keystroke = addon.profiling.StageStats('search_keystroke')
+    props = scene.signs_props
+    for _repeat in range(repeats):
+        for query in QUERIES:
+            for length in range(len(query) + 1):
+                start = time.perf_counter()
+                props.font_search_query = query[:length]
+                keystroke.add(time.perf_counter() - start)
+    props.font_search_query = ""
+    return [fetch, revalidate, keystroke]
+
+
+def bench_downloads(addon, scene, count):
+    """Download count fonts from the results through the add-on's queue"""
+    records = addon.result_records(scene)[:count]
+    per_font = addon.profiling.StageStats('download_font')
+    submitted = {}
+
+    start = time.perf_counter()
+    for record in records:
+        def on_done(path, family=record.family):
+            per_font.add(time.perf_counter() - submitted[family])
+
+        submitted[record.family] = time.perf_counter()
+        addon.queue_font_download(record.url, record.family, record.version, on_done)
+
+    # No timers run in background mode, so drain like process_downloads does
+    while addon.download_manager.is_busy():
+        addon.download_manager.drain()
+        time.sleep(0.005)
+    addon.download_manager.drain()
+    addon.local_fonts.flush()
+
+    batch = addon.profiling.StageStats('download_batch')
+    batch.add(time.perf_counter() - start)
+    return [per_font, batch]
+
+
+def bench_preview_churn(addon, scene, steps, downloaded):
+    """Move the font list selection with auto preview on, over the first downloaded fonts"""
+    props = scene.signs_props
+    props.auto_preview = True
+    churn = addon.profiling.StageStats('preview_step')
+    count = max(1, min(len(props.font_list), downloaded))
+    for step in range(steps):
+        start = time.perf_counter()
+        props.font_list_index = step % count
+        # The debounce timer never fires in background mode; run what it would
+        addon.refresh_auto_preview(scene.name)
+        churn.add(time.perf_counter() - start)
+    addon.preview.cancel_pending()
+    addon.preview.remove_preview()
+    props.auto_preview = False
+    return [churn]
+
+
+def bench_create_signs(addon, scene, count, font_path):
+    """Create count signs through SIGNS_OT_CreateSign"""
+    props = scene.signs_props
+    props.selected_font_path = font_path
+    create = addon.profiling.StageStats('create_sign')
+    for i in range(count):
+        props.sign_text = f"Bench Sign {i:05d}"
+        start = time.perf_counter()
+        bpy.ops.signs.create_sign()
+        create.add(time.perf_counter() - start)
+    return [create]
+
+
+def run(args):
+    with tempfile.TemporaryDirectory(prefix="quicksigns_bench_") as data_dir, \
+            FakeFontsServer(args.fonts, args.latency) as server:
+        addon = load_addon(data_dir, server.api_url)
+        scene = bpy.context.scene
+        addon.profiling.profiler.reset()
+
+        results = []
+        results += bench_catalog(addon, scene, args.search_repeats)
+        results += bench_downloads(addon, scene, args.downloads)
+        results += bench_preview_churn(addon, scene, args.preview_steps, args.downloads)
+
+        record = addon.result_records(scene)[0]
+        font_path = addon.find_font(record.family, record.version)
+        results += bench_create_signs(addon, scene, args.signs, font_path)
+
+        report = {
+            'quicksigns_version': list(addon.bl_info['version']),
+            'blender': bpy.app.version_string,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'params': {key: value for key, value in vars(args).items() if key != 'output'},
+            'server': {'requests': server.requests, 'bytes': server.bytes_sent, 'not_modified': server.not_modified},
+            'catalog': addon.catalog_cache.stats(),
+            'benchmarks': {stats.name: stats.as_dict() for stats in results},
+            'stages': addon.profiling.profiler.stats(),
+        }
+        addon.unregister()
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+
+    for name, stats in report['benchmarks'].items():
+        print(f"{name:<18} n={stats['count']:<6} p50={stats['p50'] * 1000:9.2f} ms  "
+              f"p95={stats['p95'] * 1000:9.2f} ms  total={stats['total']:8.2f} s")
+    print(f"Wrote {args.output}")
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="blender -b --online-mode --python benchmarks/run.py --")
+    parser.add_argument("--fonts", type=int, default=1000, help="Families in the fake catalog")
+    parser.add_argument("--latency", type=float, default=0.02, help="Delay before every server response (seconds)")
+    parser.add_argument("--downloads", type=int, default=50, help="Fonts to download")
+    parser.add_argument("--preview-steps", type=int, default=200, help="Selection changes with auto preview")
+    parser.add_argument("--signs", type=int, default=200, help="Signs to create")
+    parser.add_argument("--search-repeats", type=int, default=5, help="Passes over the typed queries")
+    parser.add_argument("--output", default="quicksigns_bench.json", help="JSON file for the results")
+    run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,608 @@
+"""Sign construction through bpy.data, shared by the operators and batch generation"""
+
+import csv
+import hashlib
+import json
+import math
+import os
+import time
+from collections import defaultdict
+
+import bpy
+
+from . import geonodes
+from . import glyphs
+from . import layout
+from . import registry
+from .profiling import profiler
+from .materials import MATERIAL_KEY_PROP, material_cache
+
+
+# Values used for any column missing from a spec row
+DEFAULT_SPEC = {
+    'text': "SIGN",
+    'font': "",
+    'size': 1.0,
+    'extrude': 0.1,
+    'bevel': 0.01,
+    'bold': False,
+    'italic': False,
+    'box_width': 0.0,
+    'box_height': 0.0,
+    'wrap': 'WORD',
+    'max_lines': 0,
+    'line_spacing': 1.0,
+    'color': (0.8, 0.1, 0.1),
+    'metallic': 0.0,
+    'roughness': 0.5,
+    'location': (0.0, 0.0, 0.0),
+    'rotation': (0.0, 0.0, 0.0),
+    'scale': (1.0, 1.0, 1.0),
+}
+
+FLOAT_FIELDS = {'size', 'extrude', 'bevel', 'metallic', 'roughness', 'box_width', 'box_height', 'line_spacing'}
+INT_FIELDS = {'max_lines'}
+VECTOR_FIELDS = {'color', 'location', 'rotation', 'scale'}
+BOOL_FIELDS = {'bold', 'italic'}
+
+# Text curve font slot used by each (bold, italic) style
+STYLE_SLOTS = {
+    (False, False): 'font',
+    (True, False): 'font_bold',
+    (False, True): 'font_italic',
+    (True, True): 'font_bold_italic',
+}
+
+
+# ============================================================================
+# Spec Loading
+# ============================================================================
+
+def parse_vector(value, length=3):
+    """Parse a list, '#rrggbb' colour or 'x y z' / 'x;y;z' string into a tuple"""
+    if isinstance(value, (list, tuple)):
+        values = [float(v) for v in value]
+    elif isinstance(value, str) and value.startswith('#'):
+        hex_value = value.lstrip('#')
+        values = [int(hex_value[i:i + 2], 16) / 255.0 for i in (0, 2, 4)]
+    else:
+        values = [float(v) for v in str(value).replace(';', ' ').replace(',', ' ').split()]
+
+    if len(values) == 1:
+        values = values * length
+    if len(values) != length:
+        raise ValueError(f"expected {length} values, got {value!r}")
+    return tuple(values)
+
+
+def parse_bool(value):
+    """Parse a bool or a yes/no, true/false, 1/0 string"""
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in ('1', 'true', 'yes', 'y', 'on'):
+            return True
+        if value in ('0', 'false', 'no', 'n', 'off'):
+            return False
+        raise ValueError(f"expected a yes/no value, got {value!r}")
+    return bool(value)
+
+
+def style_slot(spec):
+    """Font slot the spec's text is drawn with"""
+    return STYLE_SLOTS[(spec['bold'], spec['italic'])]
+
+
+def normalize_spec(row, defaults=None):
+    """Fill in defaults and convert a raw spec row to typed values"""
+    spec = dict(DEFAULT_SPEC)
+    if defaults:
+        spec.update(defaults)
+
+    for key, value in row.items():
+        if key is None or value is None or value == "":
+            continue
+        key = key.strip().lower()
+        if key in FLOAT_FIELDS:
+            spec[key] = float(value)
+        elif key in INT_FIELDS:
+            spec[key] = int(float(value))
+        elif key in VECTOR_FIELDS:
+            spec[key] = parse_vector(value)
+        elif key in BOOL_FIELDS:
+            spec[key] = parse_bool(value)
+        elif key in DEFAULT_SPEC:
+            spec[key] = str(value)
+
+    if not spec['text']:
+        raise ValueError("text is empty")
+    spec['wrap'] = spec['wrap'].upper()
+    if spec['wrap'] not in layout.WRAP_MODES:
+        raise ValueError(f"wrap must be one of {', '.join(layout.WRAP_MODES)}")
+    return spec
+
+
+def is_boxed(spec):
+    """Check if a spec's text is fitted into a box"""
+    return spec['box_width'] > 0 and spec['box_height'] > 0
+
+
+def fit_spec(spec, font_path=None):
+    """Spec with size and line breaks fitted to its box; specs without a box are returned as is
+
+    The bevel grows the text on every side, so it is taken off the box.
+    """
+    if not is_boxed(spec):
+        return spec
+    margin = 2 * spec['bevel']
+    fitted = layout.fit_text(
+        spec['text'], layout.load_metrics(font_path),
+        max(spec['box_width'] - margin, 0.0), max(spec['box_height'] - margin, 0.0),
+        wrap=spec['wrap'], max_lines=spec['max_lines'], line_spacing=spec['line_spacing'],
+    )
+    return dict(spec, text=fitted.text, size=fitted.size)
+
+
+def load_specs(path, defaults=None):
+    """Read sign specs from a CSV or JSON file"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+        if isinstance(rows, dict):
+            rows = rows.get('signs', [])
+    elif ext == '.csv':
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+    else:
+        raise ValueError(f"Unsupported spec file type: {ext}")
+
+    specs = []
+    for number, row in enumerate(rows, start=1):
+        try:
+            specs.append(normalize_spec(row, defaults))
+        except ValueError as e:
+            raise ValueError(f"{os.path.basename(path)} row {number}: {e}") from e
+    return specs
+
+
+# ============================================================================
+# Shared Instance Geometry
+# ============================================================================
+
+# Custom property holding a shared mesh's instance key
+INSTANCE_KEY_PROP = "quicksigns_instance_key"
+
+
+def instance_key(spec, font, style_font=None):
+    """Key for geometry that only depends on text, font and shape settings"""
+    font_path = bpy.path.abspath(font.filepath) if font is not None else ""
+    style_path = bpy.path.abspath(style_font.filepath) if style_font is not None else ""
+    values = [
+        spec['text'], font_path, style_slot(spec), style_path,
+        round(spec['size'], 6), round(spec['extrude'], 6), round(spec['bevel'], 6),
+        round(spec['line_spacing'], 6), is_boxed(spec),
+    ]
+    return hashlib.sha1(json.dumps(values).encode('utf-8')).hexdigest()
+
+
+class InstanceMeshCache:
+    """One evaluated text mesh per unique sign shape
+
+    Objects that share a mesh are evaluated once by the depsgraph, unlike
+    text curves, which are tessellated per object even when their curve
+    data is shared. Names are kept instead of datablocks, like the
+    material cache.
+    """
+
+    def __init__(self):
+        self._names = {}
+        self._scanned = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, spec, font, scene, style_font=None):
+        """Return the shared mesh for a spec, evaluating the text once if needed"""
+        key = instance_key(spec, font, style_font)
+
+        mesh = self._probe(key)
+        if mesh is None and not self._scanned:
+            self._scan()
+            mesh = self._probe(key)
+
+        if mesh is not None:
+            self.hits += 1
+            return mesh
+
+        self.misses += 1
+        mesh = self._bake(spec, font, scene, style_font)
+        mesh[INSTANCE_KEY_PROP] = key
+        self._names[key] = mesh.name
+        return mesh
+
+    def clear(self):
+        self._names.clear()
+        self._scanned = False
+
+    def _bake(self, spec, font, scene, style_font=None):
+        """Evaluate a temporary text object and keep its geometry as a mesh"""
+        template_spec = dict(spec, location=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0))
+        template = build_sign(template_spec, font, style_font)
+        curve = template.data
+        scene.collection.objects.link(template)
+        try:
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            depsgraph.update()
+            mesh = bpy.data.meshes.new_from_object(template.evaluated_get(depsgraph))
+        finally:
+            bpy.data.objects.remove(template, do_unlink=True)
+            bpy.data.curves.remove(curve)
+
+        mesh.name = f"SignMesh_{spec['text'][:10]}"
+
+        # Material is assigned per object so instances can differ in color
+        mesh.materials.clear()
+        mesh.materials.append(None)
+        return mesh
+
+    def _probe(self, key):
+        name = self._names.get(key)
+        if name is None:
+            return None
+        mesh = bpy.data.meshes.get(name)
+        if mesh is None or mesh.get(INSTANCE_KEY_PROP) != key:
+            del self._names[key]
+            return None
+        return mesh
+
+    def _scan(self):
+        for mesh in bpy.data.meshes:
+            key = mesh.get(INSTANCE_KEY_PROP)
+            if key and key not in self._names and not mesh.library:
+                self._names[key] = mesh.name
+        self._scanned = True
+
+
+instance_cache = InstanceMeshCache()
+
+
+# ============================================================================
+# Object Construction
+# ============================================================================
+
+def load_font(path, font_cache=None):
+    """Load a font datablock once per path"""
+    if not path or not os.path.exists(path):
+        return None
+    if font_cache is not None and path in font_cache:
+        return font_cache[path]
+
+    try:
+        font = bpy.data.fonts.load(path, check_existing=True)
+    except RuntimeError:
+        font = None
+
+    if font_cache is not None:
+        font_cache[path] = font
+    return font
+
+
+def set_style(curve, spec, font=None, style_font=None):
+    """Fill the curve's font slots and mark every character bold/italic per the spec
+
+    All slots start out as the regular font, so styled text never falls
+    back to Blender's built-in font while its variant is still missing.
+    """
+    if font is not None:
+        for slot in STYLE_SLOTS.values():
+            setattr(curve, slot, font)
+    if style_font is not None and style_slot(spec) != 'font':
+        setattr(curve, style_slot(spec), style_font)
+
+    for char in curve.body_format:
+        char.use_bold = spec['bold']
+        char.use_italic = spec['italic']
+
+
+def apply_curve(curve, spec, font=None, style_font=None):
+    """Set a text curve's text, shape, alignment and fonts from a fitted spec"""
+    curve.body = spec['text']
+    curve.size = spec['size']
+    curve.extrude = spec['extrude']
+    curve.bevel_depth = spec['bevel']
+    curve.space_line = spec['line_spacing']
+    if is_boxed(spec):
+        # Fitted text is centred on the box
+        curve.align_x = 'CENTER'
+        curve.align_y = 'CENTER'
+    else:
+        curve.align_x = 'LEFT'
+        curve.align_y = 'TOP_BASELINE'
+    set_style(curve, spec, font, style_font)
+
+
+def build_sign(spec, font=None, style_font=None):
+    """Create an unlinked sign object from a normalized spec
+
+    style_font is the bold/italic variant used when the spec asks for one.
+    """
+    text = spec['text']
+    curve = bpy.data.curves.new(name=f"Sign_{text[:10]}", type='FONT')
+    apply_curve(curve, spec, font, style_font)
+
+    curve.materials.append(material_cache.get(spec['color'], spec['metallic'], spec['roughness']))
+
+    obj = bpy.data.objects.new(f"Sign_{text[:10]}", curve)
+    set_transform(obj, spec)
+    return obj
+
+
+def build_instance(spec, font, scene, style_font=None):
+    """Create an unlinked sign object that shares geometry with identical signs"""
+    mesh = instance_cache.get(spec, font, scene, style_font)
+    obj = bpy.data.objects.new(f"Sign_{spec['text'][:10]}", mesh)
+
+    slot = obj.material_slots[0]
+    slot.link = 'OBJECT'
+    slot.material = material_cache.get(spec['color'], spec['metallic'], spec['roughness'])
+
+    set_transform(obj, spec)
+    return obj
+
+
+def build_node_sign(spec, font=None, style_font=None):
+    """Create an unlinked sign object drawn by the shared QuickSigns node group
+
+    String to Curves uses a single font, so a bold/italic variant replaces
+    the regular font for the whole text. Bevel isn't available here.
+    """
+    obj = geonodes.new_sign_object(spec, style_font or font, centered=is_boxed(spec))
+    set_transform(obj, spec)
+    return obj
+
+
+def ignored_bevels(specs, node_signs):
+    """Number of specs with a bevel that node signs are built without"""
+    return sum(1 for spec in specs if spec['bevel'] > 0) if node_signs else 0
+
+
+def build_glyph_sign(spec, font, scene, style_font=None):
+    """Create an unlinked sign object instancing cached glyph meshes
+
+    Like node signs, a bold/italic variant replaces the regular font.
+    """
+    obj = glyphs.new_glyph_sign(spec, style_font or font, scene, centered=is_boxed(spec))
+    set_transform(obj, spec)
+    return obj
+
+
+def update_sign(obj, kind, spec, changes, font=None, style_font=None, scene=None):
+    """Bring an existing sign up to date, touching only the changed inputs
+
+    spec is already fitted. Returns False for signs that can't be updated
+    in place, such as text signs baked to LOD meshes.
+    """
+    shape = bool(changes & {'font', 'geometry'})
+    material = None
+    if 'material' in changes or (shape and kind == 'INSTANCE'):
+        material = material_cache.get(spec['color'], spec['metallic'], spec['roughness'])
+
+    if kind == 'TEXT' and obj.type == 'FONT':
+        curve = obj.data
+        if shape:
+            apply_curve(curve, spec, font, style_font)
+        if material is not None:
+            if curve.materials:
+                curve.materials[0] = material
+            else:
+                curve.materials.append(material)
+
+    elif kind == 'INSTANCE' and obj.type == 'MESH' and INSTANCE_KEY_PROP in obj.data:
+        if shape:
+            obj.data = instance_cache.get(spec, font, scene or bpy.context.scene, style_font)
+        if material is not None:
+            slot = obj.material_slots[0]
+            slot.link = 'OBJECT'
+            slot.material = material
+
+    elif kind == 'NODES' and geonodes.MODIFIER_NAME in obj.modifiers:
+        geonodes.update_sign_object(obj, spec, style_font or font, centered=is_boxed(spec))
+
+    elif kind == 'GLYPHS' and glyphs.GLYPH_SIGN_PROP in obj and geonodes.MODIFIER_NAME in obj.modifiers:
+        if shape:
+            glyphs.place_glyphs(obj, spec, style_font or font, scene or bpy.context.scene, centered=is_boxed(spec))
+        geonodes.set_sign_colour(obj, spec)
+
+    else:
+        return False
+    return True
+
+
+def set_transform(obj, spec):
+    """Apply a spec's location, rotation (degrees) and scale"""
+    obj.location = spec['location']
+    obj.rotation_euler = [math.radians(angle) for angle in spec['rotation']]
+    obj.scale = spec['scale']
+
+
+def resolve_paths(specs, resolve_font=None, resolve_style=None, subset_font=None):
+    """Font files of each spec as ((font, style), (font, style) after subsetting)
+
+    See build_signs for the arguments. Each font is subset once to the
+    characters of every spec using it.
+    """
+    sources = []
+    for spec in specs:
+        font_path = spec['font']
+        if font_path and resolve_font is not None:
+            font_path = resolve_font(font_path)
+        style_path = None
+        if font_path and resolve_style is not None and style_slot(spec) != 'font':
+            style_path = resolve_style(font_path, spec)
+        sources.append((font_path, style_path))
+
+    if subset_font is None:
+        return [(paths, paths) for paths in sources]
+
+    chars = defaultdict(set)
+    for spec, paths in zip(specs, sources):
+        for path in paths:
+            if path:
+                chars[path].update(spec['text'])
+    subsets = {path: subset_font(path, "".join(sorted(text))) for path, text in chars.items()}
+    return [(paths, tuple(subsets.get(path, path) for path in paths)) for paths in sources]
+
+
+def build_signs(specs, collection, resolve_font=None, instance=False, scene=None, resolve_style=None,
+                subset_font=None, node_signs=False, glyph_signs=False):
+    """Build every spec and link the objects to collection in one pass
+
+    resolve_font maps a spec's ``font`` value (a path or family name) to a
+    font file path. resolve_style maps that path and the spec to the path
+    of its bold/italic variant, or None if it isn't available. subset_font
+    maps a font path and text to a smaller font file; each font is subset
+    once to the characters of every row using it. Rows with a box are
+    fitted into it from the font's metrics. With instance set,
+    signs with the same text, font and shape share one mesh evaluated in
+    scene. With node_signs set, signs are drawn by the shared Geometry
+    Nodes group instead, and with glyph_signs set they instance cached
+    per-character meshes. Each object records its spec and input hashes
+    for rebuild_signs. Returns the new objects and the elapsed time in
+    seconds.
+    """
+    start = time.perf_counter()
+    font_cache = {}
+    objects = []
+    kind = 'NODES' if node_signs else 'GLYPHS' if glyph_signs else 'INSTANCE' if instance else 'TEXT'
+
+    with profiler.stage('build.resolve'):
+        paths = resolve_paths(specs, resolve_font, resolve_style, subset_font)
+
+    for spec, (sources, (font_path, style_path)) in zip(specs, paths):
+        with profiler.stage('build.fit'):
+            fitted = fit_spec(spec, style_path or font_path)
+        with profiler.stage('build.load_font'):
+            font = load_font(font_path, font_cache)
+            style_font = load_font(style_path, font_cache)
+
+        with profiler.stage('build.object'):
+            if node_signs:
+                obj = build_node_sign(fitted, font, style_font)
+            elif glyph_signs:
+                obj = build_glyph_sign(fitted, font, scene or bpy.context.scene, style_font)
+            elif instance:
+                obj = build_instance(fitted, font, scene or bpy.context.scene, style_font)
+            else:
+                obj = build_sign(fitted, font, style_font)
+
+        registry.record_sign(obj, spec, kind, registry.input_hashes(spec, *sources), subset=subset_font is not None)
+        objects.append(obj)
+
+    for obj in objects:
+        collection.objects.link(obj)
+
+    return objects, time.perf_counter() - start
+
+
+def rebuild_signs(objects, resolve_font=None, resolve_style=None, subset_font=None, scene=None):
+    """Update signs whose spec or fonts changed since they were built, in place
+
+    objects are sign objects carrying a registry record; the resolvers are
+    those of build_signs. Only the changed inputs of each sign are touched
+    and objects keep their names, transforms and parenting. Returns the
+    counts of rebuilt, unchanged and skipped signs.
+    """
+    signs = []
+    skipped = 0
+    for obj in objects:
+        record = registry.read_record(obj)
+        try:
+            spec = normalize_spec(record['spec'])
+        except (TypeError, KeyError, ValueError):
+            skipped += 1
+            continue
+        signs.append((obj, record, spec))
+
+    font_cache = {}
+    rebuilt = unchanged = 0
+    specs = [spec for _obj, _record, spec in signs]
+    for (obj, record, spec), (sources, _paths) in zip(signs, resolve_paths(specs, resolve_font, resolve_style)):
+        hashes = registry.input_hashes(spec, *sources)
+        changes = registry.changed_inputs(record['hashes'], hashes)
+        if not changes:
+            unchanged += 1
+            continue
+
+        font_path, style_path = sources
+        if record.get('subset') and subset_font is not None:
+            font_path, style_path = (subset_font(path, spec['text']) if path else path for path in sources)
+        fitted = fit_spec(spec, style_path or font_path)
+        font = load_font(font_path, font_cache)
+        style_font = load_font(style_path, font_cache)
+
+        if update_sign(obj, record['kind'], fitted, changes, font, style_font, scene):
+            registry.update_record(obj, hashes=hashes)
+            rebuilt += 1
+        else:
+            skipped += 1
+    return rebuilt, unchanged, skipped
+
+
+def get_batch_collection(scene, name="QuickSigns Batch"):
+    """Collection that batch-generated signs are linked to"""
+    collection = bpy.data.collections.get(name)
+    if collection is None:
+        collection = bpy.data.collections.new(name)
+    if collection.name not in scene.collection.children:
+        scene.collection.children.link(collection)
+    return collection
+
+
+# Datablocks that are identical whenever these custom properties match.
+# Glyph collections are left alone: each shard's signs hold indices into
+# their own, and only the glyph meshes inside them are shared.
+SHARED_KEYS = (
+    ('materials', MATERIAL_KEY_PROP),
+    ('meshes', INSTANCE_KEY_PROP),
+    ('meshes', glyphs.GLYPH_KEY_PROP),
+    ('node_groups', geonodes.GROUP_KEY_PROP),
+    ('materials', geonodes.SHARED_PROP),
+    ('meshes', geonodes.SHARED_PROP),
+    ('node_groups', geonodes.SHARED_PROP),
+)
+
+
+def merge_shards(shards, parent, link=False):
+    """Append (or link) the sign collection of each shard's library .blend under parent
+
+    shards are (library path, collection name) pairs. Appended shards each
+    bring their own copies of fonts, materials and shared meshes; those
+    are remapped to one datablock per key. Returns the merged collections.
+    """
+    merged = []
+    for path, name in shards:
+        with bpy.data.libraries.load(path, link=link) as (data_from, data_to):
+            data_to.collections = [collection for collection in data_from.collections if collection == name]
+        for collection in data_to.collections:
+            if collection is not None:
+                parent.children.link(collection)
+                merged.append(collection)
+
+    if not link:
+        for collection_name, prop in SHARED_KEYS:
+            dedupe_datablocks(getattr(bpy.data, collection_name), lambda block: block.get(prop))
+        dedupe_datablocks(bpy.data.fonts, lambda font: os.path.normpath(bpy.path.abspath(font.filepath))
+                          if font.filepath != "<builtin>" else None)
+    return merged
+
+
+def dedupe_datablocks(datablocks, key):
+    """Remap local datablocks with the same key(block) to the first of them and remove the rest"""
+    kept = {}
+    for block in list(datablocks):
+        value = None if block.library else key(block)
+        if value is None:
+            continue
+        keep = kept.setdefault(value, block)
+        if keep is not block:
+            block.user_remap(keep)
+            datablocks.remove(block)
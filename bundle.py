@@ -0,0 +1,189 @@
+"""Offline font bundles for machines without network access
+
+A bundle is a zip file holding every font the signs of a .blend use,
+stored once per content hash as ``fonts/<sha256>.ttf``, and a
+``manifest.json`` listing each font's store entry and the file paths the
+.blend refers to it by. Importing a bundle fills the local font store and
+records those paths in ``remap.json`` next to the store index, so every
+file opened afterwards is pointed at the store in one pass.
+"""
+
+import json
+import os
+import re
+import zipfile
+
+import bpy
+
+from . import geonodes
+from .font_store import file_sha256
+
+
+MANIFEST_NAME = "manifest.json"
+REMAP_NAME = "remap.json"
+BUNDLE_VERSION = 1
+
+# Font file names in a bundle, checked before a manifest's hash becomes a path
+SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+# Text curve font slots
+FONT_SLOTS = ('font', 'font_bold', 'font_italic', 'font_bold_italic')
+
+
+class BundleError(Exception):
+    """Raised for bundles that can't be written or read"""
+
+
+def referenced_fonts():
+    """Font datablocks used by text curves and node signs, except the built-in and packed ones"""
+    used = []
+    for curve in bpy.data.curves:
+        if isinstance(curve, bpy.types.TextCurve):
+            used.extend(getattr(curve, slot) for slot in FONT_SLOTS)
+
+    # Node signs keep their font in String to Curves of their group
+    for group in bpy.data.node_groups:
+        if geonodes.GROUP_KEY_PROP in group:
+            used.extend(node.font for node in group.nodes if node.bl_idname == 'GeometryNodeStringToCurves')
+    for obj in bpy.data.objects:
+        modifier = obj.modifiers.get(geonodes.MODIFIER_NAME)
+        if modifier is not None and modifier.type == 'NODES':
+            used.extend(value for value in modifier.values() if isinstance(value, bpy.types.VectorFont))
+
+    fonts = {}
+    for font in used:
+        if font is not None and font.filepath != "<builtin>" and font.packed_file is None:
+            fonts[font.name] = font
+    return list(fonts.values())
+
+
+def export_bundle(bundle_path, store):
+    """Write every font the signs use to a bundle and return its manifest"""
+    entries = {}
+    sources = {}
+    missing = []
+    for font in referenced_fonts():
+        path = os.path.normpath(bpy.path.abspath(font.filepath))
+        if not os.path.isfile(path):
+            missing.append(font.name)
+            continue
+
+        sha256 = store.find_hash(path) or file_sha256(path)
+        entry = entries.get(sha256)
+        if entry is None:
+            # Fonts from outside the store (subsets, user fonts) are keyed by their hash
+            info = store.find_entry(path) or {'family': font.name, 'variant': 'regular', 'version': sha256}
+            entry = entries[sha256] = {
+                'sha256': sha256,
+                'size': os.path.getsize(path),
+                'family': info['family'],
+                'variant': info['variant'],
+                'version': info['version'],
+                'filepaths': [],
+            }
+            sources[sha256] = path
+        if font.filepath not in entry['filepaths']:
+            entry['filepaths'].append(font.filepath)
+
+    if missing:
+        raise BundleError(f"Font files not found: {', '.join(sorted(missing))}")
+
+    manifest = {'version': BUNDLE_VERSION, 'fonts': list(entries.values())}
+    tmp_path = f"{bundle_path}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        for sha256, path in sources.items():
+            archive.write(path, f"fonts/{sha256}.ttf")
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=1))
+    os.replace(tmp_path, bundle_path)
+    return manifest
+
+
+def import_bundle(bundle_path, store):
+    """Add a bundle's fonts to the store and remember its paths; returns (added, skipped)"""
+    try:
+        archive = zipfile.ZipFile(bundle_path)
+    except (OSError, zipfile.BadZipFile) as e:
+        raise BundleError(f"Can't read {os.path.basename(bundle_path)}: {e}") from e
+
+    with archive:
+        try:
+            manifest = json.loads(archive.read(MANIFEST_NAME).decode('utf-8'))
+        except (KeyError, ValueError) as e:
+            raise BundleError(f"{os.path.basename(bundle_path)} is not a QuickSigns font bundle") from e
+        if manifest.get('version') != BUNDLE_VERSION:
+            raise BundleError(f"Unsupported bundle version {manifest.get('version')}")
+
+        fonts = manifest.get('fonts', [])
+        for entry in fonts:
+            if not isinstance(entry.get('sha256'), str) or not SHA256_PATTERN.fullmatch(entry['sha256']):
+                raise BundleError(f"Invalid font hash {entry.get('sha256')!r} in {os.path.basename(bundle_path)}")
+        protect = {entry['sha256'] for entry in fonts}
+        remap = load_remap(store)
+        added = skipped = 0
+        os.makedirs(store.staging_dir, exist_ok=True)
+
+        for entry in fonts:
+            sha256 = entry['sha256']
+            for filepath in entry['filepaths']:
+                remap[filepath] = sha256
+
+            if store.entry_hash(entry['family'], entry['variant'], entry['version']) == sha256:
+                skipped += 1
+                continue
+
+            staging_path = os.path.join(store.staging_dir, f"{sha256}.ttf")
+            with archive.open(f"fonts/{sha256}.ttf") as src, open(staging_path, 'wb') as dst:
+                dst.write(src.read())
+            if file_sha256(staging_path) != sha256:
+                os.remove(staging_path)
+                raise BundleError(f"Font {entry['family']} in the bundle is corrupt")
+
+            store.add_file(staging_path, entry['family'], entry['variant'], entry['version'],
+                           sha256=sha256, protect=protect)
+            added += 1
+
+    save_remap(store, remap)
+    return added, skipped
+
+
+def load_remap(store):
+    """Mapping of font file paths used in .blend files to store hashes"""
+    try:
+        with open(os.path.join(store.root, REMAP_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_remap(store, remap):
+    os.makedirs(store.root, exist_ok=True)
+    path = os.path.join(store.root, REMAP_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(remap, f)
+    os.replace(tmp_path, path)
+
+
+def remap_fonts(store, remap=None):
+    """Point fonts and the panel's font path at store blobs in one pass; returns the count"""
+    if remap is None:
+        remap = load_remap(store)
+    if not remap:
+        return 0
+
+    remapped = 0
+    for font in bpy.data.fonts:
+        sha256 = remap.get(font.filepath)
+        if sha256 is not None and font.filepath != store.blob_path(sha256):
+            font.filepath = store.blob_path(sha256)
+            remapped += 1
+
+    for scene in bpy.data.scenes:
+        # Not registered when cli.py loads the add-on without enabling it
+        props = getattr(scene, 'signs_props', None)
+        if props is None:
+            continue
+        sha256 = remap.get(props.selected_font_path)
+        if sha256 is not None:
+            props.selected_font_path = store.blob_path(sha256)
+    return remapped
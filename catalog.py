@@ -0,0 +1,182 @@
+"""Persistent Google Fonts catalog cache with conditional revalidation"""
+
+import json
+import os
+import time
+import urllib.parse
+
+try:
+    from . import http_client
+    from .profiling import profiler
+except ImportError:
+    import http_client
+    from profiling import profiler
+
+
+# QUICKSIGNS_API_URL points the add-on at another server, e.g. the benchmark's fake one
+API_URL = os.environ.get("QUICKSIGNS_API_URL") or "https://www.googleapis.com/webfonts/v1/webfonts"
+
+# How long a downloaded catalog is trusted before it is revalidated (seconds)
+DEFAULT_TTL = 24 * 60 * 60
+
+
+def atomic_write(path, data):
+    """Write bytes to path via a temp file and rename, so readers never see a partial file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class CatalogCache:
+    """On-disk cache of the Google Fonts catalog
+
+    The catalog JSON is kept in ``catalog.json`` inside ``cache_dir`` with the
+    response validators (ETag / Last-Modified) in ``catalog_meta.json``. While
+    the cached copy is younger than ``ttl`` no request is made at all; after
+    that a conditional GET is sent and a 304 simply extends the lifetime.
+    Failed requests are retried like downloads.
+    """
+
+    def __init__(self, cache_dir, api_url=API_URL, ttl=DEFAULT_TTL,
+                 retries=http_client.RETRIES, backoff=http_client.BACKOFF):
+        self.cache_dir = cache_dir
+        self.api_url = api_url
+        self.ttl = ttl
+        self.retries = retries
+        self.backoff = backoff
+
+        # Counters for reporting
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+        self._fonts = None
+        self._meta = {}
+
+    @property
+    def catalog_path(self):
+        return os.path.join(self.cache_dir, "catalog.json")
+
+    @property
+    def meta_path(self):
+        return os.path.join(self.cache_dir, "catalog_meta.json")
+
+    def is_fresh(self):
+        """Check if the cached catalog can be used without touching the network"""
+        self._load()
+        if self._fonts is None:
+            return False
+        return time.time() - self._meta.get('fetched_at', 0) < self.ttl
+
+    def cached_fonts(self):
+        """Catalog items from memory or disk without any network access, or None"""
+        self._load()
+        return self._fonts
+
+    def get_fonts(self, api_key, force_refresh=False):
+        """Return the catalog items, downloading only when the cache is stale"""
+        if not force_refresh and self.is_fresh():
+            self.hits += 1
+            return self._fonts
+
+        self.misses += 1
+        # A forced refresh still revalidates against the copy on disk
+        self._load()
+        try:
+            return http_client.with_retries(lambda: self._fetch(api_key), self.retries, self.backoff)
+        except http_client.HTTPError:
+            # API errors (bad key etc.) must reach the user
+            raise
+        except http_client.NETWORK_ERRORS:
+            # Offline: a stale catalog is better than none
+            if self._fonts is not None:
+                return self._fonts
+            raise
+
+    def clear(self):
+        """Remove the cached catalog from memory and disk"""
+        self._fonts = None
+        self._meta = {}
+        for path in (self.catalog_path, self.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def stats(self):
+        """Return hit/miss counters"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'cached_fonts': len(self._fonts) if self._fonts is not None else 0,
+        }
+
+    def _load(self):
+        """Load the cached catalog from disk once per session"""
+        if self._fonts is not None:
+            return
+        try:
+            with profiler.stage('catalog.disk_read'):
+                with open(self.meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                    fonts = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._meta = meta
+        self._fonts = fonts
+
+    def _fetch(self, api_key):
+        """Download the catalog, sending validators from the cached copy"""
+        query = urllib.parse.urlencode({'key': api_key, 'sort': 'popularity'})
+        headers = {}
+        if self._fonts is not None:
+            if self._meta.get('etag'):
+                headers['If-None-Match'] = self._meta['etag']
+            if self._meta.get('last_modified'):
+                headers['If-Modified-Since'] = self._meta['last_modified']
+
+        # Streamed to disk in chunks, decompressing as it arrives
+        os.makedirs(self.cache_dir, exist_ok=True)
+        raw_path = os.path.join(self.cache_dir, f"catalog_response.{os.getpid()}.tmp")
+        try:
+            with profiler.stage('catalog.network') as span, \
+                    http_client.request(f"{self.api_url}?{query}", headers=headers, accept_gzip=True) as response:
+                with open(raw_path, 'wb') as f:
+                    for chunk in response.iter_chunks():
+                        f.write(chunk)
+                response_headers = response.headers
+                span.bytes = response.bytes_read
+        except http_client.HTTPError as e:
+            if e.status == 304 and self._fonts is not None:
+                self.revalidations += 1
+                self._meta['fetched_at'] = time.time()
+                self._save_meta()
+                return self._fonts
+            raise
+        except BaseException:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+            raise
+
+        try:
+            with profiler.stage('catalog.parse'), open(raw_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        finally:
+            os.remove(raw_path)
+        self._fonts = data.get('items', [])
+        self._meta = {
+            'fetched_at': time.time(),
+            'etag': response_headers.get('ETag', ''),
+            'last_modified': response_headers.get('Last-Modified', ''),
+        }
+
+        with profiler.stage('catalog.disk_write'):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            atomic_write(self.catalog_path, json.dumps(self._fonts).encode('utf-8'))
+            self._save_meta()
+        return self._fonts
+
+    def _save_meta(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        atomic_write(self.meta_path, json.dumps(self._meta).encode('utf-8'))
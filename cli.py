@@ -0,0 +1,173 @@
+"""Headless entry point for QuickSigns
+
+Run with Blender in background mode, passing arguments after ``--``::
+
+    blender -b [scene.blend] -P cli.py -- batch signs.csv --output signs.blend
+
+With ``--workers`` the rows are split between background Blender
+processes that each save a library .blend, merged into the output::
+
+    blender -b -P cli.py -- batch signs.csv --workers 16 --output city.blend
+"""
+
+import argparse
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+
+import bpy
+
+
+def load_addon():
+    """Import the add-on package that contains this file"""
+    addon_dir = os.path.dirname(os.path.abspath(__file__))
+    name = os.path.basename(addon_dir)
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(
+        name,
+        os.path.join(addon_dir, "__init__.py"),
+        submodule_search_locations=[addon_dir],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def save(output):
+    """Save the current file, to output if given"""
+    if output:
+        bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(output))
+    elif bpy.data.filepath:
+        bpy.ops.wm.save_mainfile()
+    else:
+        print("QuickSigns: nothing saved, pass --output or open a .blend file")
+
+
+def cmd_batch(args):
+    """Build signs from a CSV or JSON spec file"""
+    addon = load_addon()
+    specs = addon.builder.load_specs(args.specs)
+    workers = args.workers or os.cpu_count() or 1
+    if workers > 1:
+        batch_parallel(addon, specs, args, workers)
+        return
+
+    if args.library:
+        # Shard workers save only their signs, not the startup scene
+        bpy.ops.wm.read_homefile(use_empty=True)
+    collection = addon.builder.get_batch_collection(bpy.context.scene, args.collection)
+    # No timers run in background mode, so only variants already downloaded are used
+    objects, elapsed = addon.builder.build_signs(
+        specs, collection, resolve_font=addon.resolve_font, instance=args.instance,
+        resolve_style=lambda font_path, spec: addon.style_font_path(font_path, spec, args.bold_weight, fetch=False),
+        subset_font=addon.font_subsets.get if args.subset else None,
+        node_signs=args.geonodes, glyph_signs=args.glyphs
+    )
+    print(f"QuickSigns: created {len(objects)} signs in {elapsed:.2f}s ({len(objects) / max(elapsed, 1e-6):.0f} rows/s)")
+    ignored = addon.builder.ignored_bevels(specs, args.geonodes)
+    if ignored:
+        print(f"QuickSigns: warning: Geometry Nodes signs have no bevel, {ignored} signs were built flat")
+    save(args.output)
+
+
+def batch_parallel(addon, specs, args, workers):
+    """Build specs in shard worker processes and merge their libraries into the current file"""
+    if args.link:
+        target = args.output or bpy.data.filepath
+        if not target and not args.work_dir:
+            sys.exit("QuickSigns: --link needs --output, --work-dir or an open .blend file to keep the shards next to")
+        work_dir = args.work_dir or f"{os.path.splitext(os.path.abspath(target))[0]}_shards"
+    else:
+        work_dir = args.work_dir or tempfile.mkdtemp(prefix="quicksigns_batch_")
+
+    options = addon.shard_options(args.instance, args.geonodes, args.glyphs, args.subset, args.bold_weight)
+    runner = addon.new_batch_job(
+        specs, os.path.abspath(work_dir), workers, args.shards or workers, args.collection, options, args.retries
+    )
+
+    def report(runner):
+        signs, total, running, finished = runner.progress()
+        print(f"QuickSigns: {finished}/{len(runner.shards)} shards done, {running} running, "
+              f"{signs}/{total} signs, {runner.elapsed:.1f}s")
+
+    runner.run(on_progress=report)
+    for shard in runner.failed():
+        print(f"QuickSigns: shard {shard.index + 1} failed after {shard.attempts} attempts: {shard.error}")
+
+    collection = addon.builder.get_batch_collection(bpy.context.scene, args.collection)
+    shards = [(shard.output_path, shard.collection) for shard in runner.done()]
+    merged = addon.builder.merge_shards(shards, collection, link=args.link)
+    print(f"QuickSigns: merged {len(merged)} shards in {runner.elapsed:.2f}s")
+    save(args.output)
+
+    if not args.link and not args.work_dir:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    if runner.failed():
+        sys.exit(1)
+
+
+def cmd_bundle_export(args):
+    """Write every font used by signs in the open file to a bundle"""
+    addon = load_addon()
+    manifest = addon.bundle.export_bundle(os.path.abspath(args.bundle), addon.local_fonts)
+    print(f"QuickSigns: bundled {len(manifest['fonts'])} fonts to {args.bundle}")
+
+
+def cmd_bundle_import(args):
+    """Add a bundle's fonts to the local store and remap the open file"""
+    addon = load_addon()
+    added, skipped = addon.bundle.import_bundle(os.path.abspath(args.bundle), addon.local_fonts)
+    remapped = addon.bundle.remap_fonts(addon.local_fonts)
+    print(f"QuickSigns: imported {added} fonts ({skipped} already present), remapped {remapped}")
+    if args.output:
+        save(args.output)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="blender -b -P cli.py --", description="QuickSigns command line")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help=cmd_batch.__doc__)
+    batch.add_argument("specs", help="CSV or JSON file with one sign per row")
+    batch.add_argument("--output", help="Save the result to this .blend file")
+    batch.add_argument("--collection", default="QuickSigns Batch", help="Collection for the new signs")
+    batch.add_argument("--instance", action="store_true", help="Share geometry between identical signs")
+    batch.add_argument("--geonodes", action="store_true", help="Draw signs with the shared Geometry Nodes group")
+    batch.add_argument("--glyphs", action="store_true", help="Assemble signs from cached per-character meshes")
+    batch.add_argument("--subset", action="store_true", help="Load fonts cut down to the characters of the batch")
+    batch.add_argument("--bold-weight", type=int, default=700, help="Weight used for bold rows")
+    batch.add_argument("--workers", type=int, default=1,
+                       help="Background Blender processes to split the rows between (0 for one per CPU core)")
+    batch.add_argument("--shards", type=int, default=0, help="Number of shards (default: one per worker)")
+    batch.add_argument("--retries", type=int, default=1, help="Attempts after the first for a failed shard")
+    batch.add_argument("--link", action="store_true", help="Link the shard files instead of appending them")
+    batch.add_argument("--work-dir", help="Directory for shard specs, logs and .blend files (kept)")
+    batch.add_argument("--library", action="store_true", help="Start from an empty file (used by shard workers)")
+    batch.set_defaults(func=cmd_batch)
+
+    export = commands.add_parser("bundle-export", help=cmd_bundle_export.__doc__)
+    export.add_argument("bundle", help="Bundle file to write (.zip)")
+    export.set_defaults(func=cmd_bundle_export)
+
+    install = commands.add_parser("bundle-import", help=cmd_bundle_import.__doc__)
+    install.add_argument("bundle", help="Bundle file written by bundle-export")
+    install.add_argument("--output", help="Save the remapped file to this .blend file")
+    install.set_defaults(func=cmd_bundle_import)
+
+    return parser
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
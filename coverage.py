@@ -0,0 +1,192 @@
+"""Which fonts can render a given text, as codepoint bitsets
+
+Every font gets a Python int with bit n set when it has a glyph for
+codepoint n. Catalog fonts start from the Unicode ranges of the subsets
+the Google Fonts API lists for them; once a font is downloaded its real
+cmap replaces that estimate. Checking a text is then one AND per font:
+``mask & required == required``. Pure Python without Blender imports,
+like ``ttf``.
+"""
+
+import json
+import os
+import struct
+
+try:
+    from . import ttf
+except ImportError:
+    import ttf
+
+
+CACHE_NAME = "coverage.json"
+
+# Unicode ranges of the Google Fonts subsets, as in the unicode-range of
+# their CSS. The CJK subsets are split into many slices there; here each
+# is approximated by its blocks.
+SUBSET_RANGES = {
+    'latin': (
+        (0x0000, 0x00FF), (0x0131, 0x0131), (0x0152, 0x0153), (0x02BB, 0x02BC), (0x02C6, 0x02C6),
+        (0x02DA, 0x02DA), (0x02DC, 0x02DC), (0x2000, 0x206F), (0x2074, 0x2074), (0x20AC, 0x20AC),
+        (0x2122, 0x2122), (0x2191, 0x2191), (0x2193, 0x2193), (0x2212, 0x2212), (0x2215, 0x2215),
+    ),
+    'latin-ext': (
+        (0x0100, 0x02AF), (0x1E00, 0x1E9F), (0x1EF2, 0x1EFF), (0x2020, 0x2020), (0x20A0, 0x20AB),
+        (0x20AD, 0x20C0), (0x2113, 0x2113), (0x2C60, 0x2C7F), (0xA720, 0xA7FF),
+    ),
+    'vietnamese': (
+        (0x0102, 0x0103), (0x0110, 0x0111), (0x0128, 0x0129), (0x0168, 0x0169), (0x01A0, 0x01A1),
+        (0x01AF, 0x01B0), (0x0300, 0x0301), (0x0303, 0x0304), (0x0308, 0x0309), (0x0323, 0x0323),
+        (0x1EA0, 0x1EF9), (0x20AB, 0x20AB),
+    ),
+    'cyrillic': ((0x0301, 0x0301), (0x0400, 0x045F), (0x0490, 0x0491), (0x04B0, 0x04B1), (0x2116, 0x2116)),
+    'cyrillic-ext': ((0x0460, 0x052F), (0x1C80, 0x1C88), (0x20B4, 0x20B4), (0x2DE0, 0x2DFF), (0xA640, 0xA69F)),
+    'greek': ((0x0370, 0x0377), (0x037A, 0x037F), (0x0384, 0x038A), (0x038C, 0x038C), (0x038E, 0x03A1), (0x03A3, 0x03FF)),
+    'greek-ext': ((0x1F00, 0x1FFF),),
+    'armenian': ((0x0530, 0x058F), (0xFB13, 0xFB17)),
+    'hebrew': ((0x0590, 0x05FF), (0x200C, 0x2010), (0x20AA, 0x20AA), (0xFB1D, 0xFB4F)),
+    'arabic': ((0x0600, 0x06FF), (0x0750, 0x077F), (0x0870, 0x08FF), (0xFB50, 0xFDFF), (0xFE70, 0xFEFC)),
+    'devanagari': ((0x0900, 0x097F), (0x1CD0, 0x1CF9), (0x20A8, 0x20A8), (0x20B9, 0x20B9), (0xA830, 0xA839), (0xA8E0, 0xA8FF)),
+    'bengali': ((0x0980, 0x09FE),),
+    'tamil': ((0x0B80, 0x0BFF),),
+    'thai': ((0x0E01, 0x0E5B),),
+    'georgian': ((0x10A0, 0x10FF), (0x2D00, 0x2D2F)),
+    'khmer': ((0x1780, 0x17FF), (0x19E0, 0x19FF)),
+    'japanese': ((0x3000, 0x30FF), (0x4E00, 0x9FFF), (0xFF00, 0xFFEF)),
+    'korean': ((0x1100, 0x11FF), (0x3000, 0x303F), (0x3130, 0x318F), (0xAC00, 0xD7AF), (0xFF00, 0xFFEF)),
+    'chinese-simplified': ((0x3000, 0x303F), (0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xFF00, 0xFFEF)),
+    'chinese-traditional': ((0x3000, 0x303F), (0x3100, 0x312F), (0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xFF00, 0xFFEF)),
+    'chinese-hongkong': ((0x3000, 0x303F), (0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xFF00, 0xFFEF)),
+}
+
+
+def mask_from_ranges(ranges):
+    """Bitset of inclusive (start, end) codepoint ranges"""
+    mask = 0
+    for start, end in ranges:
+        mask |= ((1 << (end - start + 1)) - 1) << start
+    return mask
+
+
+def ranges_from_codepoints(codepoints):
+    """Sorted inclusive (start, end) runs of a collection of codepoints"""
+    ranges = []
+    for code in sorted(codepoints):
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return [tuple(run) for run in ranges]
+
+
+def text_mask(text):
+    """Bitset of the codepoints a text needs; whitespace is laid out, not drawn"""
+    return mask_from_ranges((code, code) for code in {ord(char) for char in text if not char.isspace()})
+
+
+def subsets_mask(subsets):
+    """Estimated bitset of a font from its catalog subsets; unknown subsets add nothing"""
+    return mask_from_ranges(r for subset in subsets for r in SUBSET_RANGES.get(subset, ()))
+
+
+def cmap_ranges(path):
+    """Codepoint ranges of a font file's cmap, or None if it can't be read"""
+    try:
+        with open(path, 'rb') as f:
+            font = ttf.TrueTypeFont(f.read())
+        return ranges_from_codepoints(code for code, glyph_id in font.cmap.items() if glyph_id)
+    except (OSError, ttf.FontError, struct.error):
+        return None
+
+
+class CoverageCache:
+    """cmap coverage of font files by content hash, kept in ``coverage.json``
+
+    Font files never change under a hash, so an entry is computed once
+    and stays valid; entries of evicted files are harmless.
+    """
+
+    def __init__(self, cache_dir):
+        self.path = os.path.join(cache_dir, CACHE_NAME)
+        self._ranges = None
+        self._masks = {}
+        self._dirty = False
+
+    def mask(self, sha256, font_path):
+        """Bitset of the font with this hash, reading font_path on first use; None if unreadable"""
+        mask = self._masks.get(sha256)
+        if mask is not None:
+            return mask
+
+        ranges = self._load().get(sha256)
+        if ranges is None:
+            ranges = cmap_ranges(font_path)
+            if ranges is None:
+                return None
+            self._ranges[sha256] = ranges
+            self._dirty = True
+
+        mask = self._masks[sha256] = mask_from_ranges(ranges)
+        return mask
+
+    def flush(self):
+        """Write new entries to disk"""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fonts': self._ranges}, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def _load(self):
+        if self._ranges is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._ranges = json.load(f)['fonts']
+            except (OSError, ValueError, KeyError):
+                self._ranges = {}
+        return self._ranges
+
+
+class CoverageIndex:
+    """Codepoint bitsets of the fonts of a SearchIndex, by font id
+
+    Fonts with the same subsets share one estimated bitset and are tested
+    together; downloaded fonts are tested on their own refined bitset. The
+    last answer is kept until the text or a refined bitset changes, since
+    the search reruns on every keystroke of the query.
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self._groups = {}
+        for font_id, record in enumerate(records):
+            self._groups.setdefault(record.subsets, []).append(font_id)
+        self._group_masks = {subsets: subsets_mask(subsets) for subsets in self._groups}
+        self._refined = {}
+        self._last = None
+
+    def refine(self, font_id, mask):
+        """Replace the subset estimate of a font with the coverage of its file"""
+        if self._refined.get(font_id) != mask:
+            self._refined[font_id] = mask
+            self._last = None
+
+    def covering(self, required):
+        """Frozenset of ids of the fonts that have every codepoint in the required bitset"""
+        if self._last is not None and self._last[0] == required:
+            return self._last[1]
+
+        ids = set()
+        for subsets, font_ids in self._groups.items():
+            if self._group_masks[subsets] & required == required:
+                ids.update(font_ids)
+        for font_id, mask in self._refined.items():
+            if mask & required == required:
+                ids.add(font_id)
+            else:
+                ids.discard(font_id)
+        ids = frozenset(ids)
+        self._last = (required, ids)
+        return ids
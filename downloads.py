@@ -0,0 +1,204 @@
+"""Background font download queue backed by a thread pool"""
+
+import hashlib
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from . import http_client
+    from .profiling import profiler
+except ImportError:
+    import http_client
+    from profiling import profiler
+
+
+class DownloadJob:
+    """State of a single queued download"""
+
+    def __init__(self, url, dest, label=""):
+        self.url = url
+        self.dest = dest
+        self.label = label or os.path.basename(dest)
+        self.state = 'QUEUED'
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self.error = None
+        self.sha256 = None
+        self.callbacks = []
+        self.cancelled = False
+        self.attempts = 0
+        self.started_at = 0.0
+        self.finished_at = 0.0
+
+    @property
+    def progress(self):
+        """Fraction downloaded, 0.0 when the size is unknown"""
+        if not self.bytes_total:
+            return 0.0
+        return min(self.bytes_done / self.bytes_total, 1.0)
+
+    @property
+    def finished(self):
+        return self.state in {'DONE', 'FAILED', 'CANCELLED'}
+
+
+class DownloadManager:
+    """Run downloads on worker threads and hand results back to the main thread
+
+    Workers never touch Blender data. Finished jobs are queued and their
+    callbacks are run by ``drain``, which the add-on calls from a
+    ``bpy.app.timers`` callback on the main thread.
+    """
+
+    def __init__(self, max_workers=4, retries=http_client.RETRIES, backoff=http_client.BACKOFF):
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self._executor = None
+        self._executor_workers = 0
+        self._jobs = {}
+        self._finished = queue.Queue()
+        self._lock = threading.Lock()
+
+    def submit(self, url, dest, label="", on_done=None):
+        """Queue a download of url to dest, reusing an in-flight job for the same file
+
+        Every caller's on_done is run with the job once it finished; see
+        release for dropping one of them.
+        """
+        with self._lock:
+            job = self._jobs.get(dest)
+            if job is not None and job.cancelled and not job.finished:
+                # Wanted again before its worker gave up on it
+                job.cancelled = False
+            if job is None:
+                if self._executor is not None and not self._jobs and self._executor_workers != self.max_workers:
+                    # Resized while busy; idle now, so start over at the new size
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+                job = DownloadJob(url, dest, label)
+                self._jobs[dest] = job
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="quicksigns-download",
+                    )
+                    self._executor_workers = self.max_workers
+                self._executor.submit(self._run, job)
+            if on_done is not None:
+                job.callbacks.append(on_done)
+        return job
+
+    def set_max_workers(self, max_workers):
+        """Change the number of worker threads, from the next download submitted while idle"""
+        with self._lock:
+            self.max_workers = max_workers
+
+    def release(self, job, callback):
+        """Drop one caller's callback, cancelling the job once no one else waits for it
+
+        submit shares a job between callers asking for the same file, so
+        the job keeps running while other callbacks remain. The remaining
+        callbacks still run with state CANCELLED if it is stopped.
+        """
+        with self._lock:
+            if callback in job.callbacks:
+                job.callbacks.remove(callback)
+            if not job.callbacks and not job.finished:
+                job.cancelled = True
+
+    def active_jobs(self):
+        """Jobs that are queued or running"""
+        with self._lock:
+            return [job for job in self._jobs.values() if not job.finished]
+
+    def is_busy(self):
+        with self._lock:
+            return bool(self._jobs)
+
+    def drain(self):
+        """Run callbacks of finished jobs; must be called from the main thread"""
+        while True:
+            try:
+                job = self._finished.get_nowait()
+            except queue.Empty:
+                break
+
+            with self._lock:
+                self._jobs.pop(job.dest, None)
+
+            for callback in job.callbacks:
+                try:
+                    callback(job)
+                except Exception as e:
+                    print(f"QuickSigns: download callback failed for {job.label}: {e}")
+
+    def shutdown(self):
+        """Cancel queued downloads and stop the worker threads"""
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancelled = True
+            self._jobs.clear()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job):
+        """Worker: download with the shared retry policy"""
+        if job.cancelled:
+            job.state = 'CANCELLED'
+            self._finished.put(job)
+            return
+
+        job.state = 'RUNNING'
+        job.started_at = time.perf_counter()
+
+        def on_retry(error):
+            job.attempts += 1
+
+        try:
+            http_client.with_retries(
+                lambda: self._fetch(job), self.retries, self.backoff,
+                cancelled=lambda: job.cancelled, on_retry=on_retry,
+            )
+        except Exception as e:
+            job.error = str(e)
+            job.state = 'FAILED'
+
+        job.finished_at = time.perf_counter()
+        if job.state == 'DONE':
+            profiler.record('download.network', job.finished_at - job.started_at, job.bytes_done, job.started_at)
+        self._finished.put(job)
+
+    def _fetch(self, job):
+        """Stream the response to a temp file and rename it into place"""
+        tmp_path = f"{job.dest}.part"
+        os.makedirs(os.path.dirname(job.dest), exist_ok=True)
+        job.bytes_done = 0
+        digest = hashlib.sha256()
+        try:
+            # A response closed before its end drops its connection instead of pooling it
+            with http_client.request(job.url) as response:
+                job.bytes_total = response.length
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_chunks():
+                        if job.cancelled:
+                            break
+                        f.write(chunk)
+                        digest.update(chunk)
+                        job.bytes_done += len(chunk)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if job.cancelled:
+            os.remove(tmp_path)
+            job.state = 'CANCELLED'
+        else:
+            os.replace(tmp_path, job.dest)
+            job.sha256 = digest.hexdigest()
+            job.state = 'DONE'
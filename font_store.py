@@ -0,0 +1,246 @@
+"""Content-addressed font store with an integrity index and LRU size cap"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+INDEX_NAME = "index.json"
+
+# Default cap on the total size of stored font files
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def file_sha256(path):
+    """Hex SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def entry_key(family, variant='regular', version=''):
+    """Index key for a font file"""
+    return f"{family}|{variant}|{version}"
+
+
+class FontStore:
+    """Font files stored once per content hash
+
+    Blobs live in ``root`` as ``<sha256>.ttf``. ``index.json`` maps
+    (family, variant, version) to the blob hash, its size and when it was
+    last used, so lookups are a dict probe rather than a filesystem stat.
+    Each blob is hashed again the first time it is used in a session, and
+    the least recently used entries are evicted once ``max_bytes`` is
+    exceeded.
+    """
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries = None
+        self._verified = set()
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.root, INDEX_NAME)
+
+    @property
+    def staging_dir(self):
+        """Directory for downloads that have not been added yet"""
+        return os.path.join(self.root, "staging")
+
+    def blob_path(self, sha256):
+        return os.path.join(self.root, f"{sha256}.ttf")
+
+    def staging_path(self, family, variant='regular', version=''):
+        """Temporary download location for a font file"""
+        name = f"{family}_{variant}_{version}".replace(' ', '_').replace(os.sep, '_')
+        return os.path.join(self.staging_dir, f"{name}.ttf")
+
+    def lookup(self, family, variant='regular', version=''):
+        """Return the path of a stored font, or None if it is missing or corrupt"""
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(entry_key(family, variant, version))
+            if entry is None:
+                return None
+
+            sha256 = entry['hash']
+            if sha256 not in self._verified and not self._verify(sha256):
+                return None
+
+            entry['last_used'] = time.time()
+            self._dirty = True
+            return self.blob_path(sha256)
+
+    def find_family(self, family, variant='regular'):
+        """Path of the most recently used stored version of a family, or None"""
+        with self._lock:
+            matches = [
+                entry for entry in self._load().values()
+                if entry['family'].lower() == family.lower() and entry['variant'] == variant
+            ]
+            for entry in sorted(matches, key=lambda e: e['last_used'], reverse=True):
+                path = self.lookup(entry['family'], variant, entry['version'])
+                if path:
+                    return path
+            return None
+
+    def entry_hash(self, family, variant='regular', version=''):
+        """Content hash of a stored font from the index alone, or None"""
+        with self._lock:
+            entry = self._load().get(entry_key(family, variant, version))
+            return entry['hash'] if entry else None
+
+    def contains(self, family, variant='regular', version=''):
+        """Check the index only, without verifying or touching the entry"""
+        with self._lock:
+            return entry_key(family, variant, version) in self._load()
+
+    def add_file(self, path, family, variant='regular', version='', sha256=None, protect=()):
+        """Move a downloaded file into the store and return its blob path"""
+        with self._lock:
+            entries = self._load()
+            if sha256 is None:
+                sha256 = file_sha256(path)
+
+            blob = self.blob_path(sha256)
+            if os.path.exists(blob):
+                # Same bytes under another name, keep one copy
+                os.remove(path)
+            else:
+                os.replace(path, blob)
+            self._verified.add(sha256)
+
+            entries[entry_key(family, variant, version)] = {
+                'hash': sha256,
+                'size': os.path.getsize(blob),
+                'last_used': time.time(),
+                'family': family,
+                'variant': variant,
+                'version': version,
+            }
+            self._dirty = True
+
+            self.evict(protect=set(protect) | {sha256})
+            self.flush()
+            return blob
+
+    def find_hash(self, path):
+        """Content hash of a blob path inside the store, or None"""
+        name = os.path.basename(path)
+        if os.path.dirname(os.path.abspath(path)) != os.path.abspath(self.root):
+            return None
+        sha256, ext = os.path.splitext(name)
+        return sha256 if ext == '.ttf' and len(sha256) == 64 else None
+
+    def find_entry(self, path):
+        """Index entry of a blob path, preferring its regular variant, or None"""
+        sha256 = self.find_hash(path)
+        if sha256 is None:
+            return None
+        with self._lock:
+            matches = [entry for entry in self._load().values() if entry['hash'] == sha256]
+            matches.sort(key=lambda e: e['variant'] != 'regular')
+            return dict(matches[0]) if matches else None
+
+    def entries(self):
+        """Copy of all index entries"""
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._load().items()}
+
+    def total_bytes(self):
+        """Size of all blobs referenced by the index"""
+        with self._lock:
+            sizes = {entry['hash']: entry['size'] for entry in self._load().values()}
+            return sum(sizes.values())
+
+    def evict(self, protect=()):
+        """Drop least recently used entries until the store fits in max_bytes"""
+        with self._lock:
+            entries = self._load()
+            total = self.total_bytes()
+            if total <= self.max_bytes:
+                return []
+
+            # A blob is as recent as its most recently used entry
+            last_used = {}
+            for entry in entries.values():
+                last_used[entry['hash']] = max(last_used.get(entry['hash'], 0), entry['last_used'])
+
+            evicted = []
+            for sha256 in sorted(last_used, key=last_used.get):
+                if total <= self.max_bytes:
+                    break
+                if sha256 in protect:
+                    continue
+                total -= self._remove_blob(sha256)
+                evicted.append(sha256)
+            return evicted
+
+    def flush(self):
+        """Write the index to disk if it changed"""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': self._entries}, f)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+
+    def _load(self):
+        """Read the index once, dropping entries whose blob is gone or truncated"""
+        if self._entries is not None:
+            return self._entries
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('entries', {})
+        except (OSError, ValueError):
+            entries = {}
+
+        for key, entry in list(entries.items()):
+            blob = self.blob_path(entry['hash'])
+            if not os.path.exists(blob) or os.path.getsize(blob) != entry['size']:
+                del entries[key]
+                self._dirty = True
+
+        self._entries = entries
+        return entries
+
+    def _verify(self, sha256):
+        """Re-hash a blob; corrupt blobs are removed from the store"""
+        blob = self.blob_path(sha256)
+        try:
+            valid = file_sha256(blob) == sha256
+        except OSError:
+            valid = False
+
+        if valid:
+            self._verified.add(sha256)
+        else:
+            self._remove_blob(sha256)
+        return valid
+
+    def _remove_blob(self, sha256):
+        """Delete a blob and every index entry pointing at it, returning its size"""
+        size = 0
+        for key, entry in list(self._entries.items()):
+            if entry['hash'] == sha256:
+                size = entry['size']
+                del self._entries[key]
+        self._verified.discard(sha256)
+        self._dirty = True
+
+        blob = self.blob_path(sha256)
+        if os.path.exists(blob):
+            os.remove(blob)
+        return size
@@ -0,0 +1,324 @@
+"""Geometry Nodes sign backend with shared node groups and a single material
+
+Each sign is an object with a Nodes modifier on one shared empty mesh. The
+modifier runs a QuickSigns node group (String to Curves, Fill Curve,
+Extrude Mesh) with the text, size, depth and line spacing as inputs.
+Colour, metallic and roughness are custom properties on the object, read
+by Attribute nodes in one shared material, so any number of signs cost
+one material.
+
+String to Curves takes its font and alignment as node settings rather
+than inputs, so there is one node group per font and alignment. Like the
+other caches, datablock names are kept and checked against a custom
+property on every lookup.
+
+Glyph signs (see ``glyphs``) share one more group, which instances the
+objects of a glyph collection on the points of the sign's mesh.
+"""
+
+import bpy
+
+
+# Custom properties marking datablocks created here
+GROUP_KEY_PROP = "quicksigns_group_key"
+SHARED_PROP = "quicksigns_geonodes"
+
+# Object properties read by the shared material
+COLOR_ATTRIBUTE = "quicksigns_color"
+METALLIC_ATTRIBUTE = "quicksigns_metallic"
+ROUGHNESS_ATTRIBUTE = "quicksigns_roughness"
+
+# Point attribute of glyph signs: the index of each character's glyph object
+GLYPH_ATTRIBUTE = "quicksigns_glyph"
+
+MATERIAL_NAME = "QuickSigns Sign"
+BASE_MESH_NAME = "QuickSigns Base"
+GLYPH_GROUP_NAME = "QuickSigns Glyphs"
+MODIFIER_NAME = "QuickSigns"
+
+# Node group inputs besides the geometry: (name, socket type, default)
+INPUTS = (
+    ("Text", 'NodeSocketString', "SIGN"),
+    ("Size", 'NodeSocketFloat', 1.0),
+    ("Extrude", 'NodeSocketFloat', 0.1),
+    ("Line Spacing", 'NodeSocketFloat', 1.0),
+)
+
+# Inputs of the glyph group besides the geometry
+GLYPH_INPUTS = (
+    ("Glyphs", 'NodeSocketCollection', None),
+    ("Scale", 'NodeSocketVector', (1.0, 1.0, 1.0)),
+)
+
+
+def group_key(font, centered):
+    """Key of the node group for a font and alignment"""
+    font_path = bpy.path.abspath(font.filepath) if font is not None else ""
+    return f"{font_path}|{'center' if centered else 'left'}"
+
+
+def _tagged(collection, name, value):
+    """Datablock called name that carries SHARED_PROP == value, or None"""
+    block = collection.get(name)
+    if block is not None and block.get(SHARED_PROP) == value and not block.library:
+        return block
+    for block in collection:
+        if block.get(SHARED_PROP) == value and not block.library:
+            return block
+    return None
+
+
+def shared_material():
+    """The one material of all node signs, colour coming from object properties"""
+    mat = _tagged(bpy.data.materials, MATERIAL_NAME, 'material')
+    if mat is not None:
+        return mat
+
+    mat = bpy.data.materials.new(MATERIAL_NAME)
+    mat.use_nodes = True
+    mat[SHARED_PROP] = 'material'
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    bsdf = nodes.get('Principled BSDF')
+
+    for offset, (attribute, output, socket) in enumerate((
+        (COLOR_ATTRIBUTE, 'Color', 'Base Color'),
+        (METALLIC_ATTRIBUTE, 'Fac', 'Metallic'),
+        (ROUGHNESS_ATTRIBUTE, 'Fac', 'Roughness'),
+    )):
+        node = nodes.new('ShaderNodeAttribute')
+        node.attribute_type = 'OBJECT'
+        node.attribute_name = attribute
+        node.location = (bsdf.location.x - 300, bsdf.location.y - offset * 180)
+        links.new(node.outputs[output], bsdf.inputs[socket])
+    return mat
+
+
+def base_mesh():
+    """Empty mesh shared by every node sign object"""
+    mesh = _tagged(bpy.data.meshes, BASE_MESH_NAME, 'base')
+    if mesh is None:
+        mesh = bpy.data.meshes.new(BASE_MESH_NAME)
+        mesh[SHARED_PROP] = 'base'
+    return mesh
+
+
+def create_node_group(name, font, centered, material):
+    """Build the String to Curves -> Fill Curve -> Extrude Mesh group"""
+    tree = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    tree.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    for input_name, socket_type, default in INPUTS:
+        tree.interface.new_socket(input_name, in_out='INPUT', socket_type=socket_type).default_value = default
+    tree.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+    nodes = tree.nodes
+    links = tree.links
+
+    def add(node_type, x, y=0):
+        node = nodes.new(node_type)
+        node.location = (x, y)
+        return node
+
+    group_in = add('NodeGroupInput', -800)
+    group_out = add('NodeGroupOutput', 1200)
+
+    text = add('GeometryNodeStringToCurves', -600)
+    if font is not None:
+        text.font = font
+    if centered:
+        text.align_x = 'CENTER'
+        text.align_y = 'MIDDLE'
+    links.new(group_in.outputs["Text"], text.inputs["String"])
+    links.new(group_in.outputs["Size"], text.inputs["Size"])
+    links.new(group_in.outputs["Line Spacing"], text.inputs["Line Spacing"])
+
+    realize = add('GeometryNodeRealizeInstances', -400)
+    links.new(text.outputs["Curve Instances"], realize.inputs["Geometry"])
+
+    fill = add('GeometryNodeFillCurve', -200)
+    if "Mode" in fill.inputs:
+        fill.inputs["Mode"].default_value = 'N-gons'
+    else:
+        fill.mode = 'NGONS'
+    links.new(realize.outputs["Geometry"], fill.inputs["Curve"])
+
+    # Depth is centred on the text like the Extrude of text curves
+    back = add('ShaderNodeMath', -200, -250)
+    back.operation = 'MULTIPLY'
+    back.inputs[1].default_value = -1.0
+    links.new(group_in.outputs["Extrude"], back.inputs[0])
+    offset = add('ShaderNodeCombineXYZ', 0, -250)
+    links.new(back.outputs[0], offset.inputs["Z"])
+    move = add('GeometryNodeTransform', 200)
+    links.new(fill.outputs["Mesh"], move.inputs["Geometry"])
+    links.new(offset.outputs[0], move.inputs["Translation"])
+
+    depth = add('ShaderNodeMath', 200, -250)
+    depth.operation = 'MULTIPLY'
+    depth.inputs[1].default_value = 2.0
+    links.new(group_in.outputs["Extrude"], depth.inputs[0])
+    extrude = add('GeometryNodeExtrudeMesh', 400)
+    extrude.mode = 'FACES'
+    extrude.inputs["Offset"].default_value = (0.0, 0.0, 1.0)
+    extrude.inputs["Individual"].default_value = False
+    links.new(move.outputs["Geometry"], extrude.inputs["Mesh"])
+    links.new(depth.outputs[0], extrude.inputs["Offset Scale"])
+
+    # Extruding moves the faces to the front, so the back needs its own copy
+    flip = add('GeometryNodeFlipFaces', 400, -250)
+    links.new(move.outputs["Geometry"], flip.inputs["Mesh"])
+    join = add('GeometryNodeJoinGeometry', 700)
+    links.new(extrude.outputs["Mesh"], join.inputs["Geometry"])
+    links.new(flip.outputs["Mesh"], join.inputs["Geometry"])
+
+    set_material = add('GeometryNodeSetMaterial', 950)
+    set_material.inputs["Material"].default_value = material
+    links.new(join.outputs["Geometry"], set_material.inputs["Geometry"])
+    links.new(set_material.outputs["Geometry"], group_out.inputs["Geometry"])
+    return tree
+
+
+def create_glyph_group(name):
+    """Build the group placing a glyph collection's objects on the points of the mesh"""
+    tree = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    tree.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    for input_name, socket_type, default in GLYPH_INPUTS:
+        socket = tree.interface.new_socket(input_name, in_out='INPUT', socket_type=socket_type)
+        if default is not None:
+            socket.default_value = default
+    tree.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+    nodes = tree.nodes
+    links = tree.links
+
+    def add(node_type, x, y=0):
+        node = nodes.new(node_type)
+        node.location = (x, y)
+        return node
+
+    group_in = add('NodeGroupInput', -600)
+    group_out = add('NodeGroupOutput', 300)
+
+    # Separate Children sorts the objects by name, which glyphs keeps in index order
+    glyph_set = add('GeometryNodeCollectionInfo', -300, -200)
+    glyph_set.transform_space = 'ORIGINAL'
+    glyph_set.inputs["Separate Children"].default_value = True
+    glyph_set.inputs["Reset Children"].default_value = True
+    links.new(group_in.outputs["Glyphs"], glyph_set.inputs["Collection"])
+
+    index = add('GeometryNodeInputNamedAttribute', -300, -400)
+    index.data_type = 'INT'
+    index.inputs["Name"].default_value = GLYPH_ATTRIBUTE
+
+    place = add('GeometryNodeInstanceOnPoints', 0)
+    place.inputs["Pick Instance"].default_value = True
+    links.new(group_in.outputs["Geometry"], place.inputs["Points"])
+    links.new(glyph_set.outputs["Instances"], place.inputs["Instance"])
+    links.new(next(socket for socket in index.outputs if socket.enabled), place.inputs["Instance Index"])
+    links.new(group_in.outputs["Scale"], place.inputs["Scale"])
+    links.new(place.outputs["Instances"], group_out.inputs["Geometry"])
+    return tree
+
+
+def glyph_group():
+    """The one node group of all glyph signs"""
+    group = _tagged(bpy.data.node_groups, GLYPH_GROUP_NAME, 'glyphs')
+    if group is None:
+        group = create_glyph_group(GLYPH_GROUP_NAME)
+        group[SHARED_PROP] = 'glyphs'
+    return group
+
+
+class NodeGroupCache:
+    """One node group per font and alignment, shared by all node signs using them"""
+
+    def __init__(self):
+        self._names = {}
+        self._scanned = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, font=None, centered=False):
+        key = group_key(font, centered)
+
+        group = self._probe(key)
+        if group is None and not self._scanned:
+            self._scan()
+            group = self._probe(key)
+
+        if group is not None:
+            self.hits += 1
+            return group
+
+        self.misses += 1
+        name = f"QuickSigns {font.name if font is not None else 'Default'}"
+        group = create_node_group(name, font, centered, shared_material())
+        group[GROUP_KEY_PROP] = key
+        self._names[key] = group.name
+        return group
+
+    def clear(self):
+        self._names.clear()
+        self._scanned = False
+
+    def _probe(self, key):
+        name = self._names.get(key)
+        if name is None:
+            return None
+        group = bpy.data.node_groups.get(name)
+        if group is None or group.get(GROUP_KEY_PROP) != key:
+            del self._names[key]
+            return None
+        return group
+
+    def _scan(self):
+        for group in bpy.data.node_groups:
+            key = group.get(GROUP_KEY_PROP)
+            if key and key not in self._names and not group.library:
+                self._names[key] = group.name
+        self._scanned = True
+
+
+node_groups = NodeGroupCache()
+
+
+def input_identifiers(group):
+    """Modifier property names of a node group's inputs by input name"""
+    return {
+        item.name: item.identifier
+        for item in group.interface.items_tree
+        if item.item_type == 'SOCKET' and item.in_out == 'INPUT'
+    }
+
+
+def new_sign_object(spec, font=None, centered=False):
+    """Create an unlinked object that draws a spec's text through the shared node group"""
+    obj = bpy.data.objects.new(f"Sign_{spec['text'][:10]}", base_mesh())
+    obj.modifiers.new(MODIFIER_NAME, 'NODES')
+    update_sign_object(obj, spec, font, centered)
+    return obj
+
+
+def update_sign_object(obj, spec, font=None, centered=False):
+    """Point a node sign at the group for its font and set its inputs and colour"""
+    modifier = obj.modifiers[MODIFIER_NAME]
+    group = node_groups.get(font, centered)
+    if modifier.node_group != group:
+        modifier.node_group = group
+
+    identifiers = input_identifiers(group)
+    for input_name, value in (
+        ("Text", spec['text']),
+        ("Size", spec['size']),
+        ("Extrude", spec['extrude']),
+        ("Line Spacing", spec['line_spacing']),
+    ):
+        modifier[identifiers[input_name]] = value
+    set_sign_colour(obj, spec)
+
+
+def set_sign_colour(obj, spec):
+    """Set the object properties the shared material reads a spec's colour from"""
+    obj[COLOR_ATTRIBUTE] = list(spec['color'][:3])
+    obj[METALLIC_ATTRIBUTE] = spec['metallic']
+    obj[ROUGHNESS_ATTRIBUTE] = spec['roughness']
@@ -0,0 +1,206 @@
+"""Signs that instance cached glyph meshes through Geometry Nodes
+
+Every (font, size, extrude, bevel) combination gets a glyph collection
+holding one object per character, each linking a mesh tessellated once.
+A glyph sign is a single object whose mesh has one point per visible
+character, placed from the font's advance widths and kerning (see
+``layout.glyph_positions``) and carrying the index of its glyph object.
+The shared glyph node group instances the collection's objects on those
+points, so thousands of different shop names cost a few hundred glyph
+meshes and one object per sign, instead of one text curve evaluation per
+sign. The glyph meshes use the shared node sign material, which reads the
+colour from the sign object.
+
+Text curves keep extrude and bevel in world units while the outline
+scales with the size. Glyphs without a bevel are baked at size 1 and
+instanced at (size, size, 1); beveled glyphs are baked at the sign's size
+so their bevel matches the other backends.
+"""
+
+import bpy
+
+from . import geonodes
+from . import layout
+
+
+# Custom property holding a glyph mesh's cache key
+GLYPH_KEY_PROP = "quicksigns_glyph_key"
+
+# Custom property holding a glyph collection's cache key
+GLYPH_SET_PROP = "quicksigns_glyph_set"
+
+# Custom properties of a glyph object: its character and instance index
+GLYPH_CHAR_PROP = "quicksigns_glyph_char"
+GLYPH_INDEX_PROP = "quicksigns_glyph_index"
+
+# Custom property marking glyph sign objects
+GLYPH_SIGN_PROP = "quicksigns_glyph_sign"
+
+
+def set_key(font, size, extrude, bevel):
+    """Key of the glyph collection of a font and shape"""
+    font_path = bpy.path.abspath(font.filepath) if font is not None else ""
+    return f"{font_path}|{size:.6f}|{extrude:.6f}|{bevel:.6f}"
+
+
+def glyph_key(font, char, size, extrude, bevel):
+    """Key of the mesh of one character"""
+    return f"{set_key(font, size, extrude, bevel)}|{ord(char):x}"
+
+
+def baked_size(spec):
+    """Size glyphs of a spec are baked at: 1 unless a bevel has to stay in world units"""
+    return spec['size'] if spec['bevel'] else 1.0
+
+
+class GlyphSetCache:
+    """One glyph collection per font, size, extrude and bevel, shared by all glyph signs
+
+    Like the other caches, datablock names are kept and checked against a
+    custom property on every lookup. Glyph objects are only ever added,
+    named in index order, so the indices stored in existing signs stay valid.
+    """
+
+    def __init__(self):
+        self._names = {}
+        self._indices = {}
+        self._scanned = False
+        self.hits = 0
+        self.misses = 0
+
+    def glyphs(self, font, chars, size, extrude, bevel, scene):
+        """Glyph collection and instance index of each character, baking every missing one in a single depsgraph update"""
+        key = set_key(font, size, extrude, bevel)
+        collection = self._probe(key)
+        if collection is None and not self._scanned:
+            self._scan()
+            collection = self._probe(key)
+        if collection is None:
+            collection = bpy.data.collections.new(f"Glyphs {font.name if font is not None else 'Default'}")
+            collection[GLYPH_SET_PROP] = key
+            self._names[key] = collection.name
+
+        indices = self._indices.get(key)
+        if indices is None or len(indices) != len(collection.objects):
+            indices = self._indices[key] = glyph_indices(collection)
+
+        missing = [char for char in dict.fromkeys(chars) if char not in indices]
+        self.hits += len(set(chars)) - len(missing)
+        if missing:
+            self.misses += len(missing)
+            meshes = self._bake(font, missing, size, extrude, bevel, scene)
+            for char in missing:
+                index = len(collection.objects)
+                mesh = meshes[char]
+                mesh[GLYPH_KEY_PROP] = glyph_key(font, char, size, extrude, bevel)
+                glyph = bpy.data.objects.new(f"Glyph {index:05d}", mesh)
+                glyph[GLYPH_CHAR_PROP] = char
+                glyph[GLYPH_INDEX_PROP] = index
+                collection.objects.link(glyph)
+                indices[char] = index
+        return collection, indices
+
+    def clear(self):
+        self._names.clear()
+        self._indices.clear()
+        self._scanned = False
+
+    def _bake(self, font, chars, size, extrude, bevel, scene):
+        """Evaluate one temporary single-character text object per glyph"""
+        templates = {}
+        try:
+            for char in chars:
+                curve = bpy.data.curves.new(name="Glyph_Temp", type='FONT')
+                curve.body = char
+                curve.size = size
+                curve.extrude = extrude
+                curve.bevel_depth = bevel
+                if font is not None:
+                    curve.font = font
+                obj = bpy.data.objects.new("Glyph_Temp", curve)
+                scene.collection.objects.link(obj)
+                templates[char] = obj
+
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            depsgraph.update()
+            meshes = {}
+            font_name = font.name if font is not None else "Default"
+            material = geonodes.shared_material()
+            for char, obj in templates.items():
+                mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+                mesh.name = f"Glyph_{char}_{font_name}"
+                # Colour comes from the sign object through the shared material
+                mesh.materials.clear()
+                mesh.materials.append(material)
+                meshes[char] = mesh
+        finally:
+            for obj in templates.values():
+                curve = obj.data
+                bpy.data.objects.remove(obj, do_unlink=True)
+                bpy.data.curves.remove(curve)
+        return meshes
+
+    def _probe(self, key):
+        name = self._names.get(key)
+        if name is None:
+            return None
+        collection = bpy.data.collections.get(name)
+        if collection is None or collection.get(GLYPH_SET_PROP) != key:
+            del self._names[key]
+            self._indices.pop(key, None)
+            return None
+        return collection
+
+    def _scan(self):
+        for collection in bpy.data.collections:
+            key = collection.get(GLYPH_SET_PROP)
+            if key and key not in self._names and not collection.library:
+                self._names[key] = collection.name
+        self._scanned = True
+
+
+glyph_cache = GlyphSetCache()
+
+
+def glyph_indices(collection):
+    """Instance index of each character of a glyph collection"""
+    return {
+        glyph[GLYPH_CHAR_PROP]: glyph[GLYPH_INDEX_PROP]
+        for glyph in collection.objects
+        if GLYPH_CHAR_PROP in glyph and GLYPH_INDEX_PROP in glyph
+    }
+
+
+def new_glyph_sign(spec, font, scene, centered=False):
+    """Create an unlinked glyph sign object for a fitted spec"""
+    mesh = bpy.data.meshes.new(f"Sign_{spec['text'][:10]}")
+    obj = bpy.data.objects.new(mesh.name, mesh)
+    obj[GLYPH_SIGN_PROP] = True
+    obj.modifiers.new(geonodes.MODIFIER_NAME, 'NODES').node_group = geonodes.glyph_group()
+    place_glyphs(obj, spec, font, scene, centered)
+    geonodes.set_sign_colour(obj, spec)
+    return obj
+
+
+def place_glyphs(obj, spec, font, scene, centered=False):
+    """Lay out a glyph sign's characters as points and point its modifier at their glyph collection"""
+    metrics = layout.load_metrics(bpy.path.abspath(font.filepath) if font is not None else None)
+    positions = layout.glyph_positions(spec['text'], metrics, spec['line_spacing'], centered)
+    size = spec['size']
+    baked = baked_size(spec)
+    collection, indices = glyph_cache.glyphs(
+        font, [char for char, _x, _y in positions], baked, spec['extrude'], spec['bevel'], scene
+    )
+
+    mesh = obj.data
+    mesh.clear_geometry()
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set('co', [value for _char, x, y in positions for value in (x * size, y * size, 0.0)])
+    attribute = mesh.attributes.new(geonodes.GLYPH_ATTRIBUTE, 'INT', 'POINT')
+    attribute.data.foreach_set('value', [indices[char] for char, _x, _y in positions])
+    mesh.update()
+
+    modifier = obj.modifiers[geonodes.MODIFIER_NAME]
+    identifiers = geonodes.input_identifiers(modifier.node_group)
+    modifier[identifiers["Glyphs"]] = collection
+    modifier[identifiers["Scale"]] = (size / baked, size / baked, 1.0)
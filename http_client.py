@@ -0,0 +1,232 @@
+"""Shared HTTP client for all Google Fonts traffic
+
+Connections are kept alive and pooled per host, so the catalog fetch and
+every font download after it reuse the same few TLS sessions. Responses
+are streamed in bounded chunks, gzip bodies are decoded on the fly, and
+timeouts and retries follow one policy. Thread-safe and free of Blender
+imports, so the download workers use it directly.
+"""
+
+import http.client
+import threading
+import time
+import urllib.parse
+import zlib
+
+
+USER_AGENT = "QuickSigns"
+
+# Socket timeout of every request (seconds)
+TIMEOUT = 30
+
+# Attempts after the first, and the delay before the first retry (doubled each time)
+RETRIES = 3
+BACKOFF = 0.5
+
+# Status codes worth retrying; anything else in the 4xx range is final
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+
+# Bytes read from a response at a time
+CHUNK_SIZE = 64 * 1024
+
+# Idle connections kept per host. An HTTP/1.1 connection carries one
+# request at a time, so each parallel download worker needs its own; this
+# matches the default number of download workers, so a second batch of
+# downloads finds a warm connection for every worker instead of reconnecting
+# all but one. Sequential traffic such as the catalog only ever uses one.
+MAX_IDLE_PER_HOST = 8
+
+# Failures of the connection itself, as opposed to error responses
+NETWORK_ERRORS = (OSError, http.client.HTTPException)
+
+
+class HTTPError(Exception):
+    """Error (or 304 Not Modified) response"""
+
+    def __init__(self, status, reason, url, headers=None):
+        super().__init__(f"HTTP {status} {reason}: {url}")
+        self.status = status
+        self.headers = headers or {}
+
+
+class ConnectionPool:
+    """Idle keep-alive connections by (scheme, host)
+
+    Up to max_idle connections are kept per host rather than one, since
+    download workers run requests to the same host concurrently.
+    """
+
+    def __init__(self, max_idle=MAX_IDLE_PER_HOST):
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, scheme, netloc, timeout):
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                self.reused += 1
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn
+            self.created += 1
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=timeout)
+        return http.client.HTTPConnection(netloc, timeout=timeout)
+
+    def release(self, scheme, netloc, conn):
+        """Keep a connection whose last response was read to the end"""
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'created': self.created,
+                'reused': self.reused,
+                'idle': sum(len(connections) for connections in self._idle.values()),
+            }
+
+
+pool = ConnectionPool()
+
+
+class Response:
+    """Streamed response body that hands its connection back to the pool once read"""
+
+    def __init__(self, url, key, conn, response):
+        self.url = url
+        self.status = response.status
+        self.headers = response.headers
+        self.bytes_read = 0
+        self._key = key
+        self._conn = conn
+        self._response = response
+        encoding = (response.getheader('Content-Encoding') or '').lower()
+        self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == 'gzip' else None
+
+    @property
+    def length(self):
+        """Content-Length on the wire, 0 when unknown"""
+        return int(self._response.getheader('Content-Length') or 0)
+
+    def getheader(self, name, default=None):
+        return self._response.getheader(name, default)
+
+    def iter_chunks(self, chunk_size=CHUNK_SIZE):
+        """Decoded body in chunks of about chunk_size bytes"""
+        while True:
+            chunk = self._response.read(chunk_size)
+            if not chunk:
+                break
+            self.bytes_read += len(chunk)
+            if self._decoder is not None:
+                chunk = self._decoder.decompress(chunk)
+                if not chunk:
+                    continue
+            yield chunk
+        if self._decoder is not None:
+            tail = self._decoder.flush()
+            if tail:
+                yield tail
+
+    def read(self):
+        """Whole decoded body; use iter_chunks for anything large"""
+        return b''.join(self.iter_chunks())
+
+    def close(self):
+        """Return the connection to the pool if the body was read, else drop it"""
+        if self._conn is None:
+            return
+        if self._response.isclosed() and not self._response.will_close:
+            pool.release(*self._key, self._conn)
+        else:
+            self._conn.close()
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def request(url, headers=None, timeout=TIMEOUT, accept_gzip=False, redirects=MAX_REDIRECTS):
+    """GET url over a pooled connection, following redirects
+
+    Raises HTTPError for responses other than 200 and NETWORK_ERRORS for
+    broken connections. The Response must be closed, best with ``with``.
+    """
+    parts = urllib.parse.urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    path = parts.path or '/'
+    if parts.query:
+        path = f"{path}?{parts.query}"
+
+    send_headers = {'User-Agent': USER_AGENT, 'Connection': 'keep-alive'}
+    if accept_gzip:
+        send_headers['Accept-Encoding'] = 'gzip'
+    if headers:
+        send_headers.update(headers)
+
+    conn = pool.acquire(*key, timeout)
+    try:
+        conn.request('GET', path, headers=send_headers)
+        raw = conn.getresponse()
+    except NETWORK_ERRORS:
+        # The server may have dropped an idle connection; it isn't reused
+        conn.close()
+        raise
+
+    response = Response(url, key, conn, raw)
+    if raw.status == 200:
+        return response
+
+    # Error bodies are small; reading them keeps the connection reusable
+    with response:
+        raw.read()
+    if raw.status in REDIRECT_STATUSES and redirects > 0:
+        location = urllib.parse.urljoin(url, raw.getheader('Location', ''))
+        return request(location, headers, timeout, accept_gzip, redirects - 1)
+    raise HTTPError(raw.status, raw.reason, url, dict(raw.getheaders()))
+
+
+def is_retryable(error):
+    """Check if a failed request may succeed when tried again"""
+    if isinstance(error, HTTPError):
+        return error.status in RETRY_STATUSES
+    return isinstance(error, NETWORK_ERRORS)
+
+
+def with_retries(call, retries=RETRIES, backoff=BACKOFF, cancelled=None, on_retry=None):
+    """Run call() until it succeeds, retrying retryable errors with exponential backoff
+
+    cancelled() stops retrying early; on_retry(error) runs before each retry.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return call()
+        except Exception as e:
+            if attempt == retries or not is_retryable(e) or (cancelled is not None and cancelled()):
+                raise
+            if on_retry is not None:
+                on_retry(e)
+            time.sleep(backoff * (2 ** attempt))
@@ -0,0 +1,213 @@
+"""Sharded batch generation in background Blender worker processes
+
+Blender runs Python on one core, so a large batch is split into shards
+that are built in parallel by ``blender -b`` workers running ``cli.py
+batch``. Each worker saves its signs in one collection of its own
+library .blend, which the main file then appends or links. Failed shards
+are retried, and at most ``workers`` processes run at once. Free of
+Blender imports; the caller passes the Blender binary.
+"""
+
+import json
+import os
+import subprocess
+import time
+
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+
+# Attempts after the first for a failed shard
+RETRIES = 1
+
+# Bytes of a failed worker's log kept as its error message
+LOG_TAIL = 2000
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = 'PENDING', 'RUNNING', 'DONE', 'FAILED', 'CANCELLED'
+
+
+def split_specs(specs, shards):
+    """Split specs into at most shards contiguous runs of nearly equal length"""
+    shards = max(1, min(shards, len(specs)))
+    size, extra = divmod(len(specs), shards)
+    runs = []
+    start = 0
+    for index in range(shards):
+        end = start + size + (1 if index < extra else 0)
+        runs.append(specs[start:end])
+        start = end
+    return [run for run in runs if run]
+
+
+class Shard:
+    """One worker's share of a batch and the state of its process"""
+
+    def __init__(self, index, specs_path, output_path, collection, count):
+        self.index = index
+        self.specs_path = specs_path
+        self.output_path = output_path
+        self.log_path = f"{os.path.splitext(output_path)[0]}.log"
+        self.collection = collection
+        self.count = count
+        self.state = PENDING
+        self.attempts = 0
+        self.error = ""
+        self.elapsed = 0.0
+        self.process = None
+        self._started = 0.0
+        self._log = None
+
+
+def prepare_shards(specs, directory, shards, collection="QuickSigns Batch"):
+    """Write one spec file per shard to directory and return the Shards
+
+    Each shard's signs go to their own collection, ``<collection> 001``
+    and up, so the collections don't clash once merged.
+    """
+    os.makedirs(directory, exist_ok=True)
+    result = []
+    for index, run in enumerate(split_specs(specs, shards)):
+        base = os.path.join(directory, f"shard_{index:03d}")
+        with open(f"{base}.json", 'w', encoding='utf-8') as f:
+            json.dump({'signs': run}, f)
+        result.append(Shard(index, f"{base}.json", f"{base}.blend", f"{collection} {index + 1:03d}", len(run)))
+    return result
+
+
+def worker_command(binary, shard, options=()):
+    """Command line of a background Blender building a shard with cli.py batch"""
+    return [
+        # Without --python-exit-code a failing script still exits with 0
+        binary, "-b", "--factory-startup", "--python-exit-code", "1", "-P", CLI_PATH, "--",
+        "batch", shard.specs_path, "--output", shard.output_path,
+        "--collection", shard.collection, "--library", *options,
+    ]
+
+
+class ShardRunner:
+    """Runs shards in at most workers processes, retrying failed ones
+
+    Call poll() from a timer, or run() to block until every shard is done.
+    command(shard) returns the argument list of a shard's worker.
+    """
+
+    def __init__(self, shards, command, workers=None, retries=RETRIES, timeout=None):
+        self.shards = list(shards)
+        self.command = command
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.retries = retries
+        self.timeout = timeout
+        self._pending = list(self.shards)
+        self._running = []
+        self._started = time.monotonic()
+
+    def poll(self):
+        """Reap finished workers and start pending shards; True while work remains"""
+        for shard in list(self._running):
+            code = shard.process.poll()
+            if code is None:
+                if self.timeout is None or time.monotonic() - shard._started < self.timeout:
+                    continue
+                shard.process.kill()
+                code = shard.process.wait()
+                shard.error = f"timed out after {self.timeout:g}s"
+            self._finish(shard, code)
+
+        while self._pending and len(self._running) < self.workers:
+            self._start(self._pending.pop(0))
+        return self.is_busy()
+
+    def run(self, on_progress=None, interval=0.2):
+        """Block until every shard finished or failed, calling on_progress(runner) on changes"""
+        last = None
+        while self.poll():
+            state = self.progress()
+            if on_progress is not None and state != last:
+                on_progress(self)
+                last = state
+            time.sleep(interval)
+        if on_progress is not None:
+            on_progress(self)
+        return self.done()
+
+    def cancel(self):
+        """Kill running workers and drop pending shards"""
+        for shard in self._running:
+            shard.process.kill()
+            shard.process.wait()
+            self._close_log(shard)
+            shard.state = CANCELLED
+        for shard in self._pending:
+            shard.state = CANCELLED
+        self._running = []
+        self._pending = []
+
+    def is_busy(self):
+        return bool(self._running or self._pending)
+
+    def done(self):
+        return [shard for shard in self.shards if shard.state == DONE]
+
+    def failed(self):
+        return [shard for shard in self.shards if shard.state == FAILED]
+
+    def progress(self):
+        """(signs in finished shards, total signs, running shards, finished shards)"""
+        finished = self.done()
+        return (
+            sum(shard.count for shard in finished),
+            sum(shard.count for shard in self.shards),
+            len(self._running),
+            len(finished),
+        )
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self._started
+
+    def _start(self, shard):
+        if os.path.exists(shard.output_path):
+            os.remove(shard.output_path)
+        shard.attempts += 1
+        shard.state = RUNNING
+        shard.error = ""
+        shard._log = open(shard.log_path, 'wb')
+        shard._started = time.monotonic()
+        try:
+            shard.process = subprocess.Popen(self.command(shard), stdout=shard._log, stderr=subprocess.STDOUT)
+        except OSError as e:
+            self._close_log(shard)
+            shard.error = str(e)
+            shard.state = FAILED
+            return
+        self._running.append(shard)
+
+    def _finish(self, shard, code):
+        self._running.remove(shard)
+        self._close_log(shard)
+        shard.elapsed = time.monotonic() - shard._started
+        shard.process = None
+
+        if code == 0 and os.path.exists(shard.output_path):
+            shard.state = DONE
+            return
+
+        if not shard.error:
+            shard.error = f"exit code {code}: {self._log_tail(shard)}"
+        if shard.attempts <= self.retries:
+            shard.state = PENDING
+            self._pending.append(shard)
+        else:
+            shard.state = FAILED
+
+    def _close_log(self, shard):
+        if shard._log is not None:
+            shard._log.close()
+            shard._log = None
+
+    def _log_tail(self, shard):
+        try:
+            with open(shard.log_path, 'rb') as f:
+                f.seek(max(0, os.path.getsize(shard.log_path) - LOG_TAIL))
+                return f.read().decode('utf-8', 'replace').strip()
+        except OSError:
+            return ""
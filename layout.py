@@ -0,0 +1,238 @@
+"""Fit sign text into a box from font metrics
+
+Sizes and line breaks are worked out from the advance widths and kerning
+in the font file, read once per font, so fitting never evaluates a text
+curve. Pure Python without Blender imports, like ``ttf``.
+
+Lengths are in em units of the font until they are multiplied by the
+text size, which matches Blender: a text curve of size 1 is one em high
+and advances lines by ``space_line`` ems.
+"""
+
+import os
+import struct
+
+try:
+    from . import ttf
+except ImportError:
+    import ttf
+
+
+WRAP_MODES = ('NONE', 'WORD', 'CHAR')
+
+# Bisection steps when searching for the largest size that fits
+SEARCH_STEPS = 24
+
+# Metrics used for Blender's built-in font or unreadable files
+FALLBACK_ADVANCE = 0.6
+FALLBACK_ASCENT = 0.8
+FALLBACK_DESCENT = 0.2
+
+
+class FontMetrics:
+    """Advance widths, kerning and vertical extent of a font in em units"""
+
+    def __init__(self, font=None):
+        self.font = font
+        if font is not None:
+            self.scale = 1.0 / (font.units_per_em or 1000)
+            self.ascent = font.ascender * self.scale
+            self.descent = -font.descender * self.scale
+        else:
+            self.scale = 1.0
+            self.ascent = FALLBACK_ASCENT
+            self.descent = FALLBACK_DESCENT
+        self._glyphs = {}
+
+    def glyph(self, char):
+        """(glyph id, advance) of a character"""
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            if self.font is None:
+                glyph = (0, FALLBACK_ADVANCE)
+            else:
+                glyph_id = self.font.glyph_id(char)
+                glyph = (glyph_id, self.font.advance_width(glyph_id) * self.scale)
+            self._glyphs[char] = glyph
+        return glyph
+
+    def text_width(self, text):
+        """Advance width of a run of text including pair kerning"""
+        width = 0.0
+        previous = None
+        for char in text:
+            glyph_id, advance = self.glyph(char)
+            if previous is not None and self.font is not None:
+                width += self.font.kerning(previous, glyph_id) * self.scale
+            width += advance
+            previous = glyph_id
+        return width
+
+    @property
+    def block_extent(self):
+        """Height of a single line from descender to ascender"""
+        return self.ascent + self.descent
+
+
+_metrics = {}
+
+
+def load_metrics(path):
+    """Metrics of a font file, read once per file version"""
+    try:
+        key = (path, os.stat(path).st_mtime_ns) if path else None
+    except OSError:
+        key = None
+    if key is None:
+        return FontMetrics()
+
+    metrics = _metrics.get(key)
+    if metrics is None:
+        try:
+            font = ttf.TrueTypeFont.from_file(path)
+            # Read the lazy tables now, so a malformed one falls back here
+            # instead of failing later in the middle of a batch
+            font.cmap
+            font.advance_width(0)
+            font.kerning(0, 0)
+            metrics = FontMetrics(font)
+        except (OSError, ttf.FontError, struct.error):
+            metrics = FontMetrics()
+        _metrics[key] = metrics
+    return metrics
+
+
+class TextLayout:
+    """Text size and line breaks that fit a box"""
+
+    def __init__(self, lines, size, line_spacing, width, height):
+        self.lines = lines
+        self.size = size
+        self.line_spacing = line_spacing
+        self.width = width
+        self.height = height
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+
+def _measure(text, metrics, wrap):
+    """Paragraphs as lists of (unit, width) and the width of a joining space"""
+    paragraphs = []
+    for paragraph in text.split("\n"):
+        if wrap == 'CHAR':
+            # Each character carries its kerning against the one before
+            units = []
+            previous = ""
+            for char in paragraph.strip():
+                units.append((char, metrics.text_width(previous + char) - metrics.text_width(previous)))
+                previous = char
+        else:
+            units = [(unit, metrics.text_width(unit)) for unit in (paragraph.split() if wrap == 'WORD' else [paragraph])]
+        paragraphs.append(units)
+    return paragraphs, metrics.text_width(" ")
+
+
+def _wrap(paragraphs, space, max_width, wrap):
+    """Greedy line breaking, or None if a single unit is wider than max_width"""
+    joiner = " " if wrap == 'WORD' else ""
+    gap = space if wrap == 'WORD' else 0.0
+
+    lines = []
+    widest = 0.0
+    for units in paragraphs:
+        line, width = [], 0.0
+        for unit, unit_width in units:
+            if unit_width > max_width:
+                return None
+            if not line:
+                line, width = [unit], unit_width
+            elif width + gap + unit_width <= max_width:
+                line.append(unit)
+                width += gap + unit_width
+            elif unit.isspace():
+                # Character wrapping never starts a line with a space
+                continue
+            else:
+                lines.append(joiner.join(line).rstrip())
+                widest = max(widest, width)
+                line, width = [unit], unit_width
+        lines.append(joiner.join(line).rstrip())
+        widest = max(widest, width)
+    return lines, widest
+
+
+def fit_text(text, metrics, width, height, wrap='WORD', max_lines=0, line_spacing=1.0):
+    """Largest text size, and the line breaks for it, that fit text into width x height
+
+    wrap is 'NONE' (only explicit line breaks), 'WORD' or 'CHAR' (for
+    scripts without spaces). max_lines limits the number of lines, but
+    explicit line breaks are always kept.
+    """
+    if wrap not in WRAP_MODES:
+        raise ValueError(f"wrap must be one of {', '.join(WRAP_MODES)}, got {wrap!r}")
+
+    paragraphs, space = _measure(text, metrics, wrap)
+    max_lines = max(max_lines, len(paragraphs)) if max_lines > 0 else 0
+
+    def fits(size):
+        wrapped = _wrap(paragraphs, space, width / size, wrap)
+        if wrapped is None:
+            return None
+        lines, widest = wrapped
+        if max_lines and len(lines) > max_lines:
+            return None
+        block = (len(lines) - 1) * line_spacing + metrics.block_extent
+        return wrapped if block * size <= height else None
+
+    # Text can't be larger than one line filling the height
+    high = height / metrics.block_extent
+    best = fits(high) if high > 0 else None
+    if best is None:
+        low = 0.0
+        for _step in range(SEARCH_STEPS):
+            middle = (low + high) / 2
+            wrapped = fits(middle) if middle > 0 else None
+            if wrapped is None:
+                high = middle
+            else:
+                low, best = middle, wrapped
+    if best is None:
+        # Degenerate box, nothing fits at any size
+        best = _wrap(paragraphs, space, float('inf'), wrap)
+
+    # With the line breaks fixed, grow until either side of the box is full
+    lines, widest = best
+    block = (len(lines) - 1) * line_spacing + metrics.block_extent
+    size = max(0.0, min(width / widest if widest > 0 else float('inf'), height / block))
+    return TextLayout(lines, size, line_spacing, widest * size, block * size)
+
+
+def glyph_positions(text, metrics, line_spacing=1.0, centered=False):
+    """Origin (x, y) in em units of every character that draws something
+
+    Lines are placed line_spacing ems apart with pair kerning applied,
+    starting at the first baseline like a left/top-baseline text curve,
+    or centred on the origin like fitted text. Returns (char, x, y) tuples.
+    """
+    lines = text.split("\n")
+    if centered:
+        y = ((len(lines) - 1) * line_spacing + metrics.descent - metrics.ascent) / 2
+    else:
+        y = 0.0
+
+    positions = []
+    for line in lines:
+        x = -metrics.text_width(line) / 2 if centered else 0.0
+        previous = None
+        for char in line:
+            glyph_id, advance = metrics.glyph(char)
+            if previous is not None and metrics.font is not None:
+                x += metrics.font.kerning(previous, glyph_id) * metrics.scale
+            if not char.isspace():
+                positions.append((char, x, y))
+            x += advance
+            previous = glyph_id
+        y -= line_spacing
+    return positions
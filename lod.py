@@ -0,0 +1,190 @@
+"""Bake text signs to meshes with a decimated LOD chain and camera-distance switching"""
+
+import time
+
+import bpy
+from bpy.app.handlers import persistent
+
+
+# Custom properties stored on baked sign objects
+LOD_MESHES_PROP = "quicksigns_lods"
+LOD_DISTANCES_PROP = "quicksigns_lod_distances"
+SOURCE_CURVE_PROP = "quicksigns_source_curve"
+
+LOD_NAMES = ("Full", "Medium", "Low")
+
+
+def lod_settings(curve, medium_ratio, low_ratio):
+    """Curve resolution, bevel resolution and decimate ratio per LOD"""
+    return [
+        (curve.resolution_u, curve.bevel_resolution, 1.0),
+        (max(1, curve.resolution_u // 2), curve.bevel_resolution // 2, medium_ratio),
+        (1, 0, low_ratio),
+    ]
+
+
+def triangle_count(mesh):
+    mesh.calc_loop_triangles()
+    return len(mesh.loop_triangles)
+
+
+def evaluate_to_mesh(obj, scene, name):
+    """Evaluate a temporary object in scene and keep the result as a new mesh"""
+    scene.collection.objects.link(obj)
+    try:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        depsgraph.update()
+        mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+    finally:
+        bpy.data.objects.remove(obj, do_unlink=True)
+    mesh.name = name
+    return mesh
+
+
+def bake_lods(curve, scene, name, medium_ratio=0.5, low_ratio=0.15):
+    """Build one mesh per LOD from a text curve
+
+    Returns a list of (mesh, triangles, evaluation seconds) from full to low.
+    """
+    results = []
+    for level, (resolution, bevel_resolution, ratio) in enumerate(lod_settings(curve, medium_ratio, low_ratio)):
+        start = time.perf_counter()
+
+        lod_curve = curve.copy()
+        lod_curve.resolution_u = resolution
+        lod_curve.bevel_resolution = bevel_resolution
+        try:
+            mesh = evaluate_to_mesh(bpy.data.objects.new("LOD_Temp", lod_curve), scene, f"{name}_LOD{level}")
+        finally:
+            bpy.data.curves.remove(lod_curve)
+
+        if ratio < 1.0:
+            temp = bpy.data.objects.new("LOD_Temp", mesh)
+            modifier = temp.modifiers.new("Decimate", 'DECIMATE')
+            modifier.ratio = ratio
+            decimated = evaluate_to_mesh(temp, scene, f"{name}_LOD{level}")
+            bpy.data.meshes.remove(mesh)
+            mesh = decimated
+
+        results.append((mesh, triangle_count(mesh), time.perf_counter() - start))
+    return results
+
+
+def bake_sign(obj, scene, distances, medium_ratio=0.5, low_ratio=0.15):
+    """Replace a text sign with a mesh object carrying its LOD chain
+
+    The original curve is kept with a fake user so the sign can be rebuilt.
+    Returns the new object and the per-LOD (mesh, triangles, seconds) report.
+    """
+    curve = obj.data
+    results = bake_lods(curve, scene, obj.name, medium_ratio, low_ratio)
+    meshes = [mesh for mesh, _tris, _seconds in results]
+
+    baked = bpy.data.objects.new(obj.name, meshes[0])
+    baked.matrix_world = obj.matrix_world.copy()
+    baked.parent = obj.parent
+    for collection in obj.users_collection:
+        collection.objects.link(baked)
+
+    baked[LOD_MESHES_PROP] = [mesh.name for mesh in meshes]
+    baked[LOD_DISTANCES_PROP] = list(distances)
+    baked[SOURCE_CURVE_PROP] = curve.name
+    for key in obj.keys():
+        if key not in baked:
+            baked[key] = obj[key]
+
+    curve.use_fake_user = True
+    name = obj.name
+    bpy.data.objects.remove(obj, do_unlink=True)
+    baked.name = name
+    return baked, results
+
+
+def is_baked(obj):
+    return obj.type == 'MESH' and LOD_MESHES_PROP in obj
+
+
+def select_lod(obj, level):
+    """Show the given LOD level on a baked sign"""
+    names = list(obj[LOD_MESHES_PROP])
+    mesh = bpy.data.meshes.get(names[min(level, len(names) - 1)])
+    if mesh is not None and obj.data != mesh:
+        obj.data = mesh
+
+
+def level_for_distance(obj, distance):
+    level = 0
+    for index, threshold in enumerate(obj[LOD_DISTANCES_PROP]):
+        if distance >= threshold:
+            level = index
+    return level
+
+
+def update_lods(scene, camera=None):
+    """Pick every baked sign's LOD from its distance to the camera"""
+    camera = camera or scene.camera
+    if camera is None:
+        return
+    camera_location = camera.matrix_world.translation
+    for obj in scene.objects:
+        if is_baked(obj):
+            distance = (obj.matrix_world.translation - camera_location).length
+            select_lod(obj, level_for_distance(obj, distance))
+
+
+def apply_viewport_lods(scene):
+    """Show the LOD chosen for the viewport on every baked sign"""
+    level = scene.signs_props.lod_viewport_level
+    if level == 'CAMERA':
+        update_lods(scene)
+        return
+    for obj in scene.objects:
+        if is_baked(obj):
+            select_lod(obj, int(level))
+
+
+# ============================================================================
+# Render Handlers
+# ============================================================================
+
+_rendering = False
+
+
+@persistent
+def on_render_init(scene, depsgraph=None):
+    global _rendering
+    _rendering = True
+    update_lods(scene)
+
+
+@persistent
+def on_frame_change_pre(scene, depsgraph=None):
+    if _rendering:
+        update_lods(scene)
+
+
+@persistent
+def on_render_finished(scene, depsgraph=None):
+    global _rendering
+    _rendering = False
+    apply_viewport_lods(scene)
+
+
+HANDLERS = (
+    (bpy.app.handlers.render_init, on_render_init),
+    (bpy.app.handlers.frame_change_pre, on_frame_change_pre),
+    (bpy.app.handlers.render_complete, on_render_finished),
+    (bpy.app.handlers.render_cancel, on_render_finished),
+)
+
+
+def register_handlers():
+    for handlers, func in HANDLERS:
+        if func not in handlers:
+            handlers.append(func)
+
+
+def unregister_handlers():
+    for handlers, func in HANDLERS:
+        if func in handlers:
+            handlers.remove(func)
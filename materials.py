@@ -0,0 +1,150 @@
+"""Shared sign materials keyed by quantised colour, metallic and roughness"""
+
+import bpy
+
+from .profiling import profiler
+
+
+# Custom property holding a material's cache key
+MATERIAL_KEY_PROP = "quicksigns_material_key"
+
+# Nodes of a material as created by create_material
+DEFAULT_NODES = ('ShaderNodeBsdfPrincipled', 'ShaderNodeOutputMaterial')
+
+# Values are rounded to 1/QUANTIZE_STEPS before comparing
+QUANTIZE_STEPS = 255
+
+
+def material_key(color, metallic, roughness):
+    """Quantised cache key for a set of material parameters"""
+    values = (*color[:3], metallic, roughness)
+    return ",".join(str(round(value * QUANTIZE_STEPS)) for value in values)
+
+
+def create_material(color, metallic, roughness):
+    """Create a Principled BSDF material for a sign"""
+    mat = bpy.data.materials.new(name="Sign_Material")
+    mat.use_nodes = True
+    bsdf = mat.node_tree.nodes.get('Principled BSDF')
+    if bsdf:
+        bsdf.inputs['Base Color'].default_value = (*color[:3], 1.0)
+        bsdf.inputs['Metallic'].default_value = metallic
+        bsdf.inputs['Roughness'].default_value = roughness
+    return mat
+
+
+def read_material_params(mat):
+    """Colour, metallic and roughness of a sign material, or None if it has no Principled BSDF"""
+    if not mat.use_nodes or mat.node_tree is None:
+        return None
+    bsdf = mat.node_tree.nodes.get('Principled BSDF')
+    if bsdf is None:
+        return None
+    color = tuple(bsdf.inputs['Base Color'].default_value)[:3]
+    return color, bsdf.inputs['Metallic'].default_value, bsdf.inputs['Roughness'].default_value
+
+
+def node_tree_signature(mat):
+    """Node types and links of a material, so hand-edited trees are not merged"""
+    tree = mat.node_tree
+    if tree is None:
+        return ()
+    nodes = tuple(sorted(node.bl_idname for node in tree.nodes))
+    links = tuple(sorted(
+        (link.from_node.bl_idname, link.from_socket.identifier, link.to_node.bl_idname, link.to_socket.identifier)
+        for link in tree.links
+    ))
+    return nodes, links
+
+
+class MaterialCache:
+    """Reuse one material per quantised parameter set
+
+    Only material names are kept, never the datablocks themselves, because
+    undo and file loading invalidate Python references to ID data.
+    """
+
+    def __init__(self):
+        self._names = {}
+        self._scanned = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, color, metallic, roughness):
+        """Return a material with these parameters, creating it if needed"""
+        key = material_key(color, metallic, roughness)
+
+        mat = self._probe(key)
+        if mat is None and not self._scanned:
+            self._scan()
+            mat = self._probe(key)
+
+        if mat is not None:
+            self.hits += 1
+            return mat
+
+        self.misses += 1
+        with profiler.stage('material.create'):
+            mat = create_material(color, metallic, roughness)
+        mat[MATERIAL_KEY_PROP] = key
+        self._names[key] = mat.name
+        return mat
+
+    def clear(self):
+        """Forget all names, e.g. after a new file is loaded"""
+        self._names.clear()
+        self._scanned = False
+
+    def _probe(self, key):
+        name = self._names.get(key)
+        if name is None:
+            return None
+        mat = bpy.data.materials.get(name)
+        if mat is None or mat.get(MATERIAL_KEY_PROP) != key:
+            # Renamed or removed since it was cached
+            del self._names[key]
+            return None
+        return mat
+
+    def _scan(self):
+        """Index materials from the current file that carry a cache key"""
+        for mat in bpy.data.materials:
+            key = mat.get(MATERIAL_KEY_PROP)
+            if key and key not in self._names and not mat.library:
+                self._names[key] = mat.name
+        self._scanned = True
+
+
+def consolidate_materials():
+    """Merge duplicate sign materials in the file, returning how many were removed
+
+    Materials created by QuickSigns (tagged, or named Sign_Material*) are
+    grouped by quantised parameters and node tree layout; every duplicate is
+    remapped to the first material of its group and removed.
+    """
+    groups = {}
+    for mat in bpy.data.materials:
+        if mat.library or not (MATERIAL_KEY_PROP in mat or mat.name.startswith("Sign_Material")):
+            continue
+        params = read_material_params(mat)
+        if params is None:
+            continue
+        key = (material_key(*params), node_tree_signature(mat))
+        groups.setdefault(key, []).append(mat)
+
+    removed = 0
+    for (key, signature), mats in groups.items():
+        # Prefer a material that is already tagged so the cache keeps finding it
+        mats.sort(key=lambda m: (MATERIAL_KEY_PROP not in m, m.name))
+        keep = mats[0]
+        if MATERIAL_KEY_PROP not in keep and signature and signature[0] == DEFAULT_NODES:
+            keep[MATERIAL_KEY_PROP] = key
+        for duplicate in mats[1:]:
+            duplicate.user_remap(keep)
+            bpy.data.materials.remove(duplicate)
+            removed += 1
+    return removed
+
+
+# Shared cache used by the operators and batch generation
+material_cache = MaterialCache()
@@ -0,0 +1,146 @@
+"""Scatter thousands of signs over anchor points in one pass
+
+Anchors are the vertices of a mesh (for example facade anchor points,
+optionally only the selected ones) or the objects of a collection. Sign
+texts, positions, orientations and scales are worked out for all anchors
+at once with NumPy and only assigned to the new objects in Python.
+
+A sign faces along its anchor's normal (a vertex normal, or an object's
+local Z axis) with its baseline kept horizontal.
+"""
+
+import numpy as np
+
+import bpy
+
+
+# Word lists for store names
+ADJECTIVES = (
+    "Golden", "Silver", "Royal", "Grand", "Elite", "Prime", "Supreme",
+    "Classic", "Modern", "Urban", "Rustic", "Vintage", "Fresh", "Bright",
+    "Happy", "Cozy", "Swift", "Noble", "Lucky", "Magic", "Mystic",
+    "Crystal", "Diamond", "Pearl", "Sunset", "Sunrise", "Midnight",
+    "Blue", "Green", "Red", "Cosmic", "Stellar", "Azure", "Crimson",
+)
+
+NOUNS = (
+    "Coffee", "Bakery", "Bistro", "Cafe", "Deli", "Kitchen", "Grill",
+    "Market", "Shop", "Store", "Boutique", "Gallery", "Studio", "Bar",
+    "Lounge", "Pizza", "Burger", "Tacos", "Sushi", "Noodles", "Bowl",
+    "Plate", "Fork", "Spoon", "Cup", "Mug", "Bean", "Brew", "Slice",
+    "Corner", "Place", "Spot", "House", "Depot", "Emporium", "Trading",
+)
+
+WORLD_UP = np.array((0.0, 0.0, 1.0))
+
+
+def random_names(count, seed=0):
+    """count store names from the word lists, the same for the same seed"""
+    rng = np.random.default_rng([seed, 0])
+    adjectives = rng.integers(len(ADJECTIVES), size=count)
+    nouns = rng.integers(len(NOUNS), size=count)
+    return [f"{ADJECTIVES[a]} {NOUNS[n]}" for a, n in zip(adjectives.tolist(), nouns.tolist())]
+
+
+def vertex_anchors(obj, selected_only=False):
+    """World space positions and normals of a mesh object's vertices, as (n, 3) arrays"""
+    mesh = obj.data
+    count = len(mesh.vertices)
+    positions = np.empty(count * 3, dtype=np.float32)
+    normals = np.empty(count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', positions)
+    mesh.vertices.foreach_get('normal', normals)
+    positions = positions.reshape(-1, 3).astype(np.float64)
+    normals = normals.reshape(-1, 3).astype(np.float64)
+
+    if selected_only:
+        selected = np.empty(count, dtype=bool)
+        mesh.vertices.foreach_get('select', selected)
+        positions = positions[selected]
+        normals = normals[selected]
+
+    matrix = np.array(obj.matrix_world)
+    positions = positions @ matrix[:3, :3].T + matrix[:3, 3]
+    # Normals transform with the inverse transpose, so non-uniform scale keeps them perpendicular
+    normals = normals @ np.linalg.inv(matrix[:3, :3])
+    return positions, normals
+
+
+def collection_anchors(collection):
+    """World space locations and local Z axes of a collection's objects, as (n, 3) arrays"""
+    objects = list(collection.all_objects)
+    if not objects:
+        return np.empty((0, 3)), np.empty((0, 3))
+    matrices = np.array([obj.matrix_world for obj in objects])
+    return matrices[:, :3, 3], matrices[:, :3, 2]
+
+
+def pick_anchors(positions, normals, count, seed=0):
+    """A reproducible random sample of count anchors, in their original order; all if count is 0"""
+    if count <= 0 or count >= len(positions):
+        return positions, normals
+    rng = np.random.default_rng([seed, 2])
+    chosen = np.sort(rng.choice(len(positions), size=count, replace=False))
+    return positions[chosen], normals[chosen]
+
+
+def facing_rotations(normals):
+    """XYZ Euler angles (radians) turning a sign's +Z towards each normal with +X horizontal"""
+    z_axes = _normalized(normals, WORLD_UP)
+    x_axes = np.cross(WORLD_UP, z_axes)
+    # Anchors facing straight up or down read along world X
+    flat = np.linalg.norm(x_axes, axis=1) < 1e-6
+    x_axes[flat] = (1.0, 0.0, 0.0)
+    x_axes = _normalized(x_axes, np.array((1.0, 0.0, 0.0)))
+    y_axes = np.cross(z_axes, x_axes)
+
+    # Columns of R = Rz @ Ry @ Rx are the x, y and z axes
+    rotations = np.empty_like(normals)
+    rotations[:, 0] = np.arctan2(y_axes[:, 2], z_axes[:, 2])
+    rotations[:, 1] = np.arctan2(-x_axes[:, 2], np.hypot(x_axes[:, 0], x_axes[:, 1]))
+    rotations[:, 2] = np.arctan2(x_axes[:, 1], x_axes[:, 0])
+    return rotations
+
+
+def sign_transforms(positions, normals, offset=0.0, scale_jitter=0.0, seed=0):
+    """Locations, rotations (radians) and scales of signs on the anchors, as (n, 3) arrays
+
+    Signs sit offset along the normal, and their scale varies uniformly by
+    up to scale_jitter either way, reproducibly for a seed.
+    """
+    locations = positions + _normalized(normals, WORLD_UP) * offset
+    rotations = facing_rotations(normals)
+    rng = np.random.default_rng([seed, 1])
+    factors = 1.0 + rng.uniform(-scale_jitter, scale_jitter, size=len(positions))
+    scales = np.repeat(factors[:, None], 3, axis=1)
+    return locations, rotations, scales
+
+
+def write_transforms(objects, locations, rotations, scales):
+    """Set location, rotation and scale of each object from the matching rows of the arrays
+
+    objects is the list of signs as they were built, one per anchor. The
+    rows are converted to Python lists in one go, so only the three
+    assignments run per object.
+    """
+    if len(objects) != len(locations):
+        raise ValueError(f"{len(objects)} objects for {len(locations)} transforms")
+    for obj, location, rotation, scale in zip(objects, locations.tolist(), rotations.tolist(), scales.tolist()):
+        obj.location = location
+        obj.rotation_euler = rotation
+        obj.scale = scale
+
+
+def new_population_collection(parent, name="Sign Population"):
+    """Empty collection for one population, linked under parent"""
+    collection = bpy.data.collections.new(name)
+    parent.children.link(collection)
+    return collection
+
+
+def _normalized(vectors, fallback):
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    zero = lengths[:, 0] < 1e-12
+    result = np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
+    result[zero] = fallback
+    return result
@@ -0,0 +1,132 @@
+"""Font preview object, debounced auto-preview and a bounded cache of preview fonts"""
+
+from collections import OrderedDict
+
+import bpy
+
+from .profiling import profiler
+
+
+PREVIEW_OBJECT = "Font_Preview"
+
+# Selections closer together than this only preview the last one (seconds)
+DEBOUNCE_SECONDS = 0.15
+
+# Number of preview fonts kept loaded for instant revisits
+PREVIEW_FONT_LIMIT = 8
+
+
+class PreviewFontCache:
+    """LRU of VectorFont datablocks loaded for previews
+
+    Fonts that fall out of the cache are removed from bpy.data.fonts once
+    nothing uses them, so browsing the list doesn't grow the file.
+    """
+
+    def __init__(self, limit=PREVIEW_FONT_LIMIT):
+        self.limit = limit
+        self._names = OrderedDict()
+
+    def load(self, path):
+        """Return the font for path, loading it only if it isn't cached"""
+        name = self._names.get(path)
+        if name is not None:
+            font = bpy.data.fonts.get(name)
+            if font is not None and bpy.path.abspath(font.filepath) == path:
+                self._names.move_to_end(path)
+                return font
+            del self._names[path]
+
+        font = bpy.data.fonts.load(path, check_existing=True)
+        self._names[path] = font.name
+        return font
+
+    def release(self, keep=()):
+        """Remove unused fonts beyond the limit, never those in keep"""
+        while len(self._names) > self.limit:
+            path, name = next(iter(self._names.items()))
+            if path in keep:
+                self._names.move_to_end(path)
+                break
+            del self._names[path]
+            font = bpy.data.fonts.get(name)
+            if font is not None and font.users == 0:
+                bpy.data.fonts.remove(font)
+
+    def release_all(self):
+        """Remove every cached font that is no longer used"""
+        limit, self.limit = self.limit, 0
+        self.release()
+        self.limit = limit
+
+    def clear(self):
+        """Forget cached names without touching any data, e.g. after loading a file"""
+        self._names.clear()
+
+
+preview_fonts = PreviewFontCache()
+
+
+def show_font_preview(scene, font_path, body):
+    """Create or update the Font_Preview object"""
+    preview_obj = bpy.data.objects.get(PREVIEW_OBJECT)
+    if preview_obj is None:
+        curve = bpy.data.curves.new(name=PREVIEW_OBJECT, type='FONT')
+        preview_obj = bpy.data.objects.new(PREVIEW_OBJECT, curve)
+        scene.collection.objects.link(preview_obj)
+
+    preview_text = preview_obj.data
+    preview_text.body = body
+    preview_text.size = 0.5
+    preview_text.align_x = 'CENTER'
+
+    # Load and apply font, then drop fonts that fell out of the cache
+    with profiler.stage('preview.load_font'):
+        preview_text.font = preview_fonts.load(font_path)
+    preview_fonts.release(keep={font_path})
+    return preview_obj
+
+
+def remove_preview():
+    """Delete the preview object and release its fonts"""
+    preview_obj = bpy.data.objects.get(PREVIEW_OBJECT)
+    if preview_obj is not None:
+        curve = preview_obj.data
+        bpy.data.objects.remove(preview_obj, do_unlink=True)
+        if curve.users == 0:
+            bpy.data.curves.remove(curve)
+    preview_fonts.release_all()
+
+
+# ============================================================================
+# Debounce
+# ============================================================================
+
+_pending = None
+
+
+def debounce(callback, delay=DEBOUNCE_SECONDS):
+    """Run callback on the main thread once no new call arrived for delay seconds"""
+    global _pending
+    _pending = callback
+    if bpy.app.timers.is_registered(_run_pending):
+        bpy.app.timers.unregister(_run_pending)
+    bpy.app.timers.register(_run_pending, first_interval=delay)
+
+
+def cancel_pending():
+    global _pending
+    _pending = None
+    if bpy.app.timers.is_registered(_run_pending):
+        bpy.app.timers.unregister(_run_pending)
+
+
+def _run_pending():
+    global _pending
+    callback, _pending = _pending, None
+    if callback is not None:
+        try:
+            callback()
+        except Exception as e:
+            print(f"QuickSigns: Error updating preview: {e}")
+    return None
@@ -0,0 +1,162 @@
+"""Per-stage timings and byte counts of the add-on's hot paths
+
+Stages are named ``<area>.<step>``, e.g. ``search.catalog``,
+``download.network`` or ``build.load_font``. Each stage keeps a running
+count, total and byte count plus a window of recent durations for the
+percentiles, and every span goes into a bounded event log that can be
+written as JSON or as a Chrome trace (chrome://tracing, Perfetto). Pure
+Python without Blender imports, so download workers, the CLI and the
+benchmarks record into the same profiler.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# Recent durations per stage that percentiles are taken from
+SAMPLE_WINDOW = 512
+
+# Spans kept for export; the oldest are dropped first
+EVENT_LIMIT = 20000
+
+
+class StageStats:
+    """Running aggregates of one stage"""
+
+    __slots__ = ('name', 'count', 'total', 'max', 'bytes', 'samples')
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes = 0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def add(self, seconds, nbytes=0):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.bytes += nbytes
+        self.samples.append(seconds)
+
+    def percentile(self, fraction):
+        """Nearest-rank percentile of the recent durations"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'max': self.max,
+            'bytes': self.bytes,
+        }
+
+
+class Span:
+    """A running stage; set bytes once the amount of data is known"""
+
+    __slots__ = ('name', 'start', 'bytes')
+
+    def __init__(self, name, start, nbytes=0):
+        self.name = name
+        self.start = start
+        self.bytes = nbytes
+
+
+class Profiler:
+    """Thread-safe collector of stage timings"""
+
+    def __init__(self):
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._events = deque(maxlen=EVENT_LIMIT)
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name, nbytes=0):
+        """Time the body of a with block as one span of stage name"""
+        span = Span(name, time.perf_counter(), nbytes)
+        try:
+            yield span
+        finally:
+            if self.enabled:
+                self.record(name, time.perf_counter() - span.start, span.bytes, span.start)
+
+    def record(self, name, seconds, nbytes=0, start=None):
+        """Add a span measured elsewhere, e.g. by a download worker"""
+        if not self.enabled:
+            return
+        if start is None:
+            start = time.perf_counter() - seconds
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = StageStats(name)
+            stats.add(seconds, nbytes)
+            self._events.append((name, start, seconds, nbytes, threading.get_ident()))
+
+    def stats(self):
+        """Aggregates of every stage, sorted by name"""
+        with self._lock:
+            return [self._stages[name].as_dict() for name in sorted(self._stages)]
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._events.clear()
+            self._origin = time.perf_counter()
+
+    def snapshot(self):
+        """Aggregates and spans as plain data; span times are seconds since the last reset"""
+        with self._lock:
+            events = [
+                {'name': name, 'start': start - self._origin, 'seconds': seconds, 'bytes': nbytes, 'thread': thread}
+                for name, start, seconds, nbytes, thread in self._events
+            ]
+        return {'stages': self.stats(), 'events': events}
+
+    def export_json(self, path):
+        """Write the aggregates and spans to a JSON file"""
+        _write_json(path, self.snapshot())
+
+    def export_chrome_trace(self, path):
+        """Write the spans as complete events of the Chrome trace format"""
+        pid = os.getpid()
+        trace = [
+            {
+                'name': event['name'],
+                'cat': event['name'].partition('.')[0],
+                'ph': 'X',
+                'ts': event['start'] * 1e6,
+                'dur': event['seconds'] * 1e6,
+                'pid': pid,
+                'tid': event['thread'],
+                'args': {'bytes': event['bytes']},
+            }
+            for event in self.snapshot()['events']
+        ]
+        _write_json(path, {'traceEvents': trace, 'displayTimeUnit': 'ms'})
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+profiler = Profiler()
@@ -0,0 +1,212 @@
+"""Render font sample thumbnails to PNG without Blender
+
+Runs as a worker process so rasterising hundreds of fonts never blocks
+Blender's UI::
+
+    python raster.py --out THUMB_DIR [--size 96] [--text Aa] FONT [FONT ...]
+
+Each thumbnail is written as ``<font sha256>.png`` and its path printed
+on a line of its own as soon as it is done.
+"""
+
+import argparse
+import hashlib
+import os
+import struct
+import sys
+import zlib
+
+try:
+    from . import ttf
+except ImportError:
+    import ttf
+
+
+SAMPLES = 4
+CURVE_STEPS = 6
+
+
+def font_hash(path):
+    """Content hash of a font file, taken from the name for font store blobs"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if len(stem) == 64 and all(c in "0123456789abcdef" for c in stem):
+        return stem
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def flatten_contour(contour, steps=CURVE_STEPS):
+    """Turn a TrueType contour of on/off-curve points into a closed polygon"""
+    count = len(contour)
+    if count < 2:
+        return []
+
+    # Start on an on-curve point, or the implied midpoint of two off-curve points
+    start = next((i for i, point in enumerate(contour) if point[2]), None)
+    if start is None:
+        x0, y0, _ = contour[0]
+        x1, y1, _ = contour[1]
+        points = [((x0 + x1) / 2, (y0 + y1) / 2, True)] + contour[1:] + contour[:1]
+    else:
+        points = contour[start:] + contour[:start]
+
+    polygon = [(points[0][0], points[0][1])]
+    control = None
+    for x, y, on_curve in points[1:] + points[:1]:
+        if on_curve:
+            if control is None:
+                polygon.append((x, y))
+            else:
+                _add_quadratic(polygon, control, (x, y), steps)
+                control = None
+        else:
+            if control is not None:
+                mid = ((control[0] + x) / 2, (control[1] + y) / 2)
+                _add_quadratic(polygon, control, mid, steps)
+            control = (x, y)
+    return polygon
+
+
+def _add_quadratic(polygon, control, end, steps):
+    x0, y0 = polygon[-1]
+    cx, cy = control
+    x1, y1 = end
+    for i in range(1, steps + 1):
+        t = i / steps
+        mt = 1 - t
+        polygon.append((mt * mt * x0 + 2 * mt * t * cx + t * t * x1, mt * mt * y0 + 2 * mt * t * cy + t * t * y1))
+
+
+def rasterize(polygons, width, height, samples=SAMPLES):
+    """Non-zero winding scanline fill with vertical supersampling and exact horizontal coverage
+
+    Polygons are in pixel coordinates with y pointing down. Returns one
+    float coverage value per pixel.
+    """
+    coverage = [0.0] * (width * height)
+    edges = []
+    for polygon in polygons:
+        for i in range(len(polygon)):
+            x0, y0 = polygon[i - 1]
+            x1, y1 = polygon[i]
+            if y0 != y1:
+                edges.append((x0, y0, x1, y1))
+
+    weight = 1.0 / samples
+    for row in range(height):
+        row_offset = row * width
+        for sample in range(samples):
+            y = row + (sample + 0.5) / samples
+            crossings = []
+            for x0, y0, x1, y1 in edges:
+                if (y0 <= y < y1) or (y1 <= y < y0):
+                    x = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+                    crossings.append((x, 1 if y1 > y0 else -1))
+            if not crossings:
+                continue
+            crossings.sort()
+
+            winding = 0
+            for i, (x, direction) in enumerate(crossings[:-1]):
+                winding += direction
+                if winding:
+                    _fill_span(coverage, row_offset, width, x, crossings[i + 1][0], weight)
+    return coverage
+
+
+def _fill_span(coverage, row_offset, width, left, right, weight):
+    left = max(left, 0.0)
+    right = min(right, float(width))
+    if right <= left:
+        return
+    first, last = int(left), min(int(right), width - 1)
+    if first == last:
+        coverage[row_offset + first] += (right - left) * weight
+        return
+    coverage[row_offset + first] += (first + 1 - left) * weight
+    for x in range(first + 1, last):
+        coverage[row_offset + x] += weight
+    coverage[row_offset + last] += (right - last) * weight
+
+
+def render_sample(font, text, size, padding=4):
+    """Render text centred in a size x size square, returning RGBA bytes
+
+    Raises ttf.FontError for fonts without glyf outlines (CFF), which
+    would otherwise come out blank.
+    """
+    if not font.has_outlines:
+        raise ttf.FontError("only glyf based fonts can be rendered")
+    glyphs = [font.glyph_id(char) for char in text]
+    advance = sum(font.advance_width(glyph) for glyph in glyphs) or font.units_per_em
+    line_height = (font.ascender - font.descender) or font.units_per_em
+
+    scale = min((size - 2 * padding) / advance, (size - 2 * padding) / line_height)
+    x_origin = (size - advance * scale) / 2
+    baseline = (size + (font.ascender + font.descender) * scale) / 2
+
+    polygons = []
+    pen = 0
+    for glyph in glyphs:
+        for contour in font.glyph_outline(glyph):
+            polygon = flatten_contour(contour)
+            polygons.append([(x_origin + (pen + x) * scale, baseline - y * scale) for x, y in polygon])
+        pen += font.advance_width(glyph)
+
+    coverage = rasterize(polygons, size, size)
+    pixels = bytearray(size * size * 4)
+    for i, value in enumerate(coverage):
+        pixels[i * 4:i * 4 + 4] = bytes((255, 255, 255, min(int(value * 255 + 0.5), 255)))
+    return bytes(pixels)
+
+
+def write_png(path, width, height, rgba):
+    """Write 8-bit RGBA pixels (top row first) as a PNG file"""
+    stride = width * 4
+    raw = b''.join(b'\x00' + rgba[y * stride:(y + 1) * stride] for y in range(height))
+
+    def chunk(tag, payload):
+        return struct.pack(">I", len(payload)) + tag + payload + struct.pack(">I", zlib.crc32(tag + payload) & 0xFFFFFFFF)
+
+    png = (
+        b'\x89PNG\r\n\x1a\n'
+        + chunk(b'IHDR', struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        + chunk(b'IDAT', zlib.compress(raw, 9))
+        + chunk(b'IEND', b'')
+    )
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(png)
+    os.replace(tmp_path, path)
+
+
+def render_thumbnail(font_path, out_dir, text="Aa", size=96):
+    """Render one font's thumbnail and return the PNG path"""
+    out_path = os.path.join(out_dir, f"{font_hash(font_path)}.png")
+    if not os.path.exists(out_path):
+        font = ttf.TrueTypeFont.from_file(font_path)
+        write_png(out_path, size, size, render_sample(font, text, size))
+    return out_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render font thumbnails")
+    parser.add_argument("--out", required=True, help="Directory for the PNG files")
+    parser.add_argument("--size", type=int, default=96)
+    parser.add_argument("--text", default="Aa")
+    parser.add_argument("fonts", nargs="+")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    failed = 0
+    for font_path in args.fonts:
+        try:
+            print(render_thumbnail(font_path, args.out, args.text, args.size), flush=True)
+        except Exception as e:
+            failed += 1
+            print(f"error {font_path}: {e}", file=sys.stderr, flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
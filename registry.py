@@ -0,0 +1,100 @@
+"""Generation records on sign objects for incremental rebuilds
+
+Every sign built by QuickSigns carries a ``quicksigns_sign`` custom
+property with the spec it was made from (before fitting), how it was
+built and one hash per input it depends on: the font files, the geometry
+settings and the material parameters. Rebuilding compares those hashes
+with the current ones and only touches the inputs that changed.
+"""
+
+import hashlib
+import json
+import os
+
+import bpy
+
+from .font_store import file_sha256
+from .materials import material_key
+
+
+RECORD_PROP = "quicksigns_sign"
+
+# Inputs a sign depends on, each with its own hash
+INPUTS = ('font', 'geometry', 'material')
+
+# Spec fields that change the shape of the text
+GEOMETRY_FIELDS = (
+    'text', 'size', 'extrude', 'bevel', 'bold', 'italic',
+    'box_width', 'box_height', 'wrap', 'max_lines', 'line_spacing',
+)
+
+# How a sign was built
+KINDS = ('TEXT', 'INSTANCE', 'NODES', 'GLYPHS')
+
+_font_hashes = {}
+
+
+def font_hash(path):
+    """Content hash of a font file, hashed once per file version; '' for no file"""
+    if not path:
+        return ""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    sha256 = _font_hashes.get(key)
+    if sha256 is None:
+        sha256 = _font_hashes[key] = file_sha256(path)
+    return sha256
+
+
+def input_hashes(spec, font_path=None, style_path=None):
+    """Hash of each input of a spec; font paths are the resolved files before subsetting"""
+    geometry = json.dumps([spec[field] for field in GEOMETRY_FIELDS])
+    return {
+        'font': f"{font_hash(font_path)}:{font_hash(style_path)}",
+        'geometry': hashlib.sha1(geometry.encode('utf-8')).hexdigest(),
+        'material': material_key(spec['color'], spec['metallic'], spec['roughness']),
+    }
+
+
+def record_sign(obj, spec, kind, hashes, subset=False):
+    """Store what a sign was built from on the object"""
+    obj[RECORD_PROP] = {
+        'spec': {key: list(value) if isinstance(value, tuple) else value for key, value in spec.items()},
+        'kind': kind,
+        'hashes': hashes,
+        'subset': subset,
+    }
+
+
+def read_record(obj):
+    """The record of a sign object as plain Python values, or None"""
+    record = obj.get(RECORD_PROP)
+    if record is None or not hasattr(record, 'to_dict'):
+        return None
+    return record.to_dict()
+
+
+def update_record(obj, spec=None, hashes=None):
+    """Replace the spec and/or hashes of a sign's record"""
+    record = read_record(obj)
+    if record is None:
+        return
+    record_sign(
+        obj, spec if spec is not None else record['spec'], record['kind'],
+        hashes if hashes is not None else record['hashes'], record.get('subset', False),
+    )
+
+
+def sign_objects(objects=None):
+    """Objects, from the file or the given ones, that carry a sign record"""
+    if objects is None:
+        objects = bpy.data.objects
+    return [obj for obj in objects if RECORD_PROP in obj and not obj.library]
+
+
+def changed_inputs(old_hashes, new_hashes):
+    """Inputs whose hash differs"""
+    return {name for name in INPUTS if old_hashes.get(name) != new_hashes.get(name)}
@@ -0,0 +1,206 @@
+"""In-memory search index over the Google Fonts catalog"""
+
+import bisect
+import sys
+from collections import defaultdict
+
+
+# Minimum trigram similarity for a fuzzy match
+FUZZY_THRESHOLD = 0.3
+
+# Match tiers, best first
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = range(5)
+
+
+def variant_name(weight=400, italic=False):
+    """Google Fonts variant name of a weight and style, e.g. 'regular' or '700italic'"""
+    if weight == 400:
+        return 'italic' if italic else 'regular'
+    return f"{weight}italic" if italic else str(weight)
+
+
+def parse_variant(variant):
+    """(weight, italic) of a Google Fonts variant name"""
+    italic = variant.endswith('italic')
+    weight = variant[:-len('italic')] if italic else variant
+    return (int(weight) if weight.isdigit() else 400), italic
+
+
+class FontRecord:
+    """Compact catalog entry kept on the Python side instead of in the scene"""
+
+    __slots__ = ('family', 'category', 'version', 'subsets', 'variants', 'files')
+
+    def __init__(self, family, category, version, subsets, variants, files):
+        self.family = family
+        self.category = category
+        self.version = version
+        self.subsets = subsets
+        self.variants = variants
+        self.files = files
+
+    @classmethod
+    def from_catalog(cls, font):
+        """Build a record from a Google Fonts API item"""
+        return cls(
+            font['family'],
+            sys.intern(font.get('category', 'sans-serif')),
+            sys.intern(font.get('version', '')),
+            tuple(sys.intern(subset) for subset in font.get('subsets', [])),
+            tuple(sys.intern(variant) for variant in font.get('variants', [])),
+            dict(font.get('files', {})),
+        )
+
+    @property
+    def url(self):
+        """Download URL of the regular variant"""
+        return self.files.get('regular', '')
+
+    def closest_variant(self, weight=400, italic=False):
+        """Variant with the requested style and the nearest weight, or None
+
+        On a tie the heavier weight wins above 400 and the lighter one
+        below, like CSS font matching. Variable families are served as one
+        static file per weight, so they are matched the same way.
+        """
+        candidates = []
+        for variant in self.variants:
+            variant_weight, variant_italic = parse_variant(variant)
+            if variant_italic == italic and variant in self.files:
+                heavier_first = variant_weight < weight if weight > 400 else variant_weight > weight
+                candidates.append((abs(variant_weight - weight), heavier_first, variant))
+        return min(candidates)[2] if candidates else None
+
+
+def trigrams(text):
+    """Trigrams of a lower-case string padded at the word boundaries"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Trigram and prefix index with facets for category, subset, variant count and popularity
+
+    Fonts are identified by their position in the catalog, which is sorted
+    by popularity, so the id doubles as the popularity rank.
+    """
+
+    def __init__(self, fonts):
+        # Raw catalog the index was built from, to detect a newer catalog
+        self.source = fonts
+        self.records = [FontRecord.from_catalog(font) for font in fonts]
+        self.names = [record.family.lower() for record in self.records]
+        self._by_family = {name: font_id for font_id, name in enumerate(self.names)}
+
+        self._sorted_names = sorted((name, font_id) for font_id, name in enumerate(self.names))
+        self._trigrams = defaultdict(list)
+        self._trigram_counts = []
+        self.by_category = defaultdict(set)
+        self.by_subset = defaultdict(set)
+        self.variant_counts = []
+
+        for font_id, (record, name) in enumerate(zip(self.records, self.names)):
+            name_trigrams = trigrams(name)
+            for trigram in name_trigrams:
+                self._trigrams[trigram].append(font_id)
+            self._trigram_counts.append(len(name_trigrams))
+
+            self.by_category[record.category].add(font_id)
+            for subset in record.subsets:
+                self.by_subset[subset].add(font_id)
+            self.variant_counts.append(len(record.variants) or 1)
+
+    def __len__(self):
+        return len(self.records)
+
+    def font_id(self, family):
+        """Id of a family, or None if it isn't in the catalog"""
+        return self._by_family.get(family.lower())
+
+    def record(self, family):
+        """Catalog record of a family, or None"""
+        font_id = self.font_id(family)
+        return None if font_id is None else self.records[font_id]
+
+    def search(self, query, category='ALL', subset='ALL', min_variants=0, max_rank=0, include=None):
+        """Font ids matching query and facets, best matches first
+
+        include, a set of font ids, limits the results further, e.g. to the
+        fonts covering a text.
+        """
+        allowed = self._facet_filter(category, subset, min_variants, max_rank, include)
+        query = query.strip().lower()
+
+        if not query:
+            ids = range(len(self.records)) if allowed is None else sorted(allowed)
+            return list(ids)
+
+        scored = {}
+        for font_id in self._prefix_matches(query):
+            scored[font_id] = (EXACT if self.names[font_id] == query else PREFIX, 0.0)
+
+        query_trigrams = trigrams(query)
+        shared = defaultdict(int)
+        for trigram in query_trigrams:
+            for font_id in self._trigrams.get(trigram, ()):
+                shared[font_id] += 1
+
+        for font_id, count in shared.items():
+            if font_id in scored:
+                continue
+            name = self.names[font_id]
+            position = name.find(query)
+            if position > 0:
+                tier = WORD_PREFIX if name[position - 1] == ' ' else SUBSTRING
+                scored[font_id] = (tier, 0.0)
+                continue
+
+            similarity = count / (len(query_trigrams) + self._trigram_counts[font_id] - count)
+            if similarity >= FUZZY_THRESHOLD:
+                scored[font_id] = (FUZZY, -similarity)
+
+        # Trigrams can't see substrings shorter than a trigram
+        if len(query) < 3:
+            for font_id, name in enumerate(self.names):
+                if font_id not in scored and query in name:
+                    scored[font_id] = (WORD_PREFIX if f" {query}" in name else SUBSTRING, 0.0)
+
+        if allowed is not None:
+            scored = {font_id: score for font_id, score in scored.items() if font_id in allowed}
+
+        return sorted(scored, key=lambda font_id: (*scored[font_id], font_id))
+
+    def facet_counts(self, ids):
+        """Number of results per category and per subset"""
+        categories = defaultdict(int)
+        subsets = defaultdict(int)
+        for font_id in ids:
+            record = self.records[font_id]
+            categories[record.category] += 1
+            for subset in record.subsets:
+                subsets[subset] += 1
+        return dict(categories), dict(subsets)
+
+    def _prefix_matches(self, query):
+        start = bisect.bisect_left(self._sorted_names, (query, -1))
+        for name, font_id in self._sorted_names[start:]:
+            if not name.startswith(query):
+                break
+            yield font_id
+
+    def _facet_filter(self, category, subset, min_variants, max_rank, include=None):
+        """Set of ids allowed by the facets, or None when nothing is filtered"""
+        allowed = None if include is None else set(include)
+        if category != 'ALL':
+            ids = self.by_category.get(category, set())
+            allowed = set(ids) if allowed is None else allowed & ids
+        if subset != 'ALL':
+            ids = self.by_subset.get(subset, set())
+            allowed = set(ids) if allowed is None else allowed & ids
+        if min_variants > 1:
+            ids = {i for i, count in enumerate(self.variant_counts) if count >= min_variants}
+            allowed = ids if allowed is None else allowed & ids
+        if max_rank > 0:
+            ids = set(range(min(max_rank, len(self.records))))
+            allowed = ids if allowed is None else allowed & ids
+        return allowed
@@ -0,0 +1,276 @@
+"""TrueType subsetting to the glyphs a piece of text uses
+
+Glyph ids are kept as they are and the outlines of unused glyphs are
+simply left empty, so hmtx and the other per-glyph tables stay valid
+without being rewritten. The glyf table shrinks to the few glyphs a sign
+needs and the kern table to the pairs between them. Pure Python without
+Blender imports, like ``ttf``.
+"""
+
+import hashlib
+import os
+import struct
+
+try:
+    from . import ttf
+except ImportError:
+    import ttf
+
+
+# Tables that are dropped from subsets: the signature is invalid once the
+# font changes, Blender's text layout never reads the OpenType layout
+# tables, and the device metrics only matter for screen hinting
+DROP_TABLES = {'DSIG', 'GDEF', 'GPOS', 'GSUB', 'hdmx', 'LTSH', 'VDMX'}
+
+# Tables rebuilt by the subsetter
+REBUILT_TABLES = {'glyf', 'loca', 'cmap', 'head', 'kern'}
+
+# head.checkSumAdjustment is chosen so the whole font sums to this
+CHECKSUM_MAGIC = 0xB1B0AFBA
+
+
+def glyph_closure(font, codepoints):
+    """Glyph ids needed for codepoints, including .notdef and composite components"""
+    glyphs = set()
+    stack = [0] + [font.cmap[code] for code in codepoints if code in font.cmap]
+    while stack:
+        glyph_id = stack.pop()
+        if glyph_id in glyphs or glyph_id >= font.num_glyphs:
+            continue
+        glyphs.add(glyph_id)
+        stack.extend(font.glyph_components(glyph_id))
+    return glyphs
+
+
+def subset_font(data, codepoints):
+    """Bytes of a font that only has outlines for codepoints
+
+    Raises ttf.FontError for fonts that can't be subset (CFF outlines).
+    """
+    font = ttf.TrueTypeFont(data)
+    if not font.has_outlines:
+        raise ttf.FontError("only glyf based fonts can be subset")
+
+    glyphs = glyph_closure(font, codepoints)
+    mapping = {code: font.cmap[code] for code in codepoints if code in font.cmap}
+
+    glyf = bytearray()
+    offsets = []
+    for glyph_id in range(font.num_glyphs):
+        offsets.append(len(glyf))
+        if glyph_id in glyphs:
+            glyf += font.glyph_data(glyph_id)
+            glyf += b'\0' * (-len(glyf) % 4)
+    offsets.append(len(glyf))
+
+    # Always long offsets, the short format can't address odd lengths
+    head = bytearray(font.table('head'))
+    struct.pack_into(">I", head, 8, 0)
+    struct.pack_into(">h", head, 50, 1)
+
+    tables = {
+        tag: font.table(tag) for tag in font.tables
+        if tag not in DROP_TABLES and tag not in REBUILT_TABLES
+    }
+    tables['glyf'] = bytes(glyf)
+    tables['loca'] = struct.pack(f">{len(offsets)}I", *offsets)
+    tables['cmap'] = build_cmap(mapping)
+    tables['head'] = bytes(head)
+    if 'kern' in font.tables:
+        tables['kern'] = subset_kern(font.table('kern'), glyphs)
+
+    sfnt_version = struct.unpack_from(">I", data, 0)[0]
+    output = bytearray(build_sfnt(sfnt_version, tables))
+
+    head_offset = _table_offset(output, 'head')
+    adjustment = (CHECKSUM_MAGIC - checksum(output)) & 0xFFFFFFFF
+    struct.pack_into(">I", output, head_offset + 8, adjustment)
+    return bytes(output)
+
+
+def checksum(data):
+    """OpenType table checksum: sum of big-endian uint32s, zero padded"""
+    data = bytes(data) + b'\0' * (-len(data) % 4)
+    return sum(struct.unpack(f">{len(data) // 4}I", data)) & 0xFFFFFFFF
+
+
+def _search_params(count, unit):
+    """searchRange, entrySelector and rangeShift of a binary-searchable array"""
+    power, exponent = 1, 0
+    while power * 2 <= count:
+        power *= 2
+        exponent += 1
+    return power * unit, exponent, count * unit - power * unit
+
+
+def build_sfnt(sfnt_version, tables):
+    """Assemble tables into a font file with a sorted, checksummed table directory"""
+    tags = sorted(tables)
+    header = struct.pack(">IH", sfnt_version, len(tags)) + struct.pack(">HHH", *_search_params(len(tags), 16))
+
+    directory = b''
+    body = b''
+    offset = 12 + 16 * len(tags)
+    for tag in tags:
+        table = tables[tag]
+        directory += struct.pack(">4sIII", tag.encode('latin-1'), checksum(table), offset + len(body), len(table))
+        body += table + b'\0' * (-len(table) % 4)
+    return header + directory + body
+
+
+def _table_offset(data, tag):
+    num_tables = struct.unpack_from(">H", data, 4)[0]
+    for i in range(num_tables):
+        entry_tag, _checksum, offset, _length = struct.unpack_from(">4sIII", data, 12 + i * 16)
+        if entry_tag.decode('latin-1') == tag:
+            return offset
+    raise ttf.FontError(f"missing '{tag}' table")
+
+
+def subset_kern(kern, glyphs):
+    """kern table with format 0 pairs limited to glyphs; other subtables are copied"""
+    if len(kern) < 4 or struct.unpack_from(">H", kern, 0)[0] != 0:
+        return kern
+
+    num_tables = struct.unpack_from(">H", kern, 2)[0]
+    subtables = []
+    offset = 4
+    for _i in range(num_tables):
+        version, length, coverage = struct.unpack_from(">HHH", kern, offset)
+        if coverage >> 8 != 0:
+            subtables.append(kern[offset:offset + length])
+            offset += length
+            continue
+
+        num_pairs = struct.unpack_from(">H", kern, offset + 6)[0]
+        pairs = []
+        for i in range(num_pairs):
+            left, right, value = struct.unpack_from(">HHh", kern, offset + 14 + i * 6)
+            if left in glyphs and right in glyphs:
+                pairs.append((left, right, value))
+
+        count = len(pairs)
+        subtables.append(
+            struct.pack(">HHH", version, 14 + 6 * count, coverage)
+            + struct.pack(">HHHH", count, *_search_params(count, 6))
+            + b''.join(struct.pack(">HHh", *pair) for pair in pairs)
+        )
+        offset += length
+    return struct.pack(">HH", 0, len(subtables)) + b''.join(subtables)
+
+
+def build_cmap(mapping):
+    """cmap with a format 4 BMP subtable, plus format 12 when there are codepoints above it"""
+    subtables = [((3, 1), _cmap_format4({code: glyph for code, glyph in mapping.items() if code < 0xFFFF}))]
+    if any(code > 0xFFFF for code in mapping):
+        subtables.append(((3, 10), _cmap_format12(mapping)))
+
+    header = struct.pack(">HH", 0, len(subtables))
+    offset = 4 + 8 * len(subtables)
+    records = b''
+    body = b''
+    for (platform_id, encoding_id), subtable in subtables:
+        records += struct.pack(">HHI", platform_id, encoding_id, offset + len(body))
+        body += subtable
+    return header + records + body
+
+
+def _cmap_format4(mapping):
+    # Runs of consecutive codepoints whose glyph ids share one delta
+    segments = []
+    for code in sorted(mapping):
+        delta = (mapping[code] - code) & 0xFFFF
+        if segments and segments[-1][1] == code - 1 and segments[-1][2] == delta:
+            segments[-1][1] = code
+        else:
+            segments.append([code, code, delta])
+    segments.append([0xFFFF, 0xFFFF, 1])
+
+    count = len(segments)
+    search_range, entry_selector, range_shift = _search_params(count, 2)
+    length = 16 + 8 * count
+    return (
+        struct.pack(">HHHHHHH", 4, length, 0, count * 2, search_range, entry_selector, range_shift)
+        + struct.pack(f">{count}H", *(end for _start, end, _delta in segments))
+        + struct.pack(">H", 0)
+        + struct.pack(f">{count}H", *(start for start, _end, _delta in segments))
+        + struct.pack(f">{count}H", *(delta for _start, _end, delta in segments))
+        + struct.pack(f">{count}H", *([0] * count))
+    )
+
+
+def _cmap_format12(mapping):
+    groups = []
+    for code in sorted(mapping):
+        glyph = mapping[code]
+        if groups and groups[-1][1] == code - 1 and groups[-1][2] + code - groups[-1][0] == glyph:
+            groups[-1][1] = code
+        else:
+            groups.append([code, code, glyph])
+
+    length = 16 + 12 * len(groups)
+    return struct.pack(">HHIII", 12, 0, length, 0, len(groups)) + b''.join(
+        struct.pack(">III", *group) for group in groups
+    )
+
+
+def source_hash(path):
+    """Hash of the font a cached subset was made from, or None for other files"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    source, _sep, glyph_set = stem.partition('-')
+    return source if len(source) == 64 and glyph_set else None
+
+
+class SubsetCache:
+    """Subset font files on disk, named by source font hash and glyph set
+
+    Texts that map to the same glyphs share one file, so a batch of signs
+    in one font needs as many subsets as it has distinct glyph sets.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._paths = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, font_path, text):
+        """Path of a subset of font_path covering text, or font_path if it can't be subset"""
+        try:
+            stat = os.stat(font_path)
+        except OSError:
+            return font_path
+
+        codepoints = frozenset(ord(char) for char in text)
+        key = (font_path, stat.st_size, stat.st_mtime_ns, codepoints)
+        path = self._paths.get(key)
+        if path is not None and os.path.exists(path):
+            self.hits += 1
+            return path
+
+        with open(font_path, 'rb') as f:
+            data = f.read()
+        try:
+            font = ttf.TrueTypeFont(data)
+            glyph_set = ",".join(str(glyph) for glyph in sorted(glyph_closure(font, codepoints)))
+        except (ttf.FontError, struct.error):
+            return font_path
+
+        name = f"{hashlib.sha256(data).hexdigest()}-{hashlib.sha1(glyph_set.encode('ascii')).hexdigest()[:16]}"
+        path = os.path.join(self.directory, f"{name}.ttf")
+        if os.path.exists(path):
+            self.hits += 1
+        else:
+            try:
+                subset = subset_font(data, codepoints)
+            except (ttf.FontError, struct.error):
+                return font_path
+            self.misses += 1
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(subset)
+            os.replace(tmp_path, path)
+
+        self._paths[key] = path
+        return path
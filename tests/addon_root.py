@@ -0,0 +1,10 @@
+"""pytest plugin: the add-on package needs Blender, the tests only its pure modules"""
+
+import pytest
+
+
+def pytest_collect_directory(path, parent):
+    """Collect the add-on root as a plain directory, so its __init__.py is never imported"""
+    if path == parent.config.rootpath:
+        return pytest.Dir.from_parent(parent, path=path)
+    return None
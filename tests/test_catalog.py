@@ -0,0 +1,100 @@
+"""CatalogCache against the benchmark's local Google Fonts stand-in"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import catalog  # noqa: E402
+import http_client  # noqa: E402
+from fake_fonts import FakeFontsServer  # noqa: E402
+
+
+FONTS = 20
+
+
+@pytest.fixture
+def server():
+    with FakeFontsServer(FONTS) as fake:
+        yield fake
+    http_client.pool.close_all()
+
+
+def new_cache(cache_dir, server, ttl=catalog.DEFAULT_TTL):
+    return catalog.CatalogCache(str(cache_dir), api_url=server.api_url, ttl=ttl, retries=0)
+
+
+def test_miss_then_hit(tmp_path, server):
+    cache = new_cache(tmp_path, server)
+    fonts = cache.get_fonts("key")
+    assert len(fonts) == FONTS
+    assert (cache.hits, cache.misses, cache.revalidations) == (0, 1, 0)
+
+    requests = server.requests
+    assert cache.get_fonts("key") == fonts
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert server.requests == requests
+
+
+def test_hit_from_disk_in_new_session(tmp_path, server):
+    new_cache(tmp_path, server).get_fonts("key")
+    requests = server.requests
+
+    cache = new_cache(tmp_path, server)
+    assert len(cache.get_fonts("key")) == FONTS
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert server.requests == requests
+
+
+def test_stale_catalog_is_revalidated_with_304(tmp_path, server):
+    cache = new_cache(tmp_path, server, ttl=0)
+    fonts = cache.get_fonts("key")
+    fetched_at = cache._meta['fetched_at']
+    assert cache._meta['etag'] == server.etag
+
+    assert cache.get_fonts("key") == fonts
+    assert (cache.hits, cache.misses, cache.revalidations) == (0, 2, 1)
+    assert server.not_modified == 1
+    assert cache._meta['fetched_at'] >= fetched_at
+
+    # Validators survive a restart
+    cache = new_cache(tmp_path, server, ttl=0)
+    cache.get_fonts("key", force_refresh=True)
+    assert cache.revalidations == 1
+    assert server.not_modified == 2
+
+
+def test_changed_etag_downloads_again(tmp_path, server):
+    cache = new_cache(tmp_path, server, ttl=0)
+    cache.get_fonts("key")
+    server.etag = '"changed"'
+
+    assert len(cache.get_fonts("key")) == FONTS
+    assert cache.revalidations == 0
+    assert server.not_modified == 0
+    assert cache._meta['etag'] == '"changed"'
+
+
+def test_stale_catalog_is_used_when_server_is_down(tmp_path):
+    server = FakeFontsServer(FONTS).start()
+    cache = new_cache(tmp_path, server, ttl=0)
+    fonts = cache.get_fonts("key")
+    server.stop()
+    http_client.pool.close_all()
+
+    assert cache.get_fonts("key") == fonts
+    assert (cache.misses, cache.revalidations) == (2, 0)
+
+
+def test_no_catalog_and_server_down_raises(tmp_path):
+    server = FakeFontsServer(FONTS).start()
+    server.stop()
+    cache = new_cache(tmp_path, server)
+
+    with pytest.raises(http_client.NETWORK_ERRORS):
+        cache.get_fonts("key")
+    assert cache.cached_fonts() is None
@@ -0,0 +1,111 @@
+"""Codepoint bitsets, their cache and coverage queries over a catalog"""
+
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import coverage  # noqa: E402
+import search  # noqa: E402
+from fake_fonts import build_font  # noqa: E402
+
+
+CATALOG = [
+    {'family': "Latin Sans", 'category': 'sans-serif', 'subsets': ['latin'], 'variants': ['regular']},
+    {'family': "Cyrillic Sans", 'category': 'sans-serif', 'subsets': ['latin', 'cyrillic'], 'variants': ['regular']},
+    {'family': "Latin Serif", 'category': 'serif', 'subsets': ['latin'], 'variants': ['regular']},
+    {'family': "Greek Serif", 'category': 'serif', 'subsets': ['greek'], 'variants': ['regular']},
+]
+
+
+def test_ranges_round_trip_through_masks():
+    ranges = coverage.ranges_from_codepoints([0x41, 0x43, 0x42, 0x100, 0x44, 0x102])
+    assert ranges == [(0x41, 0x44), (0x100, 0x100), (0x102, 0x102)]
+    mask = coverage.mask_from_ranges(ranges)
+    assert [bit for bit in range(0x110) if mask >> bit & 1] == [0x41, 0x42, 0x43, 0x44, 0x100, 0x102]
+    assert coverage.mask_from_ranges([]) == 0
+
+
+def test_text_mask_ignores_whitespace():
+    assert coverage.text_mask("AB A\n\t") == coverage.mask_from_ranges([(0x41, 0x42)])
+    assert coverage.text_mask("  ") == 0
+
+
+def test_subsets_mask():
+    latin = coverage.subsets_mask(['latin'])
+    both = coverage.subsets_mask(['latin', 'cyrillic'])
+    assert latin & coverage.text_mask("Café") == coverage.text_mask("Café")
+    assert latin & coverage.text_mask("Жук") == 0
+    assert both & latin == latin
+    assert coverage.subsets_mask(['no-such-subset']) == 0
+
+
+def test_covering_uses_subset_estimates():
+    index = coverage.CoverageIndex([search.FontRecord.from_catalog(entry) for entry in CATALOG])
+    assert index.covering(coverage.text_mask("Shop")) == {0, 1, 2}
+    assert index.covering(coverage.text_mask("Магазин")) == {1}
+    assert index.covering(coverage.text_mask("Ωμέγα")) == {3}
+    assert index.covering(coverage.text_mask("Shop Ω")) == set()
+    assert index.covering(0) == {0, 1, 2, 3}
+
+
+def test_refined_masks_replace_estimates():
+    index = coverage.CoverageIndex([search.FontRecord.from_catalog(entry) for entry in CATALOG])
+    ascii_only = coverage.mask_from_ranges([(0x20, 0x7E)])
+    index.refine(1, ascii_only)
+    index.refine(3, ascii_only)
+    assert index.covering(coverage.text_mask("Магазин")) == set()
+    assert index.covering(coverage.text_mask("Shop")) == {0, 1, 2, 3}
+    assert index.covering(coverage.text_mask("Café")) == {0, 2}
+
+
+def test_cmap_ranges_of_a_font_file(tmp_path):
+    font_path = tmp_path / "font.ttf"
+    font_path.write_bytes(build_font(1))
+    assert coverage.cmap_ranges(str(font_path)) == [(0x20, 0x7E)]
+
+    font_path.write_bytes(build_font(1)[:100])
+    assert coverage.cmap_ranges(str(font_path)) is None
+    assert coverage.cmap_ranges(str(tmp_path / "missing.ttf")) is None
+
+
+def test_cache_reads_each_font_once(tmp_path):
+    font_path = tmp_path / "font.ttf"
+    font_path.write_bytes(build_font(1))
+    sha256 = "ab" * 32
+
+    cache = coverage.CoverageCache(str(tmp_path / "cache"))
+    mask = cache.mask(sha256, str(font_path))
+    assert mask == coverage.mask_from_ranges([(0x20, 0x7E)])
+    cache.flush()
+    with open(cache.path, encoding='utf-8') as f:
+        assert json.load(f) == {'fonts': {sha256: [[0x20, 0x7E]]}}
+
+    # A new session answers from coverage.json without the file
+    os.remove(font_path)
+    assert coverage.CoverageCache(str(tmp_path / "cache")).mask(sha256, str(font_path)) == mask
+
+
+def test_cache_skips_unreadable_fonts(tmp_path):
+    cache = coverage.CoverageCache(str(tmp_path / "cache"))
+    assert cache.mask("cd" * 32, str(tmp_path / "missing.ttf")) is None
+    cache.flush()
+    assert not os.path.exists(cache.path)
+
+
+def test_covering_is_recomputed_only_after_changes():
+    index = coverage.CoverageIndex([search.FontRecord.from_catalog(entry) for entry in CATALOG])
+    required = coverage.text_mask("Shop")
+    first = index.covering(required)
+    assert index.covering(required) is first
+
+    index.refine(0, coverage.subsets_mask(['latin']))
+    refined = index.covering(required)
+    assert refined == first
+    index.refine(0, coverage.subsets_mask(['latin']))
+    assert index.covering(required) is refined
+    index.refine(0, 0)
+    assert index.covering(required) == {1, 2}
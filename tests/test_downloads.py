@@ -0,0 +1,126 @@
+"""Background downloads against the benchmark's fake Google Fonts server"""
+
+import hashlib
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import downloads  # noqa: E402
+import http_client  # noqa: E402
+from fake_fonts import FakeFontsServer, build_font  # noqa: E402
+
+
+@pytest.fixture
+def server():
+    # Slow enough that jobs are still in flight when the tests act on them
+    with FakeFontsServer(5, latency=0.2) as fake:
+        yield fake
+    http_client.pool.close_all()
+
+
+@pytest.fixture
+def manager():
+    manager = downloads.DownloadManager(max_workers=2, retries=0, backoff=0.0)
+    yield manager
+    manager.shutdown()
+
+
+def wait(manager, timeout=10.0):
+    """Drain callbacks like the add-on's timer until nothing is left"""
+    deadline = time.monotonic() + timeout
+    while manager.is_busy():
+        assert time.monotonic() < deadline, "downloads did not finish"
+        manager.drain()
+        time.sleep(0.01)
+
+
+def recorder():
+    """Callback recording the state each call saw"""
+    seen = []
+
+    def on_done(job):
+        seen.append(job.state)
+    on_done.seen = seen
+    return on_done
+
+
+def test_download_reaches_dest(tmp_path, server, manager):
+    dest = str(tmp_path / "fonts" / "0.ttf")
+    on_done = recorder()
+    job = manager.submit(f"{server.url}/fonts/0-regular.ttf", dest, on_done=on_done)
+    wait(manager)
+
+    data = build_font(0)
+    assert on_done.seen == ['DONE']
+    assert job.sha256 == hashlib.sha256(data).hexdigest()
+    assert job.bytes_done == len(data)
+    assert job.progress == 1.0
+    with open(dest, 'rb') as f:
+        assert f.read() == data
+    assert not os.path.exists(f"{dest}.part")
+
+
+def test_same_dest_shares_one_job(tmp_path, server, manager):
+    dest = str(tmp_path / "1.ttf")
+    first, second = recorder(), recorder()
+    job = manager.submit(f"{server.url}/fonts/1-regular.ttf", dest, on_done=first)
+    assert manager.submit(f"{server.url}/fonts/1-regular.ttf", dest, on_done=second) is job
+    wait(manager)
+
+    assert first.seen == second.seen == ['DONE']
+    assert server.requests == 1
+
+
+def test_released_callback_is_dropped_while_others_wait(tmp_path, server, manager):
+    dest = str(tmp_path / "2.ttf")
+    first, second = recorder(), recorder()
+    job = manager.submit(f"{server.url}/fonts/2-regular.ttf", dest, on_done=first)
+    manager.submit(f"{server.url}/fonts/2-regular.ttf", dest, on_done=second)
+    manager.release(job, first)
+    wait(manager)
+
+    assert first.seen == []
+    assert second.seen == ['DONE']
+    assert os.path.exists(dest)
+
+
+def test_release_of_the_last_callback_cancels(tmp_path, server, manager):
+    dest = str(tmp_path / "3.ttf")
+    on_done = recorder()
+    job = manager.submit(f"{server.url}/fonts/3-regular.ttf", dest, on_done=on_done)
+    manager.release(job, on_done)
+    wait(manager)
+
+    assert job.state == 'CANCELLED'
+    assert on_done.seen == []
+    assert not os.path.exists(dest)
+    assert not os.path.exists(f"{dest}.part")
+
+
+def test_submitting_again_revives_a_cancelled_job(tmp_path, server, manager):
+    dest = str(tmp_path / "4.ttf")
+    first, second = recorder(), recorder()
+    job = manager.submit(f"{server.url}/fonts/4-regular.ttf", dest, on_done=first)
+    manager.release(job, first)
+    assert manager.submit(f"{server.url}/fonts/4-regular.ttf", dest, on_done=second) is job
+    wait(manager)
+
+    assert first.seen == []
+    assert second.seen == ['DONE']
+
+
+def test_failed_download_reports_its_error(tmp_path, server, manager):
+    dest = str(tmp_path / "missing.ttf")
+    on_done = recorder()
+    job = manager.submit(f"{server.url}/fonts/missing.ttf", dest, on_done=on_done)
+    wait(manager)
+
+    assert on_done.seen == ['FAILED']
+    assert job.error
+    assert not os.path.exists(dest)
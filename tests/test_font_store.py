@@ -0,0 +1,117 @@
+"""Content-addressed font storage, eviction and integrity checks"""
+
+import itertools
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import font_store  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    """Strictly increasing time, so every use has its own LRU position"""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(font_store.time, 'time', lambda: float(next(ticks)))
+
+
+def add(store, family, data, **kwargs):
+    """Stage a download the way the add-on does and add it"""
+    path = store.staging_path(family, kwargs.get('variant', 'regular'), kwargs.get('version', ''))
+    os.makedirs(store.staging_dir, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return store.add_file(path, family, **kwargs)
+
+
+def test_add_and_lookup(tmp_path):
+    store = font_store.FontStore(str(tmp_path / "store"))
+    blob = add(store, "Alpha", b"A" * 100, version="v1")
+    sha256 = font_store.file_sha256(blob)
+    assert blob == store.blob_path(sha256)
+    assert store.find_hash(blob) == sha256
+    assert not os.path.exists(store.staging_path("Alpha", version="v1"))
+
+    assert store.lookup("Alpha", version="v1") == blob
+    assert store.lookup("Alpha", version="v2") is None
+    assert store.entry_hash("Alpha", version="v1") == sha256
+    assert store.find_family("alpha") == blob
+
+    # A new session reads the index from disk
+    assert font_store.FontStore(str(tmp_path / "store")).lookup("Alpha", version="v1") == blob
+
+
+def test_same_bytes_are_stored_once(tmp_path):
+    store = font_store.FontStore(str(tmp_path / "store"))
+    first = add(store, "Alpha", b"same")
+    second = add(store, "Beta", b"same")
+    assert first == second
+    assert len(store.entries()) == 2
+    assert store.total_bytes() == 4
+
+
+def test_least_recently_used_fonts_are_evicted(tmp_path):
+    store = font_store.FontStore(str(tmp_path / "store"), max_bytes=250)
+    alpha = add(store, "Alpha", b"A" * 100)
+    add(store, "Beta", b"B" * 100)
+    assert store.lookup("Alpha") == alpha
+
+    # Beta is now the least recently used
+    add(store, "Gamma", b"C" * 100)
+    assert store.contains("Alpha")
+    assert not store.contains("Beta")
+    assert store.contains("Gamma")
+    assert store.total_bytes() == 200
+    assert sorted(os.listdir(tmp_path / "store")) == sorted(
+        [os.path.basename(store.blob_path(store.entry_hash(family))) for family in ("Alpha", "Gamma")]
+        + [font_store.INDEX_NAME, "staging"]
+    )
+
+
+def test_protected_fonts_survive_eviction(tmp_path):
+    store = font_store.FontStore(str(tmp_path / "store"), max_bytes=250)
+    alpha = add(store, "Alpha", b"A" * 100)
+    add(store, "Beta", b"B" * 100)
+    add(store, "Gamma", b"C" * 100, protect={store.find_hash(alpha)})
+    assert store.contains("Alpha")
+    assert not store.contains("Beta")
+
+    # The font just added is never evicted, even over the cap
+    tiny = font_store.FontStore(str(tmp_path / "tiny"), max_bytes=10)
+    add(tiny, "Delta", b"D" * 100)
+    assert tiny.contains("Delta")
+
+
+def test_corrupt_blobs_are_removed_on_first_use(tmp_path):
+    store = font_store.FontStore(str(tmp_path / "store"))
+    blob = add(store, "Alpha", b"A" * 100)
+    with open(blob, 'wb') as f:
+        f.write(b"B" * 100)
+
+    # Verified when added in this session
+    assert store.lookup("Alpha") == blob
+
+    fresh = font_store.FontStore(str(tmp_path / "store"))
+    assert fresh.lookup("Alpha") is None
+    assert not fresh.contains("Alpha")
+    assert not os.path.exists(blob)
+
+
+def test_truncated_blobs_are_dropped_from_the_index(tmp_path):
+    store = font_store.FontStore(str(tmp_path / "store"))
+    blob = add(store, "Alpha", b"A" * 100)
+    with open(blob, 'wb') as f:
+        f.write(b"A" * 10)
+    assert not font_store.FontStore(str(tmp_path / "store")).contains("Alpha")
+
+
+def test_find_hash_only_accepts_store_blobs(tmp_path):
+    store = font_store.FontStore(str(tmp_path / "store"))
+    sha256 = "ab" * 32
+    assert store.find_hash(store.blob_path(sha256)) == sha256
+    assert store.find_hash(str(tmp_path / f"{sha256}.ttf")) is None
+    assert store.find_hash(store.blob_path("abc")) is None
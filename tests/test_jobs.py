@@ -0,0 +1,103 @@
+"""Splitting batches into shards and running them with retries"""
+
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import jobs  # noqa: E402
+
+
+# Stand-in worker: writes the shard's output, failing the first attempt
+# when given a second argument
+WORKER = """
+import os, sys
+output = sys.argv[1]
+marker = output + ".tried"
+if sys.argv[2:] and not os.path.exists(marker):
+    open(marker, 'w').close()
+    print("worker crashed")
+    sys.exit(3)
+with open(output, 'w') as f:
+    f.write("blend")
+"""
+
+
+def command(flaky=()):
+    def build(shard):
+        args = [shard.output_path] if shard.index not in flaky else [shard.output_path, "flaky"]
+        return [sys.executable, "-c", WORKER, *args]
+    return build
+
+
+def test_split_specs_keeps_order_and_balances():
+    specs = list(range(10))
+    runs = jobs.split_specs(specs, 3)
+    assert runs == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert jobs.split_specs(specs, 1) == [specs]
+    assert jobs.split_specs(specs[:2], 5) == [[0], [1]]
+    assert jobs.split_specs(specs, 0) == [specs]
+    assert jobs.split_specs([], 4) == []
+
+
+def test_prepare_shards_writes_spec_files(tmp_path):
+    specs = [{'text': str(n)} for n in range(5)]
+    shards = jobs.prepare_shards(specs, str(tmp_path), 2, "Batch")
+    assert [shard.count for shard in shards] == [3, 2]
+    assert [shard.collection for shard in shards] == ["Batch 001", "Batch 002"]
+    with open(shards[1].specs_path, encoding='utf-8') as f:
+        assert json.load(f) == {'signs': specs[3:]}
+
+
+def test_runner_builds_every_shard(tmp_path):
+    shards = jobs.prepare_shards([{'text': str(n)} for n in range(7)], str(tmp_path), 3)
+    runner = jobs.ShardRunner(shards, command(), workers=2)
+    seen = []
+    done = runner.run(on_progress=lambda r: seen.append(r.progress()), interval=0.01)
+    assert done == shards
+    assert all(shard.attempts == 1 for shard in shards)
+    assert runner.progress() == (7, 7, 0, 3)
+    assert seen[-1] == (7, 7, 0, 3)
+    assert all(running <= 2 for _signs, _total, running, _finished in seen)
+
+
+def test_failed_shards_are_retried(tmp_path):
+    shards = jobs.prepare_shards([{'text': str(n)} for n in range(4)], str(tmp_path), 2)
+    runner = jobs.ShardRunner(shards, command(flaky={1}), workers=2, retries=1)
+    assert runner.run(interval=0.01) == shards
+    assert [shard.attempts for shard in shards] == [1, 2]
+    assert runner.failed() == []
+
+
+def test_shards_fail_once_retries_run_out(tmp_path):
+    shards = jobs.prepare_shards([{'text': str(n)} for n in range(4)], str(tmp_path), 2)
+    runner = jobs.ShardRunner(shards, command(flaky={0}), workers=1, retries=0)
+    assert runner.run(interval=0.01) == [shards[1]]
+    assert runner.failed() == [shards[0]]
+    assert shards[0].attempts == 1
+    assert "exit code 3" in shards[0].error
+    assert "worker crashed" in shards[0].error
+    assert runner.progress() == (2, 4, 0, 1)
+
+
+def test_timed_out_shards_are_killed(tmp_path):
+    shards = jobs.prepare_shards([{'text': "A"}], str(tmp_path), 1)
+    runner = jobs.ShardRunner(
+        shards, lambda shard: [sys.executable, "-c", "import time; time.sleep(30)"], retries=0, timeout=0.2
+    )
+    assert runner.run(interval=0.01) == []
+    assert shards[0].state == jobs.FAILED
+    assert shards[0].error == "timed out after 0.2s"
+
+
+def test_cancel_drops_pending_shards(tmp_path):
+    shards = jobs.prepare_shards([{'text': str(n)} for n in range(3)], str(tmp_path), 3)
+    runner = jobs.ShardRunner(
+        shards, lambda shard: [sys.executable, "-c", "import time; time.sleep(30)"], workers=1
+    )
+    assert runner.poll()
+    runner.cancel()
+    assert not runner.is_busy()
+    assert [shard.state for shard in shards] == [jobs.CANCELLED] * 3
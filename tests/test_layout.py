@@ -0,0 +1,112 @@
+"""Fitting text into boxes from font metrics"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import layout  # noqa: E402
+from fake_fonts import build_font  # noqa: E402
+
+
+# Without a font every character is 0.6 em wide and a line 1 em high
+FALLBACK = layout.FontMetrics()
+
+
+def assert_fits(result, metrics, width, height):
+    assert result.size > 0
+    assert result.width <= width + 1e-9
+    assert result.height <= height + 1e-9
+    for line in result.lines:
+        assert metrics.text_width(line) * result.size <= width + 1e-9
+
+
+def test_one_line_fills_a_wide_box():
+    result = layout.fit_text("AB CD", FALLBACK, 30.0, 1.0)
+    assert result.lines == ["AB CD"]
+    assert result.size == pytest.approx(1.0)
+    assert_fits(result, FALLBACK, 30.0, 1.0)
+
+
+def test_word_wrap_breaks_between_words():
+    result = layout.fit_text("AAAA BBBB CCCC DDDD", FALLBACK, 3.0, 3.0)
+    assert len(result.lines) > 1
+    assert " ".join(result.lines) == "AAAA BBBB CCCC DDDD"
+    assert all(not line.startswith(" ") and not line.endswith(" ") for line in result.lines)
+    assert_fits(result, FALLBACK, 3.0, 3.0)
+    # Either side of the box is full
+    assert result.width == pytest.approx(3.0) or result.height == pytest.approx(3.0)
+
+
+def test_max_lines_limits_word_wrap():
+    free = layout.fit_text("AAAA BBBB CCCC DDDD", FALLBACK, 3.0, 3.0)
+    limited = layout.fit_text("AAAA BBBB CCCC DDDD", FALLBACK, 3.0, 3.0, max_lines=1)
+    assert len(free.lines) > 1
+    assert limited.lines == ["AAAA BBBB CCCC DDDD"]
+    assert limited.size < free.size
+    assert_fits(limited, FALLBACK, 3.0, 3.0)
+
+
+def test_explicit_line_breaks_are_kept_over_max_lines():
+    result = layout.fit_text("AB\nCD", FALLBACK, 10.0, 10.0, max_lines=1)
+    assert result.lines == ["AB", "CD"]
+
+
+def test_char_wrap_breaks_text_without_spaces():
+    text = "漢字漢字漢字漢字"
+    result = layout.fit_text(text, FALLBACK, 2.0, 2.0, wrap='CHAR')
+    assert len(result.lines) > 1
+    assert "".join(result.lines) == text
+    assert_fits(result, FALLBACK, 2.0, 2.0)
+
+    # WORD can't break it, so it stays on one smaller line
+    word = layout.fit_text(text, FALLBACK, 2.0, 2.0, wrap='WORD')
+    assert word.lines == [text]
+    assert word.size < result.size
+
+
+def test_char_wrap_never_starts_a_line_with_a_space():
+    result = layout.fit_text("AB CD EF GH", FALLBACK, 1.5, 4.0, wrap='CHAR', max_lines=4)
+    assert all(not line.startswith(" ") for line in result.lines)
+    assert_fits(result, FALLBACK, 1.5, 4.0)
+
+
+def test_none_wrap_only_uses_explicit_breaks():
+    result = layout.fit_text("AAAA BBBB", FALLBACK, 1.0, 10.0, wrap='NONE')
+    assert result.lines == ["AAAA BBBB"]
+
+
+def test_unknown_wrap_mode_raises():
+    with pytest.raises(ValueError):
+        layout.fit_text("AB", FALLBACK, 1.0, 1.0, wrap='LINE')
+
+
+def test_real_font_metrics(tmp_path):
+    font_path = tmp_path / "font.ttf"
+    font_path.write_bytes(build_font(2))
+    metrics = layout.load_metrics(str(font_path))
+    assert metrics.font is not None
+    assert metrics.block_extent == pytest.approx(1.0)
+    assert metrics.text_width("AB") == pytest.approx(metrics.glyph("A")[1] + metrics.glyph("B")[1])
+
+    result = layout.fit_text("Bench Sans Signs", metrics, 2.0, 1.5)
+    assert_fits(result, metrics, 2.0, 1.5)
+
+
+def test_truncated_font_falls_back_to_estimates(tmp_path):
+    font_path = tmp_path / "broken.ttf"
+    font_path.write_bytes(build_font(2)[:300])
+    metrics = layout.load_metrics(str(font_path))
+    assert metrics.font is None
+    assert metrics.text_width("ABC") == pytest.approx(3 * layout.FALLBACK_ADVANCE)
+
+
+def test_glyph_positions_skip_spaces_and_follow_lines():
+    positions = layout.glyph_positions("A B\nC", FALLBACK, line_spacing=1.5)
+    assert [char for char, _x, _y in positions] == ["A", "B", "C"]
+    assert positions[1][1] == pytest.approx(2 * layout.FALLBACK_ADVANCE)
+    assert positions[2][1:] == pytest.approx((0.0, -1.5))
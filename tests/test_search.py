@@ -0,0 +1,95 @@
+"""SearchIndex ranking, facets and variant matching"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import search  # noqa: E402
+
+
+# In popularity order, so the position is the font id
+CATALOG = [
+    {'family': "Roboto", 'category': 'sans-serif', 'subsets': ['latin', 'cyrillic'], 'variants': ['regular', '700']},
+    {'family': "Open Sans", 'category': 'sans-serif', 'subsets': ['latin'], 'variants': ['regular']},
+    {'family': "Roboto Slab", 'category': 'serif', 'subsets': ['latin', 'cyrillic'],
+     'variants': ['300', 'regular', '700', 'italic']},
+    {'family': "Lobster", 'category': 'display', 'subsets': ['latin', 'cyrillic'], 'variants': ['regular']},
+    {'family': "Noto Serif Display", 'category': 'serif', 'subsets': ['latin', 'greek'], 'variants': ['regular']},
+    {'family': "Rubik", 'category': 'sans-serif', 'subsets': ['latin'], 'variants': ['regular', '500']},
+]
+
+
+def families(index, ids):
+    return [index.records[font_id].family for font_id in ids]
+
+
+def test_exact_and_prefix_matches_rank_first():
+    index = search.SearchIndex(CATALOG)
+    assert families(index, index.search("roboto")) == ["Roboto", "Roboto Slab"]
+    assert families(index, index.search("ROBOTO SLAB"))[0] == "Roboto Slab"
+
+
+def test_word_prefix_ranks_above_substring():
+    index = search.SearchIndex(CATALOG)
+    ids = index.search("display")
+    assert families(index, ids)[0] == "Noto Serif Display"
+
+    ids = index.search("bst")
+    assert families(index, ids) == ["Lobster"]
+
+
+def test_short_queries_match_without_trigrams():
+    index = search.SearchIndex(CATALOG)
+    assert families(index, index.search("ru")) == ["Rubik"]
+    assert set(families(index, index.search("o"))) >= {"Roboto", "Open Sans", "Lobster"}
+
+
+def test_typos_are_matched_fuzzily():
+    index = search.SearchIndex(CATALOG)
+    assert families(index, index.search("robto"))[0] == "Roboto"
+    assert index.search("zzzzzz") == []
+
+
+def test_empty_query_lists_by_popularity():
+    index = search.SearchIndex(CATALOG)
+    assert index.search("") == list(range(len(CATALOG)))
+    assert families(index, index.search("", category='serif')) == ["Roboto Slab", "Noto Serif Display"]
+
+
+def test_facet_filters_combine():
+    index = search.SearchIndex(CATALOG)
+    assert families(index, index.search("", subset='cyrillic', category='sans-serif')) == ["Roboto"]
+    assert families(index, index.search("", min_variants=2)) == ["Roboto", "Roboto Slab", "Rubik"]
+    assert families(index, index.search("", max_rank=2)) == ["Roboto", "Open Sans"]
+    assert families(index, index.search("roboto", include={2, 3})) == ["Roboto Slab"]
+
+
+def test_facet_counts():
+    index = search.SearchIndex(CATALOG)
+    categories, subsets = index.facet_counts(index.search("o"))
+    ids = index.search("o")
+    assert sum(categories.values()) == len(ids)
+    assert categories == {
+        category: sum(1 for font_id in ids if CATALOG[font_id]['category'] == category)
+        for category in categories
+    }
+    assert subsets['latin'] == len(ids)
+
+    categories, subsets = index.facet_counts(index.search("", category='serif'))
+    assert categories == {'serif': 2}
+    assert subsets == {'latin': 2, 'cyrillic': 1, 'greek': 1}
+
+
+def test_closest_variant():
+    record = search.FontRecord.from_catalog(dict(CATALOG[2], files={
+        variant: f"https://example.invalid/{variant}.ttf" for variant in CATALOG[2]['variants']
+    }))
+    assert record.closest_variant(700) == '700'
+    assert record.closest_variant(600) == '700'
+    assert record.closest_variant(200) == '300'
+    assert record.closest_variant(400, italic=True) == 'italic'
+    assert record.closest_variant(700, italic=True) == 'italic'
+    assert search.parse_variant('700italic') == (700, True)
+    assert search.variant_name(400, True) == 'italic'
@@ -0,0 +1,77 @@
+"""Subsetting and reading back fonts from the benchmark's synthetic font builder"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import subset  # noqa: E402
+import ttf  # noqa: E402
+from fake_fonts import build_font  # noqa: E402
+
+
+TEXT = "Hello"
+
+
+def test_subset_keeps_cmap_and_advances_of_the_text():
+    data = build_font(3)
+    font = ttf.TrueTypeFont(data)
+    small = ttf.TrueTypeFont(subset.subset_font(data, {ord(char) for char in TEXT}))
+
+    assert small.has_outlines
+    assert small.num_glyphs == font.num_glyphs
+    assert set(small.cmap) == {ord(char) for char in TEXT}
+    for char in TEXT:
+        glyph_id = font.glyph_id(char)
+        assert small.glyph_id(char) == glyph_id
+        assert small.advance_width(glyph_id) == font.advance_width(glyph_id)
+        assert small.glyph_outline(glyph_id) == font.glyph_outline(glyph_id)
+
+
+def test_subset_drops_unused_outlines():
+    data = build_font(3)
+    font = ttf.TrueTypeFont(data)
+    small = ttf.TrueTypeFont(subset.subset_font(data, {ord(char) for char in TEXT}))
+
+    unused = font.glyph_id("Z")
+    assert font.glyph_outline(unused)
+    assert small.glyph_outline(unused) == []
+    assert len(small.table('glyf')) < len(font.table('glyf'))
+
+
+def test_subset_checksum_adjustment():
+    output = subset.subset_font(build_font(3), {ord("A")})
+    assert subset.checksum(output) == subset.CHECKSUM_MAGIC
+
+
+def test_cff_fonts_are_rejected():
+    # An OTTO font without glyf/loca tables
+    font = ttf.TrueTypeFont(build_font(3))
+    tables = {tag: font.table(tag) for tag in font.tables if tag not in ('glyf', 'loca')}
+    cff = subset.build_sfnt(0x4F54544F, tables)
+    with pytest.raises(ttf.FontError):
+        subset.subset_font(cff, {ord("A")})
+
+
+def test_subset_cache_shares_files_per_glyph_set(tmp_path):
+    font_path = tmp_path / "font.ttf"
+    font_path.write_bytes(build_font(5))
+    cache = subset.SubsetCache(str(tmp_path / "subsets"))
+
+    first = cache.get(str(font_path), "abc")
+    assert first != str(font_path)
+    assert subset.source_hash(first) is not None
+    assert cache.get(str(font_path), "cab") == first
+    assert cache.get(str(font_path), "abcd") != first
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_unreadable_font_is_used_as_it_is(tmp_path):
+    font_path = tmp_path / "broken.ttf"
+    font_path.write_bytes(build_font(5)[:200])
+    cache = subset.SubsetCache(str(tmp_path / "subsets"))
+    assert cache.get(str(font_path), "abc") == str(font_path)
@@ -0,0 +1,108 @@
+"""Font list thumbnails rendered by a worker process and shown through bpy.utils.previews"""
+
+import os
+import subprocess
+import sys
+
+import bpy
+import bpy.utils.previews
+
+from . import raster
+
+
+# Fonts rendered per worker process run
+BATCH_SIZE = 64
+
+
+class ThumbnailManager:
+    """Icons for downloaded fonts, cached on disk as <font sha256>.png
+
+    Missing thumbnails are rendered in batches by ``raster.py`` running in
+    a separate Python process, so drawing the font list never waits for
+    rasterisation, touches the scene or goes to the network.
+    """
+
+    def __init__(self, thumb_dir, size=96, text="Aa"):
+        self.thumb_dir = thumb_dir
+        self.size = size
+        self.text = text
+        self._previews = None
+        self._pending = {}
+        self._running = {}
+        self._failed = set()
+        self._process = None
+        # Keep one bound method so the timer can be found again
+        self._timer = self._poll
+
+    def register(self):
+        self._previews = bpy.utils.previews.new()
+
+    def unregister(self):
+        if bpy.app.timers.is_registered(self._timer):
+            bpy.app.timers.unregister(self._timer)
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+        self._process = None
+        if self._previews is not None:
+            bpy.utils.previews.remove(self._previews)
+            self._previews = None
+
+    def icon_id(self, sha256, font_path):
+        """Icon id of a font's thumbnail, 0 while it isn't rendered yet"""
+        if self._previews is None or not sha256:
+            return 0
+
+        preview = self._previews.get(sha256)
+        if preview is not None:
+            return preview.icon_id
+
+        png_path = os.path.join(self.thumb_dir, f"{sha256}.png")
+        if os.path.exists(png_path):
+            return self._previews.load(sha256, png_path, 'IMAGE').icon_id
+
+        if sha256 not in self._failed and sha256 not in self._running:
+            self._pending[sha256] = font_path
+            if not bpy.app.timers.is_registered(self._timer):
+                bpy.app.timers.register(self._timer, first_interval=0.1)
+        return 0
+
+    def _poll(self):
+        """Timer: start worker runs and pick up their results"""
+        if self._process is not None:
+            if self._process.poll() is None:
+                return 0.2
+            self._finish_batch()
+
+        if self._pending:
+            self._start_batch()
+            return 0.2
+        return None
+
+    def _start_batch(self):
+        batch = dict(list(self._pending.items())[:BATCH_SIZE])
+        for sha256 in batch:
+            del self._pending[sha256]
+        self._running = batch
+
+        os.makedirs(self.thumb_dir, exist_ok=True)
+        command = [
+            sys.executable, raster.__file__,
+            "--out", self.thumb_dir,
+            "--size", str(self.size),
+            "--text", self.text,
+            *batch.values(),
+        ]
+        self._process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def _finish_batch(self):
+        self._process = None
+        for sha256 in self._running:
+            if not os.path.exists(os.path.join(self.thumb_dir, f"{sha256}.png")):
+                # Unsupported font (e.g. CFF outlines); don't retry this session
+                self._failed.add(sha256)
+        self._running = {}
+
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
@@ -0,0 +1,469 @@
+"""Minimal TrueType reader for glyph outlines, metrics and character maps
+
+Pure Python without Blender imports, so it can also be used from worker
+processes.
+"""
+
+import struct
+
+
+# Simple glyph point flags
+ON_CURVE = 0x01
+X_SHORT = 0x02
+Y_SHORT = 0x04
+REPEAT = 0x08
+X_SAME_OR_POSITIVE = 0x10
+Y_SAME_OR_POSITIVE = 0x20
+
+# Composite glyph component flags
+ARG_1_AND_2_ARE_WORDS = 0x0001
+ARGS_ARE_XY_VALUES = 0x0002
+WE_HAVE_A_SCALE = 0x0008
+MORE_COMPONENTS = 0x0020
+WE_HAVE_AN_X_AND_Y_SCALE = 0x0040
+WE_HAVE_A_TWO_BY_TWO = 0x0080
+
+# Nesting limit for composite glyphs
+MAX_COMPONENT_DEPTH = 8
+
+# GPOS lookup types
+PAIR_ADJUSTMENT = 2
+EXTENSION = 9
+
+# GPOS value record flag for the horizontal advance
+X_ADVANCE = 0x0004
+
+
+class FontError(Exception):
+    """Raised for font files this reader can't handle"""
+
+
+def _f2dot14(value):
+    return value / 16384.0
+
+
+def _value_record_size(value_format):
+    return 2 * bin(value_format).count('1')
+
+
+def _x_advance_offset(value_format):
+    """Offset of XAdvance in a value record, or None if the record has none"""
+    if not value_format & X_ADVANCE:
+        return None
+    return 2 * bin(value_format & (X_ADVANCE - 1)).count('1')
+
+
+def _read_coverage(data, offset):
+    """Mapping of glyph id to coverage index"""
+    fmt, count = struct.unpack_from(">HH", data, offset)
+    if fmt == 1:
+        return {glyph: i for i, glyph in enumerate(struct.unpack_from(f">{count}H", data, offset + 4))}
+    coverage = {}
+    for i in range(count):
+        start, end, start_index = struct.unpack_from(">HHH", data, offset + 4 + i * 6)
+        for glyph in range(start, end + 1):
+            coverage[glyph] = start_index + glyph - start
+    return coverage
+
+
+def _read_class_def(data, offset):
+    """Mapping of glyph id to class; glyphs not listed are class 0"""
+    fmt = struct.unpack_from(">H", data, offset)[0]
+    classes = {}
+    if fmt == 1:
+        start, count = struct.unpack_from(">HH", data, offset + 2)
+        for i, value in enumerate(struct.unpack_from(f">{count}H", data, offset + 6)):
+            if value:
+                classes[start + i] = value
+    elif fmt == 2:
+        count = struct.unpack_from(">H", data, offset + 2)[0]
+        for i in range(count):
+            start, end, value = struct.unpack_from(">HHH", data, offset + 4 + i * 6)
+            if value:
+                for glyph in range(start, end + 1):
+                    classes[glyph] = value
+    return classes
+
+
+class TrueTypeFont:
+    """Read-only view of a TrueType (glyf based) font file"""
+
+    def __init__(self, data):
+        self.data = data
+        if len(data) < 12:
+            raise FontError("file too short")
+
+        sfnt_version, num_tables = struct.unpack_from(">IH", data, 0)
+        if sfnt_version not in (0x00010000, 0x74727565, 0x4F54544F):
+            raise FontError("not a TrueType/OpenType font")
+
+        self.tables = {}
+        for i in range(num_tables):
+            tag, _checksum, offset, length = struct.unpack_from(">4sIII", data, 12 + i * 16)
+            self.tables[tag.decode('latin-1')] = (offset, length)
+
+        for tag in ('head', 'maxp', 'hhea', 'hmtx', 'cmap'):
+            if tag not in self.tables:
+                raise FontError(f"missing '{tag}' table")
+
+        head = self.table('head')
+        self.units_per_em = struct.unpack_from(">H", head, 18)[0]
+        self.index_to_loc_format = struct.unpack_from(">h", head, 50)[0]
+
+        self.num_glyphs = struct.unpack_from(">H", self.table('maxp'), 4)[0]
+
+        hhea = self.table('hhea')
+        self.ascender, self.descender, self.line_gap = struct.unpack_from(">hhh", hhea, 4)
+        self.num_h_metrics = struct.unpack_from(">H", hhea, 34)[0]
+
+        self._cmap = None
+        self._loca = None
+        self._advances = None
+        self._kerning = None
+        self._class_kerning = None
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    @property
+    def has_outlines(self):
+        """True if glyph outlines are stored in a glyf table (not CFF)"""
+        return 'glyf' in self.tables and 'loca' in self.tables
+
+    def table(self, tag):
+        """Raw bytes of a table, or b'' if the font doesn't have it"""
+        if tag not in self.tables:
+            return b''
+        offset, length = self.tables[tag]
+        return self.data[offset:offset + length]
+
+    # ------------------------------------------------------------------
+    # Character map
+    # ------------------------------------------------------------------
+
+    @property
+    def cmap(self):
+        """Mapping of Unicode codepoint to glyph id"""
+        if self._cmap is None:
+            self._cmap = self._read_cmap()
+        return self._cmap
+
+    def glyph_id(self, char):
+        """Glyph id of a character, 0 (.notdef) if the font doesn't have it"""
+        return self.cmap.get(ord(char), 0)
+
+    def _read_cmap(self):
+        cmap = self.table('cmap')
+        num_tables = struct.unpack_from(">H", cmap, 2)[0]
+
+        subtables = {}
+        for i in range(num_tables):
+            platform_id, encoding_id, offset = struct.unpack_from(">HHI", cmap, 4 + i * 8)
+            fmt = struct.unpack_from(">H", cmap, offset)[0]
+            subtables[(platform_id, encoding_id, fmt)] = offset
+
+        # Prefer full Unicode tables over BMP-only ones
+        for key in ((3, 10, 12), (0, 6, 12), (0, 4, 12), (0, 3, 12)):
+            if key in subtables:
+                return self._read_cmap_format12(cmap, subtables[key])
+        for key in ((3, 1, 4), (0, 3, 4), (0, 4, 4), (0, 1, 4), (0, 0, 4)):
+            if key in subtables:
+                return self._read_cmap_format4(cmap, subtables[key])
+        raise FontError("no Unicode cmap subtable")
+
+    @staticmethod
+    def _read_cmap_format4(cmap, offset):
+        seg_count = struct.unpack_from(">H", cmap, offset + 6)[0] // 2
+        end_offset = offset + 14
+        start_offset = end_offset + seg_count * 2 + 2
+        delta_offset = start_offset + seg_count * 2
+        range_offset = delta_offset + seg_count * 2
+
+        end_codes = struct.unpack_from(f">{seg_count}H", cmap, end_offset)
+        start_codes = struct.unpack_from(f">{seg_count}H", cmap, start_offset)
+        deltas = struct.unpack_from(f">{seg_count}h", cmap, delta_offset)
+        range_offsets = struct.unpack_from(f">{seg_count}H", cmap, range_offset)
+
+        mapping = {}
+        for seg in range(seg_count):
+            start, end, delta, id_range = start_codes[seg], end_codes[seg], deltas[seg], range_offsets[seg]
+            if start == 0xFFFF:
+                continue
+            for code in range(start, end + 1):
+                if id_range == 0:
+                    glyph = (code + delta) & 0xFFFF
+                else:
+                    address = range_offset + seg * 2 + id_range + (code - start) * 2
+                    if address + 2 > len(cmap):
+                        continue
+                    glyph = struct.unpack_from(">H", cmap, address)[0]
+                    if glyph:
+                        glyph = (glyph + delta) & 0xFFFF
+                if glyph:
+                    mapping[code] = glyph
+        return mapping
+
+    @staticmethod
+    def _read_cmap_format12(cmap, offset):
+        num_groups = struct.unpack_from(">I", cmap, offset + 12)[0]
+        mapping = {}
+        for i in range(num_groups):
+            start, end, start_glyph = struct.unpack_from(">III", cmap, offset + 16 + i * 12)
+            for code in range(start, end + 1):
+                mapping[code] = start_glyph + code - start
+        return mapping
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def advance_width(self, glyph_id):
+        """Horizontal advance of a glyph in font units"""
+        if self._advances is None:
+            hmtx = self.table('hmtx')
+            count = min(self.num_h_metrics, len(hmtx) // 4)
+            self._advances = struct.unpack_from(f">{count * 2}H", hmtx, 0)[::2]
+        if not self._advances:
+            return 0
+        return self._advances[min(glyph_id, len(self._advances) - 1)]
+
+    def kerning(self, left, right):
+        """Pair kerning between two glyph ids in font units
+
+        Read from the 'kern' table, or from the GPOS 'kern' feature for
+        fonts without one.
+        """
+        if self._kerning is None:
+            self._kerning = self._read_kern()
+            self._class_kerning = []
+            if not self._kerning:
+                self._kerning, self._class_kerning = self._read_gpos_kerning()
+
+        value = self._kerning.get((left, right))
+        if value is not None:
+            return value
+        for coverage, first_classes, second_classes, class2_count, values in self._class_kerning:
+            if left in coverage:
+                index = first_classes.get(left, 0) * class2_count + second_classes.get(right, 0)
+                return values[index]
+        return 0
+
+    def _read_kern(self):
+        kern = self.table('kern')
+        pairs = {}
+        if len(kern) < 4 or struct.unpack_from(">H", kern, 0)[0] != 0:
+            return pairs
+
+        num_tables = struct.unpack_from(">H", kern, 2)[0]
+        offset = 4
+        for _i in range(num_tables):
+            _version, length, coverage = struct.unpack_from(">HHH", kern, offset)
+            # Format 0, horizontal, not cross-stream
+            if coverage >> 8 == 0 and coverage & 0x1 and not coverage & 0x4:
+                num_pairs = struct.unpack_from(">H", kern, offset + 6)[0]
+                for i in range(num_pairs):
+                    left, right, value = struct.unpack_from(">HHh", kern, offset + 14 + i * 6)
+                    pairs[(left, right)] = pairs.get((left, right), 0) + value
+            offset += length
+        return pairs
+
+    def _read_gpos_kerning(self):
+        """Pair adjustments of the GPOS 'kern' feature
+
+        Returns explicit glyph pairs and a list of class based subtables.
+        Only the horizontal advance of the first glyph is used.
+        """
+        gpos = self.table('GPOS')
+        pairs = {}
+        class_kerning = []
+        if len(gpos) < 10:
+            return pairs, class_kerning
+
+        feature_list, lookup_list = struct.unpack_from(">HH", gpos, 6)
+        lookups = set()
+        for i in range(struct.unpack_from(">H", gpos, feature_list)[0]):
+            tag, offset = struct.unpack_from(">4sH", gpos, feature_list + 2 + i * 6)
+            if tag == b'kern':
+                feature = feature_list + offset
+                count = struct.unpack_from(">H", gpos, feature + 2)[0]
+                lookups.update(struct.unpack_from(f">{count}H", gpos, feature + 4))
+
+        lookup_count = struct.unpack_from(">H", gpos, lookup_list)[0]
+        for index in sorted(lookups):
+            if index >= lookup_count:
+                continue
+            lookup = lookup_list + struct.unpack_from(">H", gpos, lookup_list + 2 + index * 2)[0]
+            lookup_type, _flag, subtable_count = struct.unpack_from(">HHH", gpos, lookup)
+            for j in range(subtable_count):
+                subtable = lookup + struct.unpack_from(">H", gpos, lookup + 6 + j * 2)[0]
+                subtable_type = lookup_type
+                if lookup_type == EXTENSION:
+                    _fmt, subtable_type, offset = struct.unpack_from(">HHI", gpos, subtable)
+                    subtable += offset
+                if subtable_type == PAIR_ADJUSTMENT:
+                    self._read_pair_pos(gpos, subtable, pairs, class_kerning)
+        return pairs, class_kerning
+
+    @staticmethod
+    def _read_pair_pos(gpos, offset, pairs, class_kerning):
+        fmt, coverage_offset, format1, format2 = struct.unpack_from(">HHHH", gpos, offset)
+        advance = _x_advance_offset(format1)
+        if advance is None:
+            return
+        coverage = _read_coverage(gpos, offset + coverage_offset)
+        record_size = _value_record_size(format1) + _value_record_size(format2)
+
+        if fmt == 1:
+            pair_set_count = struct.unpack_from(">H", gpos, offset + 8)[0]
+            pair_sets = struct.unpack_from(f">{pair_set_count}H", gpos, offset + 10)
+            for first, coverage_index in coverage.items():
+                if coverage_index >= pair_set_count:
+                    continue
+                pair_set = offset + pair_sets[coverage_index]
+                for i in range(struct.unpack_from(">H", gpos, pair_set)[0]):
+                    record = pair_set + 2 + i * (2 + record_size)
+                    second = struct.unpack_from(">H", gpos, record)[0]
+                    # The first subtable that has a pair wins
+                    pairs.setdefault((first, second), struct.unpack_from(">h", gpos, record + 2 + advance)[0])
+
+        elif fmt == 2:
+            class_def1, class_def2, class1_count, class2_count = struct.unpack_from(">HHHH", gpos, offset + 8)
+            values = [
+                struct.unpack_from(">h", gpos, offset + 16 + i * record_size + advance)[0]
+                for i in range(class1_count * class2_count)
+            ]
+            class_kerning.append((
+                set(coverage),
+                _read_class_def(gpos, offset + class_def1),
+                _read_class_def(gpos, offset + class_def2),
+                class2_count,
+                values,
+            ))
+
+    # ------------------------------------------------------------------
+    # Glyph outlines
+    # ------------------------------------------------------------------
+
+    def glyph_data(self, glyph_id):
+        """Raw glyf table entry of a glyph, b'' for empty glyphs"""
+        if not self.has_outlines or not 0 <= glyph_id < self.num_glyphs:
+            return b''
+        if self._loca is None:
+            loca = self.table('loca')
+            if self.index_to_loc_format == 0:
+                self._loca = [value * 2 for value in struct.unpack_from(f">{self.num_glyphs + 1}H", loca, 0)]
+            else:
+                self._loca = list(struct.unpack_from(f">{self.num_glyphs + 1}I", loca, 0))
+
+        start, end = self._loca[glyph_id], self._loca[glyph_id + 1]
+        if end <= start:
+            return b''
+        glyf_offset = self.tables['glyf'][0]
+        return self.data[glyf_offset + start:glyf_offset + end]
+
+    def glyph_components(self, glyph_id):
+        """Glyph ids referenced by a composite glyph (empty for simple glyphs)"""
+        data = self.glyph_data(glyph_id)
+        if len(data) < 10 or struct.unpack_from(">h", data, 0)[0] >= 0:
+            return []
+        return [component for component, _transform in self._read_components(data)]
+
+    def glyph_outline(self, glyph_id, _depth=0):
+        """Contours of a glyph as lists of (x, y, on_curve) points in font units"""
+        data = self.glyph_data(glyph_id)
+        if len(data) < 10:
+            return []
+
+        num_contours = struct.unpack_from(">h", data, 0)[0]
+        if num_contours >= 0:
+            return self._read_simple(data, num_contours)
+
+        if _depth >= MAX_COMPONENT_DEPTH:
+            return []
+        contours = []
+        for component, (a, b, c, d, dx, dy) in self._read_components(data):
+            for contour in self.glyph_outline(component, _depth + 1):
+                contours.append([(a * x + c * y + dx, b * x + d * y + dy, on) for x, y, on in contour])
+        return contours
+
+    @staticmethod
+    def _read_simple(data, num_contours):
+        end_points = struct.unpack_from(f">{num_contours}H", data, 10)
+        if not end_points:
+            return []
+        num_points = end_points[-1] + 1
+
+        offset = 10 + num_contours * 2
+        instruction_length = struct.unpack_from(">H", data, offset)[0]
+        offset += 2 + instruction_length
+
+        flags = []
+        while len(flags) < num_points:
+            flag = data[offset]
+            offset += 1
+            flags.append(flag)
+            if flag & REPEAT:
+                flags.extend([flag] * data[offset])
+                offset += 1
+        flags = flags[:num_points]
+
+        def read_coords(short_flag, same_flag):
+            nonlocal offset
+            values = []
+            value = 0
+            for flag in flags:
+                if flag & short_flag:
+                    delta = data[offset]
+                    offset += 1
+                    value += delta if flag & same_flag else -delta
+                elif not flag & same_flag:
+                    value += struct.unpack_from(">h", data, offset)[0]
+                    offset += 2
+                values.append(value)
+            return values
+
+        xs = read_coords(X_SHORT, X_SAME_OR_POSITIVE)
+        ys = read_coords(Y_SHORT, Y_SAME_OR_POSITIVE)
+
+        contours = []
+        start = 0
+        for end in end_points:
+            contours.append([(xs[i], ys[i], bool(flags[i] & ON_CURVE)) for i in range(start, end + 1)])
+            start = end + 1
+        return contours
+
+    @staticmethod
+    def _read_components(data):
+        """Yield (glyph_id, (a, b, c, d, dx, dy)) for each component of a composite glyph"""
+        offset = 10
+        while True:
+            flags, glyph_id = struct.unpack_from(">HH", data, offset)
+            offset += 4
+
+            if flags & ARG_1_AND_2_ARE_WORDS:
+                arg1, arg2 = struct.unpack_from(">hh" if flags & ARGS_ARE_XY_VALUES else ">HH", data, offset)
+                offset += 4
+            else:
+                arg1, arg2 = struct.unpack_from(">bb" if flags & ARGS_ARE_XY_VALUES else ">BB", data, offset)
+                offset += 2
+
+            # Point-matching placement is rare in practice; treat it as no offset
+            dx, dy = (arg1, arg2) if flags & ARGS_ARE_XY_VALUES else (0, 0)
+
+            a, b, c, d = 1.0, 0.0, 0.0, 1.0
+            if flags & WE_HAVE_A_SCALE:
+                a = d = _f2dot14(struct.unpack_from(">h", data, offset)[0])
+                offset += 2
+            elif flags & WE_HAVE_AN_X_AND_Y_SCALE:
+                a, d = (_f2dot14(v) for v in struct.unpack_from(">hh", data, offset))
+                offset += 4
+            elif flags & WE_HAVE_A_TWO_BY_TWO:
+                a, b, c, d = (_f2dot14(v) for v in struct.unpack_from(">hhhh", data, offset))
+                offset += 8
+
+            yield glyph_id, (a, b, c, d, dx, dy)
+
+            if not flags & MORE_COMPONENTS:
+                break